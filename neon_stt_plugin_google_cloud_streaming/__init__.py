@@ -25,17 +25,85 @@
 # LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import hashlib
+
 from copy import copy
-from queue import Queue
-from threading import Event
+from queue import Empty, Queue
+from threading import Event, Lock, Thread, Timer
+from time import monotonic, sleep
+from typing import Iterable, Iterator, Optional
 
-import google.api_core.retry
-from google.cloud import speech
-from google.oauth2.service_account import Credentials
 from ovos_utils.log import LOG
 from ovos_plugin_manager.templates.stt import StreamingSTT, StreamThread
 
-from neon_stt_plugin_google_cloud_streaming.languages import stt_config
+from neon_stt_plugin_google_cloud_streaming.cache import TranscriptionCache
+from neon_stt_plugin_google_cloud_streaming.hedging import AudioTee, \
+    HedgeAttempt, HedgeStats
+from neon_stt_plugin_google_cloud_streaming.metrics import \
+    MetricsAggregator, StatsDReporter, StreamMetrics
+
+# google-cloud-speech, gRPC, NumPy and the language table are imported where
+# they are first used so that importing the plugin stays fast
+
+_AVAILABLE_LANGUAGES = None
+
+
+def __getattr__(name):
+    if name == "AsyncGoogleCloudStreamingSTT":
+        from neon_stt_plugin_google_cloud_streaming.async_stt import \
+            AsyncGoogleCloudStreamingSTT
+        return AsyncGoogleCloudStreamingSTT
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_shared_client(*args, **kwargs):
+    """
+    Get a client from the process-wide pool.
+    See `SpeechClientPool.get_client` for arguments.
+    """
+    from neon_stt_plugin_google_cloud_streaming.client_pool import \
+        get_shared_client
+    return get_shared_client(*args, **kwargs)
+
+
+def _is_end_of_single_utterance(response) -> bool:
+    from google.cloud import speech
+    return response.speech_event_type == speech.StreamingRecognizeResponse.\
+        SpeechEventType.END_OF_SINGLE_UTTERANCE
+
+
+def _alternatives(result) -> list:
+    """
+    Get (transcript, confidence) tuples for a recognition result.
+    """
+    return [(alternative.transcript, alternative.confidence)
+            for alternative in result.alternatives]
+
+
+def _notify_interim(callbacks: list, results):
+    """
+    Pass a partial transcript and its stability to interim callbacks.
+    """
+    transcript = "".join(r.alternatives[0].transcript for r in results
+                         if r.alternatives)
+    stability = results[0].stability
+    for callback in callbacks:
+        try:
+            callback(transcript, stability)
+        except Exception as e:
+            LOG.error(f"Interim callback failed: {e}")
+
+
+def _notify_utterance(callbacks: list, transcriptions: list,
+                      language_code: str):
+    """
+    Pass the alternatives for a final result to utterance callbacks.
+    """
+    for callback in callbacks:
+        try:
+            callback(transcriptions, language_code)
+        except Exception as e:
+            LOG.error(f"Utterance callback failed: {e}")
 
 
 class GoogleCloudStreamingSTT(StreamingSTT):
@@ -51,7 +119,50 @@ class GoogleCloudStreamingSTT(StreamingSTT):
                 "credential": {
                     "json": {
                         # Paste Google API JSON here
-        ...
+                    }
+                },
+                "languages": [],
+                "api_endpoint": "speech.googleapis.com",
+                "api_endpoints": [],
+                "endpoint_probe_interval": 60,
+                "client_pool_size": 1,
+                "keepalive_time_ms": 30000,
+                "warmup": true,
+                "preopen": false,
+                "preopen_max_age": 8,
+                "interim_results": false,
+                "single_utterance": false,
+                "frame_ms": 0,
+                "frame_max_latency_ms": 150,
+                "upload_encoding": "linear16",
+                "vad": false,
+                "input_sample_rate": 16000,
+                "input_channels": 1,
+                "input_sample_format": "int16",
+                "long_form": false,
+                "continuous": false,
+                "word_timings": false,
+                "resilient": false,
+                "max_reconnects": 5,
+                "audio_queue_seconds": 60,
+                "audio_queue_policy": "block",
+                "audio_buffer": "queue",
+                "cache": false,
+                "cache_max_entries": 256,
+                "cache_ttl": 3600,
+                "cache_dir": null,
+                "statsd_host": null,
+                "statsd_port": 8125,
+                "hedge_endpoint": null,
+                "hedge_after_ms": 1500,
+                "batch_workers": 4,
+                "batch_streams_per_second": 0,
+                "batch_chunk_ms": 500,
+                "client_init": "eager",
+                "credential_refresh": true,
+                "credential_refresh_margin": 300
+            }
+        }
 
     """
 
@@ -59,88 +170,1127 @@ class GoogleCloudStreamingSTT(StreamingSTT):
         super(GoogleCloudStreamingSTT, self).__init__(config=config)
 
         # override language with module specific language selection
-        self.language = self.config.get('lang') or self.lang
+        languages = self.config.get("languages") or \
+            [self.config.get('lang') or self.lang]
+        languages = list(dict.fromkeys(self._resolve_language(language)
+                                       for language in languages))
+        if len(languages) > 4:
+            LOG.warning(f"Only 4 languages may be recognized at once; "
+                        f"ignoring {languages[4:]}")
+        self.language = languages[0]
+        self.alternative_languages = languages[1:4]
+        self.detected_language = None
+        self.word_timings = None
         self.queue = None
+        self.preopen = self.config.get("preopen", False)
+        self.preopen_max_age = self.config.get("preopen_max_age", 8)
+        self._prepared_stream = None
+        self._prepared_lock = Lock()
+        self._recycle_timer = None
+        self._shut_down = False
+        self._interim_callbacks = []
+        self._utterance_callbacks = []
+        self.trimmed_seconds = 0.0
+        self.queue_stats = dict()
+        self.metrics = MetricsAggregator()
+        self.last_metrics = None
+        self._metrics_callbacks = [self.metrics]
+        if self.config.get("statsd_host"):
+            self._metrics_callbacks.append(StatsDReporter(
+                self.config["statsd_host"],
+                self.config.get("statsd_port", 8125)))
+        self.input_format = (self.config.get("input_sample_rate", 16000),
+                             self.config.get("input_channels", 1),
+                             self.config.get("input_sample_format", "int16"))
 
-        creds = self.config.get("credential")
+        self.hedge_stats = HedgeStats()
+        self.batch_stats = None
+        self.upload_encoding = \
+            self.config.get("upload_encoding", "linear16").lower()
+        if self.upload_encoding not in ("linear16", "flac"):
+            LOG.warning(f"Unsupported upload_encoding: {self.upload_encoding}"
+                        f" (using linear16)")
+            self.upload_encoding = "linear16"
+        self.continuous = self.config.get("continuous", False)
+        self.single_utterance = self.config.get("single_utterance", False)
+        if self.single_utterance:
+            for mode in ("long_form", "resilient", "continuous"):
+                if self.config.get(mode):
+                    LOG.warning(f"single_utterance is ignored in {mode} mode")
+                    self.single_utterance = False
+        if (self.config.get("long_form") or self.config.get("resilient") or
+                self.continuous) and self.config.get("hedge_endpoint"):
+            LOG.warning("hedge_endpoint is ignored in long_form, resilient "
+                        "and continuous modes")
+        if self.continuous and self.preopen:
+            LOG.warning("preopen is ignored in continuous mode")
+            self.preopen = False
+        self.cache = None
+        self._cache_hash = None
+        self._cache_audio = None
+        self._cache_language = None
+        if self.config.get("cache") and self.continuous:
+            LOG.warning("cache is ignored in continuous mode")
+        elif self.config.get("cache"):
+            self.cache = TranscriptionCache(
+                self.config.get("cache_max_entries", 256),
+                self.config.get("cache_ttl", 3600),
+                self.config.get("cache_dir"))
+            if self.preopen:
+                LOG.warning("preopen is ignored when cache is enabled")
+                self.preopen = False
+
+        self._credentials = None
+        self._client = None
+        self._hedge_client = None
+        self._endpoint_selector = None
+        self._streaming_config = None
+        self._initialized = False
+        self._init_lock = Lock()
+        client_init = self.config.get("client_init", "eager")
+        if client_init == "background":
+            Thread(target=self._start, daemon=True,
+                   name="GoogleCloudStreamingSTTInit").start()
+        elif client_init != "lazy":
+            self._start()
 
+    def _start(self):
+        self._initialize()
+        if self.preopen:
+            self.prepare_stream()
+
+    def _initialize(self):
+        """
+        Load credentials and create clients and the recognition config. Per
+        `client_init`, this runs on construction, in the background, or when
+        first needed; accessing any of the created attributes waits for it.
+        """
+        with self._init_lock:
+            if self._initialized:
+                return
+            from google.cloud import speech
+            credentials = self._load_credentials()
+            self._credentials = credentials
+            endpoints = self.config.get("api_endpoints")
+            self._client = self._create_client(
+                credentials, endpoints[0] if endpoints else None)
+            if endpoints:
+                self._endpoint_selector = \
+                    self._create_endpoint_selector(endpoints)
+            if self.config.get("hedge_endpoint"):
+                self._hedge_client = self._create_client(
+                    credentials, self.config["hedge_endpoint"])
+            recognition_config = speech.RecognitionConfig(
+                encoding=speech.RecognitionConfig.AudioEncoding[
+                    self.upload_encoding.upper()],
+                sample_rate_hertz=16000,
+                language_code=self.language,
+                alternative_language_codes=self.alternative_languages,
+                max_alternatives=3,
+                enable_word_time_offsets=self.config.get("word_timings",
+                                                         False),
+                enable_word_confidence=self.config.get("word_timings", False)
+            )
+            self._streaming_config = speech.StreamingRecognitionConfig(
+                config=recognition_config,
+                interim_results=self.config.get("interim_results", False),
+                single_utterance=self.single_utterance
+            )
+            self._initialized = True
+
+    @property
+    def client(self):
+        self._initialize()
+        return self._client
+
+    @property
+    def hedge_client(self):
+        self._initialize()
+        return self._hedge_client
+
+    @property
+    def endpoint_selector(self):
+        self._initialize()
+        return self._endpoint_selector
+
+    @property
+    def streaming_config(self):
+        self._initialize()
+        return self._streaming_config
+
+    @property
+    def auth_stats(self) -> dict:
+        """
+        Access token refresh counts and time spent by requests waiting on a
+        refresh. Stats are shared by instances using the same credentials.
+        """
+        self._initialize()
+        stats = getattr(self._credentials, "auth_stats", None)
+        return stats.as_dict() if stats else dict()
+
+    def _load_credentials(self):
+        creds = self.config.get("credential")
         if creds:
             creds = creds.get('json') or creds
-            LOG.debug(f"Got credentials: {creds}")
-            credentials = Credentials.from_service_account_info(creds)
+            credentials = self._get_managed_credentials(creds)
         else:
             try:
                 from neon_utils.authentication_utils import find_neon_google_keys
                 credential_json = find_neon_google_keys()
-                credentials = Credentials.from_service_account_info(credential_json)
+                credentials = self._get_managed_credentials(credential_json)
             except Exception as e:
                 LOG.error(e)
                 credentials = None
+        return credentials
 
-        self.client = speech.SpeechClient(credentials=credentials)
-        recognition_config = speech.RecognitionConfig(
-            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-            sample_rate_hertz=16000,
-            language_code=self.language,
-            max_alternatives=3
-        )
-        self.streaming_config = speech.StreamingRecognitionConfig(
-            config=recognition_config,
-            interim_results=False
-        )
+    def _get_managed_credentials(self, info: dict):
+        """
+        Get shared credentials for a service account key. The parsed key is
+        cached and, unless `credential_refresh` is disabled, tokens are
+        refreshed in the background ahead of expiry.
+        :param info: service account key info
+        """
+        from neon_stt_plugin_google_cloud_streaming.credentials import \
+            get_credential_manager
+        manager = get_credential_manager(
+            self.config.get("credential_refresh_margin", 300))
+        return manager.get_credentials(
+            info, self.config.get("credential_refresh", True))
+
+    def _create_client(self, credentials, api_endpoint=None):
+        return get_shared_client(
+            credentials, api_endpoint or self.config.get("api_endpoint"),
+            pool_size=self.config.get("client_pool_size", 1),
+            keepalive_time_ms=self.config.get("keepalive_time_ms", 30000),
+            keepalive_timeout_ms=self.config.get("keepalive_timeout_ms",
+                                                 10000),
+            warmup=self.config.get("warmup", True))
+
+    def _create_endpoint_selector(self, endpoints: list):
+        from neon_stt_plugin_google_cloud_streaming.endpoints import \
+            EndpointSelector
+        selector = EndpointSelector(
+            endpoints,
+            lambda endpoint: self._create_client(self._credentials, endpoint),
+            self.config.get("endpoint_probe_interval", 60))
+        selector.start()
+        return selector
 
     def create_streaming_thread(self):
-        self.queue = Queue()
-        return GoogleStreamThread(
-            self.queue,
+        stream = self._pop_prepared_stream()
+        if stream:
+            self.queue = stream.queue
+            return stream
+        self.queue = self._create_queue()
+        return self._create_stream(self.queue)
+
+    def _create_queue(self):
+        from neon_stt_plugin_google_cloud_streaming.audio import FormatAdapter
+        from neon_stt_plugin_google_cloud_streaming.audio_queue import \
+            AudioQueue, AudioRingBuffer
+        max_seconds = self.config.get("audio_queue_seconds", 60)
+        policy = self.config.get("audio_queue_policy", "block")
+        bytes_per_second = FormatAdapter.bytes_per_second(*self.input_format)
+        if self.config.get("audio_buffer", "queue") == "ring":
+            frame_ms = self.config.get("frame_ms") or 100
+            align = bytes_per_second // self.input_format[0]
+            return AudioRingBuffer(max_seconds, policy, bytes_per_second,
+                                   bytes_per_second * frame_ms // 1000, align)
+        return AudioQueue(max_seconds, policy, bytes_per_second)
+
+    def _select_client(self) -> tuple:
+        """
+        Get a client for a new stream.
+        :return: (client, selected endpoint or None)
+        """
+        if self.endpoint_selector:
+            endpoint = self.endpoint_selector.select()
+            return self._create_client(self._credentials, endpoint), endpoint
+        client = self.client
+        if self.config.get("client_pool_size", 1) > 1:
+            # Spread this instance's streams across the pooled channels
+            client = self._create_client(self._credentials)
+        return client, None
+
+    def _create_stream(self, queue):
+        client, endpoint = self._select_client()
+        stream = GoogleStreamThread(
+            queue,
+            self.language,
+            client,
+            self.streaming_config,
+            interim_callbacks=self._interim_callbacks,
+            stages=self._create_stages(),
+            encoder_factory=self._create_encoder
+            if self.upload_encoding == "flac" else None,
+            long_form=self.config.get("long_form", False) or self.continuous,
+            stream_limit=self.config.get("stream_limit", 290),
+            max_replay_seconds=self.config.get("max_replay_seconds", 30),
+            hedge_client=self.hedge_client,
+            hedge_after=self.config.get("hedge_after_ms", 1500) / 1000,
+            resilient=self.config.get("resilient", False),
+            max_reconnects=self.config.get("max_reconnects", 5),
+            utterance_callbacks=self._utterance_callbacks,
+            word_time_offsets=self.config.get("word_timings", False),
+            continuous=self.continuous,
+            idle_limit=self.config.get("continuous_idle_limit", 5)
+        )
+        stream.endpoint = endpoint
+        return stream
+
+    def _create_batch_stream(self, input_format: tuple):
+        """
+        Create a stream for recorded audio. Batch streams stitch every final
+        result, roll over at the stream limit and skip interim results, VAD
+        and framing.
+        :param input_format: (sample_rate, channels, sample_format) of audio
+        """
+        from google.cloud import speech
+        from neon_stt_plugin_google_cloud_streaming.audio import FormatAdapter
+        client, endpoint = self._select_client()
+        stages = []
+        if input_format != (16000, 1, "int16"):
+            stages.append(FormatAdapter(*input_format))
+        stream = GoogleStreamThread(
+            Queue(),
             self.language,
-            self.client,
-            self.streaming_config
+            client,
+            speech.StreamingRecognitionConfig(
+                config=self.streaming_config.config),
+            stages=stages,
+            encoder_factory=self._create_encoder
+            if self.upload_encoding == "flac" else None,
+            long_form=True,
+            stream_limit=self.config.get("stream_limit", 290),
+            max_replay_seconds=self.config.get("max_replay_seconds", 30),
+            word_time_offsets=self.config.get("word_timings", False)
         )
+        stream.endpoint = endpoint
+        return stream
+
+    def transcribe_batch(self, items: Iterable,
+                         max_workers: Optional[int] = None) -> Iterator:
+        """
+        Transcribe recorded audio over concurrent streams, sending audio as
+        fast as the connection allows. Throughput for the batch is available
+        in `batch_stats`.
+        :param items: paths to WAV or raw audio files, or `bytes` of either.
+            Raw audio is in the configured input format
+        :param max_workers: max concurrent streams (default `batch_workers`)
+        :return: iterator of `BatchResult` in the same order as `items`
+        """
+        from neon_stt_plugin_google_cloud_streaming.batch import \
+            BatchTranscriber
+        transcriber = BatchTranscriber(
+            self._create_batch_stream, self.input_format,
+            max_workers or self.config.get("batch_workers", 4),
+            self.config.get("batch_streams_per_second", 0),
+            self.config.get("batch_chunk_ms", 500))
+        results = transcriber.transcribe(items)
+        self.batch_stats = transcriber.stats
+        return results
+
+    def _create_stages(self) -> list:
+        """
+        Build the per-stream audio processing stages applied between the
+        audio queue and outgoing requests. Stages output 16kHz mono LINEAR16;
+        any upload encoding is applied separately to each request stream.
+        """
+        from neon_stt_plugin_google_cloud_streaming.audio import \
+            FormatAdapter, FrameCoalescer, VoiceActivityTrimmer
+        stages = []
+        if self.input_format != (16000, 1, "int16"):
+            stages.append(FormatAdapter(*self.input_format))
+        if self.config.get("vad"):
+            stages.append(VoiceActivityTrimmer(
+                self.config.get("vad_energy_threshold", 300),
+                self.config.get("vad_pre_roll_ms", 300) / 1000,
+                self.config.get("vad_trailing_silence_ms", 1000) / 1000))
+        if self.config.get("frame_ms"):
+            stages.append(FrameCoalescer.from_duration(
+                self.config["frame_ms"],
+                self.config.get("frame_max_latency_ms", 150)))
+        return stages
+
+    def _create_encoder(self):
+        from neon_stt_plugin_google_cloud_streaming.encoding import FlacEncoder
+        return FlacEncoder(block_size=self.config.get("flac_block_size", 1600))
+
+    def register_interim_callback(self, callback):
+        """
+        Register a method to receive partial transcripts while audio is
+        streaming. Requires `interim_results` to be enabled in config.
+        :param callback: method accepting (transcript: str, stability: float)
+        """
+        if not self.streaming_config.interim_results:
+            LOG.warning("Interim results are disabled in configuration")
+        self._interim_callbacks.append(callback)
+
+    def register_utterance_callback(self, callback):
+        """
+        Register a method to receive each final result as it arrives. In
+        `continuous` mode this is called for every utterance on the stream.
+        :param callback: method accepting (transcriptions: list,
+            language_code: str) where transcriptions is a list of
+            (transcript, confidence)
+        """
+        self._utterance_callbacks.append(callback)
+
+    def register_metrics_callback(self, callback):
+        """
+        Register a method to receive timings and counters for each completed
+        stream. Aggregated percentiles are also available from `metrics`.
+        :param callback: method accepting (metrics: StreamMetrics)
+        """
+        self._metrics_callbacks.append(callback)
+
+    def _report_metrics(self, metrics: StreamMetrics):
+        self.last_metrics = metrics
+        for callback in self._metrics_callbacks:
+            try:
+                callback(metrics)
+            except Exception as e:
+                LOG.error(f"Metrics callback failed: {e}")
+
+    def prepare_stream(self):
+        """
+        Open a stream ahead of time (i.e. on wake word detection) so the
+        call is established and the config request sent before audio is
+        available. The next `stream_start` will use the prepared stream.
+        """
+        with self._prepared_lock:
+            if self._prepared_stream or self._shut_down:
+                return
+            self._prepared_stream = self._create_stream(self._create_queue())
+            self._prepared_stream.start()
+            if self._recycle_timer:
+                self._recycle_timer.cancel()
+            self._recycle_timer = Timer(self.preopen_max_age,
+                                        self._recycle_prepared_stream)
+            self._recycle_timer.daemon = True
+            self._recycle_timer.start()
+
+    def _pop_prepared_stream(self):
+        with self._prepared_lock:
+            stream = self._prepared_stream
+            self._prepared_stream = None
+            if self._recycle_timer:
+                self._recycle_timer.cancel()
+                self._recycle_timer = None
+        if stream and (not stream.is_alive() or
+                       monotonic() - stream.opened > self.preopen_max_age):
+            LOG.debug("Discarding stale prepared stream")
+            stream.queue.put(None)
+            return None
+        return stream
+
+    def _recycle_prepared_stream(self):
+        """
+        Close an unused prepared stream before it reaches server-side idle
+        limits and open a fresh one in its place.
+        """
+        with self._prepared_lock:
+            stream = self._prepared_stream
+            self._prepared_stream = None
+            self._recycle_timer = None
+        if stream:
+            LOG.debug("Recycling prepared stream")
+            stream.queue.put(None)
+            self.prepare_stream()
+
+    def shutdown(self):
+        """
+        Stop background work: endpoint probing and the prepared stream and
+        its recycle timer. Streams are no longer prepared after this is called.
+        """
+        with self._prepared_lock:
+            self._shut_down = True
+        stream = self._pop_prepared_stream()
+        if stream:
+            stream.queue.put(None)
+        if self._endpoint_selector:
+            self._endpoint_selector.stop(
+                self._endpoint_selector.probe_timeout)
 
     @property
     def available_languages(self) -> set:
-        return set(stt_config.keys())
+        # Built once and shared by all instances; callers get their own copy
+        global _AVAILABLE_LANGUAGES
+        if _AVAILABLE_LANGUAGES is None:
+            from neon_stt_plugin_google_cloud_streaming.languages import \
+                get_language_index
+            _AVAILABLE_LANGUAGES = frozenset(get_language_index().languages)
+        return set(_AVAILABLE_LANGUAGES)
+
+    @staticmethod
+    def _resolve_language(language: str) -> str:
+        """
+        Map a configured language to a supported language code, so that
+        unsupported languages are reported before any request is made.
+        :param language: language code, i.e. `en-us`, `en_US` or `zh`
+        :return: supported language code, i.e. `en-US` or `cmn-Hans-CN`
+        :raises ValueError: if the language is not supported
+        """
+        from neon_stt_plugin_google_cloud_streaming.languages import \
+            get_language_index
+        resolved = get_language_index().resolve(language)
+        if resolved != language:
+            LOG.debug(f"Resolved language {language} to {resolved}")
+        return resolved
+
+    def _get_detected_language(self, language_code: str,
+                               result: list) -> str:
+        """
+        Get the supported language code for the language a result was
+        recognized in.
+        :param language_code: language reported with the final result
+        :param result: list of (transcript, confidence)
+        :return: language code, or None if nothing was recognized
+        """
+        from neon_stt_plugin_google_cloud_streaming.languages import \
+            get_language_index
+        if not result:
+            return None
+        if not language_code:
+            return self.language
+        return get_language_index().get(language_code) or language_code
+
+    def _cache_fingerprint(self):
+        """
+        Get a hash object seeded with everything besides the audio that
+        affects recognition results.
+        """
+        from google.cloud import speech
+        fingerprint = hashlib.sha256(
+            speech.StreamingRecognitionConfig.serialize(self.streaming_config))
+        settings = (self.input_format, self.config.get("vad", False),
+                    self.config.get("vad_energy_threshold", 300),
+                    self.config.get("vad_pre_roll_ms", 300),
+                    self.config.get("vad_trailing_silence_ms", 1000),
+                    self.config.get("long_form", False))
+        fingerprint.update(repr(settings).encode())
+        return fingerprint
+
+    def stream_start(self, language=None):
+        if self.continuous and self.stream is not None and \
+                self.stream.is_alive() and \
+                not self.stream.results_event.is_set():
+            # The open stream is used for the next utterance. Final results
+            # received since the last `transcribe` are for audio sent before
+            # this utterance, e.g. a late result for one that timed out
+            late, _ = self.stream.take_segments(0)
+            if late:
+                LOG.debug(f"Dropping late results: {late}")
+            self.transcript_ready.clear()
+            return
+        if self.cache is None:
+            return super().stream_start(language)
+        # With caching, audio is hashed and held until `transcribe` so a
+        # cache hit never opens a stream
+        self._cache_audio = None
+        self.stream_stop()
+        self._cache_language = language
+        self._cache_hash = self._cache_fingerprint()
+        self._cache_audio = []
+        self.transcript_ready.clear()
+
+    def stream_data(self, data):
+        if self._cache_audio is None:
+            return super().stream_data(data)
+        self._cache_hash.update(data)
+        self._cache_audio.append(data)
+
+    def stream_stop(self):
+        if self._cache_audio:
+            # Held audio hasn't been sent; transcribe it as `execute` expects
+            result = self._transcribe_cached()
+            return result[0][0] if result else None
+        self._cache_audio = None
+        stream = self.stream if self.continuous else None
+        text = super().stream_stop()
+        if stream:
+            self._report_metrics(stream.metrics)
+        return text
+
+    def _transcribe_cached(self) -> list:
+        audio = self._cache_audio
+        self._cache_audio = None
+        key = self._cache_hash.hexdigest()
+        result = self.cache.get(key)
+        if result is not None:
+            LOG.debug(f"Cached transcription: {key}")
+            # The detected language and word timings aren't cached
+            self.detected_language = None if self.alternative_languages \
+                else self.language
+            self.word_timings = None
+            self.trimmed_seconds = 0.0
+            self.queue_stats = dict()
+            self.transcript_ready.set()
+            return result
+        super().stream_start(self._cache_language)
+        # Held audio is queued all at once rather than in real time, so wait
+        # for room instead of dropping it or aborting under the queue policy
+        policy, self.queue.policy = self.queue.policy, "block"
+        try:
+            for chunk in audio:
+                self.queue.put(chunk)
+        finally:
+            self.queue.policy = policy
+        result = self.transcribe()
+        if result:
+            self.cache.put(key, result)
+        return result
+
+    def _transcribe_continuous(self) -> list:
+        """
+        Get final results received since the last call, waiting up to
+        `continuous_result_timeout` seconds for one. The stream is left open
+        for the next utterance unless it has ended.
+        """
+        from neon_stt_plugin_google_cloud_streaming.words import WordTimings
+        stream = self.stream
+        # End the call so results for the utterance aren't held back
+        # waiting for more audio
+        stream.flush()
+        segments, word_segments = stream.take_segments(
+            self.config.get("continuous_result_timeout", 2))
+        result = stream._stitch(segments)
+        self.detected_language = self._get_detected_language(
+            stream.detected_language, result)
+        self.word_timings = WordTimings.join(word_segments) \
+            if stream.word_time_offsets else None
+        if stream.results_event.is_set():
+            # The stream failed or was closed; `stream_start` opens another
+            self.stream_stop()
+        self.transcript_ready.set()
+        return result
 
     def transcribe(self, *args, **kwargs):
+        from neon_stt_plugin_google_cloud_streaming.audio_queue import \
+            AudioQueue
+        from neon_stt_plugin_google_cloud_streaming.endpoints import \
+            is_endpoint_failure
+        if self._cache_audio is not None:
+            return self._transcribe_cached()
+        if self.continuous:
+            return self._transcribe_continuous()
         self.queue.put(None)
         self.stream.results_event.wait()
         result = copy(self.stream.transcriptions)
+        self.detected_language = self._get_detected_language(
+            self.stream.detected_language, result)
+        self.word_timings = self.stream.get_word_timings()
+        if isinstance(self.queue, AudioQueue):
+            self.queue_stats = self.queue.stats()
+        self._report_metrics(self.stream.metrics)
+        if self.endpoint_selector and self.stream.error and \
+                is_endpoint_failure(self.stream.error):
+            self.endpoint_selector.report_failure(self.stream.endpoint)
+        if self.hedge_client and not (self.stream.long_form or
+                                      self.stream.resilient):
+            self.hedge_stats.record(self.stream.hedged, self.stream.hedge_won,
+                                    self.stream.latency_won)
+        stream = self.stream
         self.stream_stop()
+        # Read once the stream has counted any audio it discarded
+        self.trimmed_seconds = stream.discarded_seconds + \
+            sum(getattr(stage, "trimmed_seconds", 0)
+                for stage in stream.stages)
+        if self.preopen:
+            self.prepare_stream()
         return result or []
 
 
 class GoogleStreamThread(StreamThread):
-    def __init__(self, queue, lang, client, streaming_config):
+    def __init__(self, queue, lang, client, streaming_config,
+                 interim_callbacks=None, stages=None, encoder_factory=None,
+                 long_form=False, stream_limit=290, max_replay_seconds=30,
+                 hedge_client=None, hedge_after=1.5, resilient=False,
+                 max_reconnects=5, utterance_callbacks=None,
+                 word_time_offsets=False, continuous=False, idle_limit=5):
+        from google.api_core.retry import Retry
         super().__init__(queue, lang)
         self.name = "StreamThread"
         self.client = client
-        self.retry = google.api_core.retry.Retry(timeout=30)
+        self.retry = Retry(timeout=30)
         self.timeout = 30
         self.streaming_config = streaming_config
         self.results_event = Event()
         self.transcriptions = []
+        self.segments = []
+        self.opened = None
+        self.interim_callbacks = interim_callbacks or []
+        self.utterance_callbacks = utterance_callbacks or []
+        self.word_time_offsets = word_time_offsets
+        self.word_segments = []
+        self._segments_lock = Lock()
+        self._final_event = Event()
+        self._upload_done = Event()
+        self.stages = stages or []
+        self.discarded_seconds = 0.0
+        self.encoder_factory = encoder_factory
+        self.long_form = long_form
+        self.stream_limit = stream_limit
+        self.max_replay_seconds = max_replay_seconds
+        self.rollovers = 0
+        self.resilient = resilient
+        self.max_reconnects = max_reconnects
+        self.reconnects = 0
+        self.metrics = StreamMetrics()
+        self.endpoint = None
+        self.error = None
+        self.detected_language = None
+        self.continuous = continuous
+        self.idle_limit = idle_limit
+        self._flush = Event()
+        self.hedge_client = hedge_client
+        self.hedge_after = hedge_after
+        self.hedged = False
+        self.hedge_won = False
+        self.latency_won = None
+        self._winner = None
+        self._hedge_lock = Lock()
+        self._hedge_event = Event()
+        # Idle ticks let buffering stages flush and long-form streams roll
+        # over when no audio is arriving
+        intervals = [s.max_latency / 2 for s in self.stages
+                     if hasattr(s, "max_latency")]
+        if long_form:
+            intervals.append(0.5)
+        self.poll_interval = min(intervals, default=None)
+
+    def start(self):
+        # Prepared streams are already running when handed to `stream_start`
+        if self.ident is None:
+            self.opened = monotonic()
+            self.metrics.mark("opened")
+            super().start()
 
     def handle_audio_stream(self, audio, language):
-        req = (speech.StreamingRecognizeRequest(audio_content=x) for x in audio)
-        responses = self.client.streaming_recognize(self.streaming_config, req,
+        from neon_stt_plugin_google_cloud_streaming.audio_queue import \
+            AudioQueue
+        source = audio
+        audio = self._process(source)
+        try:
+            if self.long_form or self.resilient:
+                self._stream_long_form(audio)
+            elif self.hedge_client:
+                self._stream_hedged(audio)
+            else:
+                self._stream(audio)
+        except Exception as e:
+            LOG.error(f"Stream failed: {e}")
+            self.error = e
+        if any(getattr(stage, "ended", False) for stage in self.stages):
+            self._publish_results()
+            # Audio after a stage ended the upload isn't sent; read it to
+            # the end of the utterance so it is counted as trimmed
+            discarded = sum(len(chunk) for chunk in source)
+            if isinstance(self.queue, AudioQueue):
+                self.discarded_seconds = \
+                    discarded / self.queue.bytes_per_second
+        if isinstance(self.queue, AudioQueue):
+            # Nothing will consume further audio; don't block producers
+            self.queue.close()
+        self._publish_results()
+        return self.transcriptions
+
+    def _stream(self, audio):
+        single_utterance = self.streaming_config.single_utterance
+        responses = self.client.streaming_recognize(self.streaming_config,
+                                                    self._requests(audio),
                                                     timeout=self.timeout,
                                                     retry=self.retry)
         # Responses are yielded, but we will return once the first sentence is transcribed
         for res in responses:
+            self.metrics.mark("first_response", first=True)
             for result in res.results:
                 LOG.debug(result)
+            if _is_end_of_single_utterance(res):
+                self._end_upload()
             if res.results and res.results[0].is_final:
-                self.transcriptions = []
-                for alternative in res.results[0].alternatives:
-                    transcription = alternative.transcript
-                    confidence = alternative.confidence
-                    self.transcriptions.append((transcription, confidence))
+                self._add_final(res.results[0])
+                self.transcriptions = self._stitch(self.segments)
+                if single_utterance:
+                    # Report results without waiting for the server to
+                    # close the stream
+                    self._publish_results()
+                    self._end_upload()
+                    responses.cancel()
+                    break
+            elif res.results:
+                self._handle_interim(res.results)
+
+    def _stream_long_form(self, audio):
+        """
+        Stream audio over one or more calls, retaining audio not yet covered
+        by a final result so it can be replayed at the start of the next
+        call. In long-form mode, calls are rolled over before `stream_limit`
+        seconds; in resilient mode, calls which fail with a transient error
+        are reconnected with backoff. Final results from all calls are
+        stitched into a single transcript.
+        """
+        from google.api_core.retry import exponential_sleep_generator
+        from neon_stt_plugin_google_cloud_streaming.audio import ReplayBuffer
+        replay = ReplayBuffer(self.max_replay_seconds)
+        # gRPC consumes requests on its own thread, which may still be
+        # waiting for audio after a call fails. Audio is read into the
+        # replay buffer on one thread and each call reads from the buffer by
+        # offset, so an abandoned call never competes for the source.
+        Thread(target=self._fill_replay, args=(audio, replay), daemon=True,
+               name="ReplayFill").start()
+        backoff = exponential_sleep_generator(0.1, 5)
+        timeout = self.stream_limit + self.timeout if self.long_form \
+            else self.timeout
+        # Retrying a call would resend from the wrong offset; reconnects
+        # replay from the last final result instead
+        retry = None if self.resilient else self.retry
+        try:
+            while True:
+                offset = replay.start
+                done, drained, idle = Event(), Event(), Event()
+                requests = self._requests(self._long_form_audio(
+                    replay, offset, done, drained, idle))
+                try:
+                    responses = self.client.streaming_recognize(
+                        self.streaming_config, requests, timeout=timeout,
+                        retry=retry)
+                    for res in responses:
+                        self._handle_replay_response(res, replay, offset)
+                except Exception as e:
+                    if not self._can_reconnect(e):
+                        raise
+                    self.reconnects += 1
+                    self.metrics.reconnects = self.reconnects
+                    delay = next(backoff)
+                    LOG.warning(f"Stream failed ({e}); reconnecting in "
+                                f"{delay:.2f}s with "
+                                f"{len(replay) / replay.bytes_per_second}s "
+                                f"of replay")
+                    sleep(delay)
+                    continue
+                finally:
+                    done.set()
+                if drained.is_set() or self._upload_done.is_set():
+                    break
+                if idle.is_set():
+                    self._flush.clear()
+                    # The next call opens when the next utterance arrives
+                    if not replay.wait(replay.sent):
+                        break
+                    continue
+                self.rollovers += 1
+                self.metrics.rollovers = self.rollovers
+                LOG.debug(f"Rolling over to a new stream with "
+                          f"{len(replay) / replay.bytes_per_second}s of "
+                          f"replay")
+        finally:
+            replay.close()
+            self.transcriptions = self._stitch(self.segments)
+
+    @staticmethod
+    def _fill_replay(audio, replay):
+        """
+        Read processed audio into `replay` until the audio ends or the
+        buffer is closed.
+        """
+        try:
+            for chunk in audio:
+                if replay.closed:
+                    return
+                if chunk:
+                    replay.append(chunk, block=True)
+        except Exception as e:
+            if not replay.closed:
+                LOG.error(f"Failed to read audio: {e}")
+        finally:
+            replay.close()
+
+    def _handle_replay_response(self, res, replay, offset):
+        self.metrics.mark("first_response", first=True)
+        for result in res.results:
+            LOG.debug(result)
+            if result.is_final:
+                replay.acknowledge(replay.offset_at(
+                    result.result_end_time.total_seconds(), offset))
+                # Word offsets are relative to the start of each call
+                self._add_final(result,
+                                offset * 1000 // replay.bytes_per_second)
+        if res.results and not res.results[0].is_final:
+            self._handle_interim(res.results)
+
+    def _can_reconnect(self, error: Exception) -> bool:
+        from neon_stt_plugin_google_cloud_streaming.endpoints import \
+            is_endpoint_failure
+        return self.resilient and self.reconnects < self.max_reconnects \
+            and not self._upload_done.is_set() and is_endpoint_failure(error)
+
+    def _stream_hedged(self, audio):
+        """
+        Stream audio to the primary client and, if it has not responded
+        `hedge_after` seconds after the latest audio or response (or fails),
+        replay the same audio to `hedge_client`. The first stream to return
+        a final result is used and the other is cancelled.
+        """
+        tee = AudioTee(audio)
+        tee.start()
+        primary = self._start_attempt(self.client, tee, True)
+        attempts = [primary]
+        if not self.hedge_after:
+            self.hedged = True
+            attempts.append(self._start_attempt(self.hedge_client, tee))
+        while True:
+            winner = self._winner
+            if winner:
+                for attempt in attempts:
+                    if attempt is not winner:
+                        attempt.cancel()
+                winner.thread.join()
+                break
+            if not self.hedged and (primary.failed or
+                                    self._hedge_due(primary, tee)):
+                LOG.info("No response from primary endpoint; hedging stream")
+                self.hedged = True
+                attempts.append(self._start_attempt(self.hedge_client, tee))
+            elif not any(a.thread.is_alive() for a in attempts):
+                break
+            self._hedge_event.wait(min(self.hedge_after or 0.05, 0.05))
+            self._hedge_event.clear()
+        if winner and winner is not primary:
+            self.hedge_won = True
+            # Lower bound on the time saved: the primary had produced
+            # nothing for this long when the hedged result arrived
+            self.latency_won = winner.final_time - \
+                max(primary.last_response or 0, tee.last_chunk or 0)
+
+    def _hedge_due(self, primary, tee) -> bool:
+        if tee.last_chunk is None:
+            return False
+        idle_since = max(primary.last_response or 0, tee.last_chunk)
+        return monotonic() - idle_since >= self.hedge_after
+
+    def _start_attempt(self, client, tee, primary=False) -> HedgeAttempt:
+        attempt = HedgeAttempt(client, tee.reader(), primary)
+        attempt.thread = Thread(target=self._run_attempt, args=(attempt,),
+                                daemon=True)
+        attempt.thread.start()
+        return attempt
+
+    def _run_attempt(self, attempt):
+        single_utterance = self.streaming_config.single_utterance
+        try:
+            # Retrying the call can't replay audio already consumed from the
+            # reader; a failed primary is hedged instead
+            responses = attempt.client.streaming_recognize(
+                self.streaming_config, self._requests(attempt.reader),
+                timeout=self.timeout, retry=None)
+            attempt.responses = responses
+            if attempt.cancelled:
+                responses.cancel()
+                return
+            for res in responses:
+                attempt.last_response = monotonic()
+                self.metrics.mark("first_response", first=True)
+                if _is_end_of_single_utterance(res):
+                    self._end_upload()
+                if res.results and res.results[0].is_final:
+                    if not self._accept_final(attempt, res.results[0]):
+                        break
+                    if single_utterance:
+                        self._publish_results()
+                        self._end_upload()
+                        responses.cancel()
+                        break
+                elif res.results and attempt.primary:
+                    self._handle_interim(res.results)
+        except Exception as e:
+            if not attempt.cancelled:
+                LOG.warning(f"Stream failed: {e}")
+                attempt.failed = True
+                if attempt.primary:
+                    self.error = e
+        finally:
+            self._hedge_event.set()
+
+    def _accept_final(self, attempt, result) -> bool:
+        """
+        Record a final result from `attempt` if it is the first attempt to
+        return one.
+        :return: False if another attempt already won
+        """
+        with self._hedge_lock:
+            if self._winner is None:
+                attempt.final_time = monotonic()
+                self._winner = attempt
+                self._hedge_event.set()
+            elif self._winner is not attempt:
+                return False
+        self._add_final(result)
+        self.transcriptions = self._stitch(self.segments)
+        return True
+
+    def _add_final(self, result, offset_ms: int = 0):
+        """
+        Record a final result and pass it to utterance callbacks.
+        :param result: final `StreamingRecognitionResult`
+        :param offset_ms: offset of the call's first audio in the stream
+        """
+        from neon_stt_plugin_google_cloud_streaming.words import WordTimings
+        self.metrics.mark("final_result")
+        alternatives = self._alternatives(result)
+        words = WordTimings.from_result(result, offset_ms) \
+            if self.word_time_offsets else None
+        with self._segments_lock:
+            self.segments.append(alternatives)
+            if words is not None:
+                self.word_segments.append(words)
+            self._final_event.set()
+        self.detected_language = result.language_code
+        _notify_utterance(self.utterance_callbacks, alternatives,
+                          result.language_code)
+
+    def flush(self):
+        """
+        In continuous mode, end the current call once the audio received so
+        far has been sent. The next call opens when more audio arrives.
+        """
+        self._flush.set()
+
+    def take_segments(self, timeout: Optional[float] = None) -> tuple:
+        """
+        Remove and return the final results received so far, waiting up to
+        `timeout` seconds for one if there are none.
+        :return: (list of alternatives for each final result,
+            list of `WordTimings` if word time offsets are enabled)
+        """
+        self._final_event.wait(timeout)
+        with self._segments_lock:
+            segments, self.segments = self.segments, []
+            word_segments, self.word_segments = self.word_segments, []
+            self._final_event.clear()
+            if self.results_event.is_set():
+                # Don't block later calls once the stream has ended
+                self._final_event.set()
+        return segments, word_segments
+
+    def get_word_timings(self):
+        """
+        Get word timings for all final results received on this stream.
+        :return: `WordTimings`, or None if word time offsets are disabled
+        """
+        from neon_stt_plugin_google_cloud_streaming.words import WordTimings
+        if not self.word_time_offsets:
+            return None
+        with self._segments_lock:
+            return WordTimings.join(self.word_segments)
+
+    def _long_form_audio(self, replay, offset: int, done: Event,
+                         drained: Event, idle: Event):
+        """
+        Read audio for one call from `replay`, starting with unacknowledged
+        audio at `offset`. Empty chunks are yielded while waiting for audio.
+        :param done: set when the call has ended
+        :param drained: set here once all audio has been read
+        :param idle: set here if a continuous call ended between utterances
+        """
+        started = last_audio = monotonic()
+        replay_end = replay.sent
+        limit = self.stream_limit * replay.bytes_per_second
+        call_start = offset
+        while not done.is_set():
+            flushing = self._flush.is_set()
+            read = replay.read(offset, 0 if flushing else 0.5)
+            if read is None:
+                drained.set()
+                return
+            offset, chunk = read
+            offset += len(chunk)
+            yield chunk
+            if chunk:
+                last_audio = monotonic()
+            elif self.continuous and \
+                    (flushing or monotonic() - last_audio >= self.idle_limit):
+                # Google ends calls which get no audio for ~10s with
+                # OUT_OF_RANGE; half-close instead so final results arrive
+                idle.set()
+                return
+            # Calls always send some audio beyond the replay. Recorded audio
+            # is sent faster than real time, so the audio sent is checked as
+            # well as the call duration
+            if self.long_form and (not chunk or offset > replay_end) and \
+                    (monotonic() - started >= self.stream_limit or
+                     offset - call_start >= limit):
+                return
+
+    @staticmethod
+    def _alternatives(result) -> list:
+        return _alternatives(result)
+
+    @staticmethod
+    def _stitch(segments: list) -> list:
+        """
+        Join the best alternative of each final result into one transcript.
+        A single final result is returned with all of its alternatives.
+        """
+        segments = [s for s in segments if s]
+        if len(segments) <= 1:
+            return segments[0] if segments else []
+        transcript = " ".join(s[0][0].strip() for s in segments)
+        confidence = sum(s[0][1] for s in segments) / len(segments)
+        return [(transcript, confidence)]
+
+    def _publish_results(self):
+        if self.results_event.is_set():
+            return
         LOG.debug(self.transcriptions)
-        self.results_event.set()
         if self.transcriptions:
             self.text = self.transcriptions[0][0]  # Backwards compat.
-        return self.transcriptions
+        self.metrics.mark("results_ready")
+        with self._segments_lock:
+            self.results_event.set()
+            self._final_event.set()
+
+    def _get_data(self):
+        if not self.poll_interval:
+            yield from super()._get_data()
+            return
+        while True:
+            try:
+                d = self.queue.get(timeout=self.poll_interval)
+            except Empty:
+                yield b""
+                continue
+            if d is None:
+                break
+            yield d
+            self.queue.task_done()
+
+    def _process(self, audio):
+        for stage in self.stages:
+            audio = stage.process(audio)
+        return audio
+
+    def _requests(self, audio):
+        from google.cloud import speech
+        if self.encoder_factory:
+            audio = self.encoder_factory().process(audio)
+        for chunk in audio:
+            if self._upload_done.is_set():
+                break
+            if chunk:
+                self.metrics.audio_sent(len(chunk))
+                yield speech.StreamingRecognizeRequest(audio_content=chunk)
+
+    def _end_upload(self):
+        """
+        Stop sending audio and half-close the request stream.
+        """
+        if not self._upload_done.is_set():
+            self._upload_done.set()
+            self.queue.put(None)
+
+    def _handle_interim(self, results):
+        _notify_interim(self.interim_callbacks, results)
 
     def finalize(self):
         self.results_event.wait()
@@ -0,0 +1,345 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+
+from collections import deque
+from copy import copy
+from typing import Optional
+
+from google.cloud import speech
+from ovos_utils.log import LOG
+
+from neon_stt_plugin_google_cloud_streaming import GoogleCloudStreamingSTT, \
+    GoogleStreamThread, _alternatives, _is_end_of_single_utterance, \
+    _notify_interim, _notify_utterance
+from neon_stt_plugin_google_cloud_streaming.audio import FormatAdapter
+from neon_stt_plugin_google_cloud_streaming.client_pool import \
+    get_shared_async_client
+from neon_stt_plugin_google_cloud_streaming.metrics import StreamMetrics
+from neon_stt_plugin_google_cloud_streaming.words import WordTimings
+
+
+class _ChunkFeeder:
+    """
+    Source iterator for synchronous audio stages which yields an empty
+    chunk (idle tick) when no audio is pending, instead of blocking.
+    """
+
+    def __init__(self):
+        self._chunks = deque()
+        self._closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._chunks:
+            return self._chunks.popleft()
+        if self._closed:
+            raise StopIteration
+        return b""
+
+    def append(self, chunk: bytes):
+        self._chunks.append(chunk)
+
+    def discard(self) -> int:
+        """
+        Drop pending chunks.
+        :return: number of bytes dropped
+        """
+        size = sum(len(chunk) for chunk in self._chunks)
+        self._chunks.clear()
+        return size
+
+    def close(self):
+        self._closed = True
+
+
+class _AsyncStream:
+    """
+    A single `streaming_recognize` call on an asyncio client.
+    """
+
+    def __init__(self, client: speech.SpeechAsyncClient, streaming_config,
+                 stages: list, interim_callbacks: list, timeout: float = 30,
+                 utterance_callbacks: Optional[list] = None):
+        self.client = client
+        self.streaming_config = streaming_config
+        self.stages = stages
+        self.interim_callbacks = interim_callbacks
+        self.utterance_callbacks = utterance_callbacks or []
+        self.timeout = timeout
+        self.transcriptions = []
+        self.segments = []
+        self.word_segments = []
+        self.detected_language = None
+        self.results_event = asyncio.Event()
+        self.metrics = StreamMetrics()
+        self._feeder = _ChunkFeeder()
+        audio = self._feeder
+        for stage in stages:
+            audio = stage.process(audio)
+        self._pipeline = audio
+        self._requests = asyncio.Queue()
+        self._upload_done = False
+        self.discarded_bytes = 0
+        self._task = None
+
+    def start(self):
+        self.metrics.mark("opened")
+        self._task = asyncio.ensure_future(self._run())
+
+    def put(self, data: bytes):
+        """
+        Process a chunk of audio and queue the output for upload.
+        """
+        if self._upload_done:
+            if self._stage_ended():
+                self.discarded_bytes += len(data)
+            return
+        self._feeder.append(data)
+        self._drain()
+
+    def _drain(self):
+        # Stages pass the feeder's idle tick through once they have
+        # processed all pending input
+        for chunk in self._pipeline:
+            if not chunk:
+                return
+            self._requests.put_nowait(chunk)
+        # Audio stages ended the stream (i.e. VAD detected end of speech)
+        self.discarded_bytes += self._feeder.discard()
+        self._end_upload()
+
+    def _stage_ended(self) -> bool:
+        return any(getattr(stage, "ended", False) for stage in self.stages)
+
+    def _end_upload(self):
+        if not self._upload_done:
+            self._upload_done = True
+            self._requests.put_nowait(None)
+
+    async def _request_iterator(self):
+        yield speech.StreamingRecognizeRequest(
+            streaming_config=self.streaming_config)
+        while True:
+            chunk = await self._requests.get()
+            if chunk is None:
+                return
+            self.metrics.audio_sent(len(chunk))
+            yield speech.StreamingRecognizeRequest(audio_content=chunk)
+
+    async def _run(self):
+        single_utterance = self.streaming_config.single_utterance
+        try:
+            responses = await self.client.streaming_recognize(
+                requests=self._request_iterator(), timeout=self.timeout)
+            async for res in responses:
+                self.metrics.mark("first_response", first=True)
+                for result in res.results:
+                    LOG.debug(result)
+                if _is_end_of_single_utterance(res):
+                    self._end_upload()
+                if res.results and res.results[0].is_final:
+                    self.metrics.mark("final_result")
+                    alternatives = _alternatives(res.results[0])
+                    self.segments.append(alternatives)
+                    if self.streaming_config.config.enable_word_time_offsets:
+                        self.word_segments.append(
+                            WordTimings.from_result(res.results[0]))
+                    self.transcriptions = \
+                        GoogleStreamThread._stitch(self.segments)
+                    self.detected_language = res.results[0].language_code
+                    _notify_utterance(self.utterance_callbacks, alternatives,
+                                      self.detected_language)
+                    if single_utterance:
+                        self._set_results()
+                        self._end_upload()
+                        responses.cancel()
+                        break
+                elif res.results:
+                    _notify_interim(self.interim_callbacks, res.results)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            LOG.error(f"Stream failed: {e}")
+        finally:
+            self._set_results()
+
+    def _set_results(self):
+        if not self.results_event.is_set():
+            self.metrics.mark("results_ready")
+            self.results_event.set()
+
+    async def finish(self) -> list:
+        """
+        End the audio upload and wait for final results.
+        """
+        if not self._upload_done:
+            self._feeder.close()
+            self._drain()
+        await self.results_event.wait()
+        return copy(self.transcriptions)
+
+    async def cancel(self):
+        """
+        Abort the stream without waiting for results.
+        """
+        self._end_upload()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class AsyncGoogleCloudStreamingSTT(GoogleCloudStreamingSTT):
+    """
+    asyncio interface to Google Cloud Speech-To-Text using the same
+    configuration as `GoogleCloudStreamingSTT`. Streams run as tasks on the
+    calling event loop and instances share one channel per loop, so one
+    instance may be created per concurrent session.
+
+        stt = AsyncGoogleCloudStreamingSTT(config)
+        await stt.stream_start()
+        await stt.stream_data(chunk)
+        transcripts = await stt.transcribe()
+
+    Buffering stages flush on the next `stream_data` or `transcribe` call
+    rather than on a timer. `preopen`, `long_form`, `resilient`,
+    `continuous`, `hedge_endpoint`, `api_endpoints` and `transcribe_batch`
+    are not supported by this interface.
+    """
+
+    def __init__(self, config=None, **kwargs):
+        super().__init__(config, **kwargs)
+        for mode in ("long_form", "resilient", "continuous"):
+            if self.config.get(mode):
+                LOG.warning(f"{mode} is not supported by the asyncio "
+                            f"interface")
+        if self.config.get("hedge_endpoint"):
+            LOG.warning("hedge_endpoint is not supported by the asyncio "
+                        "interface")
+
+    def _create_client(self, credentials, api_endpoint=None):
+        # Async clients are bound to an event loop and created on first use
+        return None
+
+    @property
+    def async_client(self) -> speech.SpeechAsyncClient:
+        self._initialize()
+        return get_shared_async_client(
+            self._credentials, self.config.get("api_endpoint"),
+            keepalive_time_ms=self.config.get("keepalive_time_ms", 30000),
+            keepalive_timeout_ms=self.config.get("keepalive_timeout_ms",
+                                                 10000))
+
+    def _create_endpoint_selector(self, endpoints: list):
+        LOG.warning("api_endpoints is not supported by the asyncio interface")
+        return None
+
+    def prepare_stream(self):
+        LOG.warning("preopen is not supported by the asyncio interface")
+
+    def create_streaming_thread(self):
+        raise NotImplementedError("Use `stream_start` to create a stream")
+
+    def transcribe_batch(self, items, max_workers=None):
+        raise NotImplementedError("Use `GoogleCloudStreamingSTT` to "
+                                  "transcribe batches")
+
+    async def stream_start(self, language: Optional[str] = None):
+        await self.stream_stop()
+        if self.cache is not None:
+            self._cache_hash = self._cache_fingerprint()
+            self._cache_audio = []
+            return
+        self._open_stream()
+
+    def _open_stream(self):
+        stages = self._create_stages()
+        if self.upload_encoding == "flac":
+            stages.append(self._create_encoder())
+        self.stream = _AsyncStream(
+            self.async_client, self.streaming_config, stages,
+            self._interim_callbacks,
+            utterance_callbacks=self._utterance_callbacks)
+        self.stream.start()
+
+    async def stream_data(self, data: bytes):
+        if self._cache_audio is not None:
+            self._cache_hash.update(data)
+            self._cache_audio.append(data)
+        else:
+            self.stream.put(data)
+
+    async def stream_stop(self):
+        self._cache_audio = None
+        if self.stream is not None:
+            await self.stream.cancel()
+            self.stream = None
+
+    async def transcribe(self, *args, **kwargs) -> list:
+        if self._cache_audio is not None:
+            return await self._transcribe_cached()
+        stream = self.stream
+        self.stream = None
+        result = await stream.finish()
+        self.detected_language = self._get_detected_language(
+            stream.detected_language, result)
+        self.word_timings = WordTimings.join(stream.word_segments) \
+            if self.config.get("word_timings") else None
+        # Audio received after a stage ended the upload is trimmed as well
+        self.trimmed_seconds = stream.discarded_bytes / \
+            FormatAdapter.bytes_per_second(*self.input_format) + \
+            sum(getattr(stage, "trimmed_seconds", 0)
+                for stage in stream.stages)
+        self._report_metrics(stream.metrics)
+        return result or []
+
+    async def _transcribe_cached(self) -> list:
+        audio = self._cache_audio
+        self._cache_audio = None
+        key = self._cache_hash.hexdigest()
+        result = self.cache.get(key)
+        if result is not None:
+            self.detected_language = None if self.alternative_languages \
+                else self.language
+            self.word_timings = None
+            self.trimmed_seconds = 0.0
+            return result
+        self._open_stream()
+        for chunk in audio:
+            self.stream.put(chunk)
+        result = await self.transcribe()
+        if result:
+            self.cache.put(key, result)
+        return result
+
+    async def execute(self, audio=None, language=None) -> Optional[str]:
+        result = await self.transcribe()
+        return result[0][0] if result else None
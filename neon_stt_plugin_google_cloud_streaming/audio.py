@@ -0,0 +1,453 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from collections import deque
+from math import gcd
+from threading import Condition
+from time import monotonic
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+from ovos_utils.log import LOG
+
+# Recognition audio is always sent as 16kHz mono LINEAR16
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+BYTES_PER_SECOND = SAMPLE_RATE * SAMPLE_WIDTH
+
+
+class FrameCoalescer:
+    """
+    Batches small audio chunks into larger frames so fewer
+    `StreamingRecognizeRequest` messages are built and sent per second.
+    Empty chunks are treated as idle ticks which allow a partial frame to be
+    flushed once it has been buffered for `max_latency` seconds.
+    """
+
+    def __init__(self, frame_bytes: int, max_latency: float):
+        """
+        :param frame_bytes: target size of emitted frames in bytes
+        :param max_latency: max seconds audio may wait in the buffer
+        """
+        self.frame_bytes = frame_bytes
+        self.max_latency = max_latency
+        self._buffer = bytearray()
+        self._oldest = None
+
+    @classmethod
+    def from_duration(cls, frame_ms: int, max_latency_ms: int,
+                      bytes_per_second: int = BYTES_PER_SECOND):
+        frame_bytes = int(bytes_per_second * frame_ms / 1000)
+        frame_bytes -= frame_bytes % SAMPLE_WIDTH
+        return cls(frame_bytes, max_latency_ms / 1000)
+
+    def _take(self, size: int) -> bytes:
+        frame = bytes(memoryview(self._buffer)[:size])
+        del self._buffer[:size]
+        self._oldest = monotonic() if self._buffer else None
+        return frame
+
+    def process(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Coalesce an iterable of audio chunks into frames.
+        :param chunks: audio chunks; empty chunks are idle ticks and are
+            passed through after any flush
+        :return: generator of frames
+        """
+        for chunk in chunks:
+            if chunk:
+                if not self._buffer:
+                    self._oldest = monotonic()
+                self._buffer += chunk
+            while len(self._buffer) >= self.frame_bytes:
+                yield self._take(self.frame_bytes)
+            if self._buffer and \
+                    monotonic() - self._oldest >= self.max_latency:
+                yield self._take(len(self._buffer))
+            if not chunk:
+                yield chunk
+        if self._buffer:
+            yield self._take(len(self._buffer))
+
+
+class VoiceActivityTrimmer:
+    """
+    Energy and zero-crossing based voice activity detector which drops
+    leading silence (keeping a short pre-roll) and ends the stream once
+    speech is followed by a window of trailing silence.
+    Features are computed for all complete frames in a chunk at once.
+    """
+
+    def __init__(self, energy_threshold: float = 300, pre_roll: float = 0.3,
+                 trailing_silence: float = 1.0, frame_ms: int = 20,
+                 start_frames: int = 2, zcr_threshold: float = 0.25):
+        """
+        :param energy_threshold: frame RMS (16-bit scale) considered speech
+        :param pre_roll: seconds of audio to keep before detected speech
+        :param trailing_silence: seconds of silence after speech which ends
+            the stream (0 to never end the stream)
+        :param frame_ms: analysis frame duration in milliseconds
+        :param start_frames: consecutive speech frames required to start
+        :param zcr_threshold: zero-crossing rate above which frames with at
+            least half the energy threshold (i.e. fricatives) are speech
+        """
+        self.energy_threshold = energy_threshold
+        self.zcr_threshold = zcr_threshold
+        self.frame_samples = SAMPLE_RATE * frame_ms // 1000
+        self.pre_roll_frames = round(pre_roll * 1000 / frame_ms)
+        self.trailing_frames = round(trailing_silence * 1000 / frame_ms)
+        self.start_frames = start_frames
+        self.speech_started = False
+        self.ended = False
+        self.trimmed_seconds = 0.0
+        self._carry = np.zeros(0, dtype=np.int16)
+        self._pending = deque()
+        self._speech_run = 0
+        self._silence_run = 0
+
+    def is_speech(self, frames: np.ndarray) -> np.ndarray:
+        """
+        Classify a 2D array of frames (one frame per row).
+        :return: boolean array with one value per frame
+        """
+        samples = frames.astype(np.float32)
+        rms = np.sqrt(np.mean(samples * samples, axis=1))
+        signs = np.signbit(frames)
+        zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+        return (rms >= self.energy_threshold) | \
+            ((rms >= self.energy_threshold / 2) & (zcr >= self.zcr_threshold))
+
+    def process(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Trim silence from a stream of 16-bit mono PCM chunks.
+        :param chunks: audio chunks; empty chunks are passed through
+        :return: generator of audio to send
+        """
+        frame_seconds = self.frame_samples / SAMPLE_RATE
+        for chunk in chunks:
+            if not chunk:
+                yield chunk
+                continue
+            samples = np.concatenate(
+                [self._carry, np.frombuffer(chunk, dtype="<i2")])
+            count = len(samples) // self.frame_samples
+            self._carry = samples[count * self.frame_samples:]
+            frames = samples[:count * self.frame_samples].reshape(
+                count, self.frame_samples)
+            output = []
+            for idx, (frame, speech) in enumerate(
+                    zip(frames, self.is_speech(frames))):
+                if self.speech_started:
+                    output.append(frame)
+                    self._silence_run = 0 if speech else \
+                        self._silence_run + 1
+                    if self.trailing_frames and \
+                            self._silence_run >= self.trailing_frames:
+                        # The rest of the chunk is discarded
+                        self.ended = True
+                        self.trimmed_seconds += \
+                            (count - idx - 1) * frame_seconds + \
+                            len(self._carry) / SAMPLE_RATE
+                        yield np.concatenate(output).tobytes()
+                        return
+                    continue
+                self._pending.append(frame)
+                self._speech_run = self._speech_run + 1 if speech else 0
+                if self._speech_run >= self.start_frames:
+                    self.speech_started = True
+                    output.extend(self._pending)
+                    self._pending.clear()
+                elif len(self._pending) > \
+                        self.pre_roll_frames + self.start_frames:
+                    self._pending.popleft()
+                    self.trimmed_seconds += frame_seconds
+            if output:
+                yield np.concatenate(output).tobytes()
+        if self.speech_started:
+            if len(self._carry):
+                yield self._carry.tobytes()
+        else:
+            self.trimmed_seconds += len(self._pending) * frame_seconds + \
+                len(self._carry) / SAMPLE_RATE
+
+
+class PolyphaseResampler:
+    """
+    Streaming rational resampler. A Kaiser-windowed sinc low-pass filter is
+    split into `up` polyphase branches so each output sample costs `taps`
+    multiply-adds; the last `taps - 1` input samples are carried between
+    calls so chunked output matches resampling the whole signal at once.
+    """
+
+    def __init__(self, input_rate: int, output_rate: int = SAMPLE_RATE,
+                 taps: int = 32, beta: float = 8.0):
+        """
+        :param input_rate: sample rate of input audio
+        :param output_rate: sample rate of output audio
+        :param taps: filter taps per polyphase branch
+        :param beta: Kaiser window shape parameter
+        """
+        divisor = gcd(input_rate, output_rate)
+        self.up = output_rate // divisor
+        self.down = input_rate // divisor
+        self.taps = taps
+        length = self.up * taps
+        # Cutoff relative to the upsampled rate, just under the lower Nyquist
+        cutoff = 0.45 / max(self.up, self.down)
+        n = np.arange(length) - (length - 1) / 2
+        prototype = 2 * cutoff * np.sinc(2 * cutoff * n) * \
+            np.kaiser(length, beta) * self.up
+        # branches[p, i] = prototype[p + i * up]
+        self._branches = prototype.reshape(taps, self.up).T \
+            .astype(np.float32).copy()
+        self._history = np.zeros(taps - 1, dtype=np.float32)
+        self._history_start = -(taps - 1)
+        self._next_time = 0
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Resample the next block of a signal.
+        :param samples: 1D float32 input samples
+        :return: 1D float32 output samples
+        """
+        if self.up == self.down == 1:
+            return samples
+        buffer = np.concatenate([self._history, samples])
+        last = self._history_start + len(buffer) - 1
+        count = ((last + 1) * self.up - 1 - self._next_time) // self.down + 1
+        output = np.zeros(0, dtype=np.float32)
+        if count > 0:
+            times = self._next_time + self.down * np.arange(count)
+            newest = times // self.up - self._history_start
+            window = newest[:, None] - np.arange(self.taps)[None, :]
+            output = np.einsum("ij,ij->i", buffer[window],
+                               self._branches[times % self.up])
+            self._next_time += count * self.down
+        self._history = buffer[len(buffer) - (self.taps - 1):]
+        self._history_start = last - (self.taps - 2)
+        return output
+
+
+class FormatAdapter:
+    """
+    Converts audio in an arbitrary PCM format to the 16kHz mono LINEAR16
+    format sent to Google, chunk by chunk.
+    """
+    SAMPLE_FORMATS = {"int16": ("<i2", 2 ** 15),
+                      "int32": ("<i4", 2 ** 31),
+                      "float32": ("<f4", 1.0)}
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, channels: int = 1,
+                 sample_format: str = "int16"):
+        """
+        :param sample_rate: sample rate of input audio
+        :param channels: number of interleaved input channels
+        :param sample_format: one of `int16`, `int32` or `float32`
+        """
+        if sample_format not in self.SAMPLE_FORMATS:
+            raise ValueError(f"Unsupported sample_format: {sample_format}")
+        self.channels = channels
+        self._dtype, self._scale = self.SAMPLE_FORMATS[sample_format]
+        self._frame_bytes = np.dtype(self._dtype).itemsize * channels
+        self._resampler = PolyphaseResampler(sample_rate)
+        self._carry = b""
+
+    @classmethod
+    def bytes_per_second(cls, sample_rate: int = SAMPLE_RATE,
+                         channels: int = 1,
+                         sample_format: str = "int16") -> int:
+        """
+        Get the byte rate of audio in the specified format.
+        """
+        dtype = cls.SAMPLE_FORMATS[sample_format][0]
+        return sample_rate * channels * np.dtype(dtype).itemsize
+
+    def convert(self, chunk: bytes) -> bytes:
+        """
+        Convert the next chunk of input audio.
+        """
+        if self._carry:
+            chunk = self._carry + chunk
+        usable = len(chunk) - len(chunk) % self._frame_bytes
+        self._carry = chunk[usable:]
+        samples = np.frombuffer(chunk, dtype=self._dtype,
+                                count=usable // np.dtype(self._dtype).itemsize)
+        samples = samples.astype(np.float32)
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels).mean(axis=1)
+        samples = self._resampler.process(samples) * \
+            (2 ** 15 / self._scale)
+        return np.clip(np.rint(samples), -32768, 32767).astype("<i2") \
+            .tobytes()
+
+    def process(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Convert a stream of audio chunks.
+        :param chunks: input audio chunks; empty chunks are passed through
+        :return: generator of 16kHz mono LINEAR16 chunks
+        """
+        for chunk in chunks:
+            yield self.convert(chunk) if chunk else chunk
+
+
+class ReplayBuffer:
+    """
+    Holds audio that has been sent but not yet covered by a final result so
+    it can be re-sent on a new stream. Offsets are absolute byte positions
+    in the session audio; the buffer is capped at `max_seconds` of audio.
+    Audio may be appended by one thread and read by offset from others, so
+    each stream reads independently of any stream it replaces.
+    """
+
+    def __init__(self, max_seconds: float = 30,
+                 bytes_per_second: int = BYTES_PER_SECOND):
+        """
+        :param max_seconds: max seconds of unacknowledged audio to retain
+        :param bytes_per_second: byte rate of buffered audio
+        """
+        self.bytes_per_second = bytes_per_second
+        self.max_bytes = int(max_seconds * bytes_per_second)
+        self.start = 0
+        self.end = 0
+        self.sent = 0
+        self.closed = False
+        self._chunks = deque()
+        self._condition = Condition()
+
+    def __len__(self):
+        return self.end - self.start
+
+    def append(self, chunk: bytes, block: bool = False):
+        """
+        Add audio to the buffer, dropping the oldest audio if the buffer is
+        full.
+        :param chunk: audio to add
+        :param block: if True, wait while `max_seconds` of audio has not
+            been read yet, and only drop audio which has been read
+        """
+        with self._condition:
+            if block:
+                while self.end - self.sent >= self.max_bytes and \
+                        not self.closed:
+                    self._condition.wait()
+                if self.closed:
+                    return
+            self._chunks.append(chunk)
+            self.end += len(chunk)
+            if len(self) > self.max_bytes:
+                offset = self.end - self.max_bytes
+                if block:
+                    offset = min(offset, self.sent)
+                if offset > self.start:
+                    LOG.warning(f"Replay buffer full; dropping "
+                                f"{(offset - self.start) / self.bytes_per_second}s")
+                    self.acknowledge(offset)
+            self._condition.notify_all()
+
+    def read(self, offset: int,
+             timeout: Optional[float] = None) -> Optional[tuple]:
+        """
+        Read buffered audio from `offset`, waiting up to `timeout` seconds
+        for audio to be appended.
+        :param offset: absolute offset to read from; audio released before
+            it is read is skipped
+        :return: (offset, audio), where audio is empty if none arrived in
+            time, or None once the buffer is closed and has been read
+        """
+        with self._condition:
+            if offset >= self.end and not self.closed:
+                self._condition.wait(timeout)
+            offset = max(offset, self.start)
+            if offset >= self.end:
+                return None if self.closed else (offset, b"")
+            # Reads are usually at or near the end of the buffer
+            position = self.end
+            for chunk in reversed(self._chunks):
+                position -= len(chunk)
+                if position <= offset:
+                    chunk = chunk[offset - position:]
+                    break
+            if offset + len(chunk) > self.sent:
+                self.sent = offset + len(chunk)
+                self._condition.notify_all()
+            return offset, chunk
+
+    def wait(self, offset: int, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for audio to be appended beyond `offset`.
+        :param offset: absolute offset already read
+        :param timeout: max seconds to wait (None to wait until closed)
+        :return: True if audio is available beyond `offset`
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self.end > offset or self.closed, timeout)
+            return self.end > offset
+
+    def close(self):
+        """
+        Mark the end of the audio; readers return None once it is read and
+        blocked writers return without adding audio.
+        """
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+    def acknowledge(self, offset: int):
+        """
+        Release audio before `offset`.
+        :param offset: absolute byte offset acknowledged by the server
+        """
+        offset -= offset % SAMPLE_WIDTH
+        with self._condition:
+            self._release(offset)
+
+    def _release(self, offset: int):
+        while self._chunks and self.start < offset:
+            chunk = self._chunks[0]
+            if self.start + len(chunk) <= offset:
+                self._chunks.popleft()
+                self.start += len(chunk)
+            else:
+                self._chunks[0] = chunk[offset - self.start:]
+                self.start = offset
+
+    def offset_at(self, seconds: float, stream_offset: int) -> int:
+        """
+        Convert a result time relative to a stream into an absolute offset.
+        :param seconds: result time relative to the stream start
+        :param stream_offset: absolute offset of the first audio in the stream
+        """
+        return stream_offset + int(seconds * self.bytes_per_second)
+
+    def pending(self) -> list:
+        """
+        Get a copy of the unacknowledged audio chunks.
+        """
+        with self._condition:
+            return list(self._chunks)
@@ -0,0 +1,276 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from collections import deque
+from queue import Full, Queue
+from time import monotonic
+from typing import Optional
+
+from ovos_utils.log import LOG
+
+from neon_stt_plugin_google_cloud_streaming.audio import BYTES_PER_SECOND, \
+    SAMPLE_WIDTH
+
+
+class AudioQueue(Queue):
+    """
+    Audio chunk queue bounded by duration rather than item count. When the
+    consumer falls behind, `put` either blocks, drops the oldest queued
+    audio or aborts the stream depending on `policy`. A `None` sentinel is
+    always accepted so the consumer can be stopped.
+    """
+    POLICIES = ("block", "drop_oldest", "abort")
+
+    def __init__(self, max_seconds: float = 60, policy: str = "block",
+                 bytes_per_second: int = BYTES_PER_SECOND):
+        """
+        :param max_seconds: max seconds of audio to hold
+        :param policy: one of `block`, `drop_oldest` or `abort`
+        :param bytes_per_second: byte rate of queued audio
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Invalid policy: {policy}")
+        super().__init__()
+        self.bytes_per_second = bytes_per_second
+        self.max_bytes = int(max_seconds * bytes_per_second)
+        self.policy = policy
+        self.bytes_queued = 0
+        self.high_water_bytes = 0
+        self.dropped_chunks = 0
+        self.dropped_bytes = 0
+        self.aborted = False
+        self.closed = False
+
+    def _put(self, item):
+        self.queue.append(item)
+        if item:
+            self.bytes_queued += len(item)
+            self.high_water_bytes = max(self.high_water_bytes,
+                                        self.bytes_queued)
+
+    def _get(self):
+        item = self.queue.popleft()
+        if item:
+            self.bytes_queued -= len(item)
+        return item
+
+    def _drop(self, item):
+        self.dropped_chunks += 1
+        self.dropped_bytes += len(item)
+
+    def put(self, item: Optional[bytes], block: bool = True,
+            timeout: Optional[float] = None):
+        with self.not_full:
+            if item is not None:
+                if self.aborted or self.closed:
+                    self._drop(item)
+                    return
+                if self.bytes_queued + len(item) > self.max_bytes:
+                    if not self._make_room(item, block, timeout):
+                        return
+            self._put(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+    def _make_room(self, item: bytes, block: bool,
+                   timeout: Optional[float]) -> bool:
+        """
+        Apply the overflow policy. Must be called with `not_full` held.
+        :return: True if `item` should be queued
+        """
+        if self.policy == "block":
+            if not block:
+                raise Full
+            end = None if timeout is None else monotonic() + timeout
+            while self.bytes_queued + len(item) > self.max_bytes and \
+                    self.bytes_queued and not self.closed:
+                remaining = None if end is None else end - monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise Full
+                self.not_full.wait(remaining)
+            if self.closed:
+                self._drop(item)
+                return False
+        elif self.policy == "drop_oldest":
+            while self.bytes_queued + len(item) > self.max_bytes and \
+                    self.bytes_queued:
+                self._drop_oldest(self.bytes_queued + len(item) -
+                                  self.max_bytes)
+        else:
+            LOG.warning(f"Audio queue exceeded {self.max_seconds}s; "
+                        f"aborting stream")
+            self.aborted = True
+            self._drop_all()
+            self._drop(item)
+            self._put(None)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+            return False
+        return True
+
+    def _drop_oldest(self, size: int):
+        """
+        Discard at least `size` bytes of the oldest queued audio.
+        """
+        while size > 0 and self.bytes_queued:
+            for idx, queued in enumerate(self.queue):
+                if queued:
+                    del self.queue[idx]
+                    self.bytes_queued -= len(queued)
+                    self.unfinished_tasks -= 1
+                    self._drop(queued)
+                    size -= len(queued)
+                    break
+
+    def _drop_all(self):
+        """
+        Discard all queued audio and sentinels.
+        """
+        for queued in self.queue:
+            if queued:
+                self._drop(queued)
+        self.unfinished_tasks -= len(self.queue)
+        self.queue.clear()
+        self.bytes_queued = 0
+
+    def close(self):
+        """
+        Stop accepting audio and release any blocked producers.
+        """
+        with self.not_full:
+            self.closed = True
+            self.not_full.notify_all()
+
+    @property
+    def max_seconds(self) -> float:
+        return self.max_bytes / self.bytes_per_second
+
+    @property
+    def depth_seconds(self) -> float:
+        return self.bytes_queued / self.bytes_per_second
+
+    def stats(self) -> dict:
+        """
+        Get queue depth, high-water mark and drop counters.
+        """
+        return {"depth_seconds": self.depth_seconds,
+                "high_water_seconds":
+                    self.high_water_bytes / self.bytes_per_second,
+                "dropped_chunks": self.dropped_chunks,
+                "dropped_seconds": self.dropped_bytes / self.bytes_per_second,
+                "aborted": self.aborted}
+
+
+class AudioRingBuffer(AudioQueue):
+    """
+    `AudioQueue` backed by a preallocated ring buffer. `put` copies audio
+    into the buffer through a memoryview instead of holding a reference to
+    each chunk, and `get` returns up to `frame_bytes` of contiguous audio,
+    so consumers read fewer, larger chunks and no per-chunk objects are
+    retained while audio is queued.
+    """
+
+    def __init__(self, max_seconds: float = 60, policy: str = "block",
+                 bytes_per_second: int = BYTES_PER_SECOND,
+                 frame_bytes: int = 3200, align: int = SAMPLE_WIDTH):
+        """
+        :param max_seconds: buffer capacity in seconds of audio
+        :param policy: one of `block`, `drop_oldest` or `abort`
+        :param bytes_per_second: byte rate of queued audio
+        :param frame_bytes: max bytes returned by each `get`
+        :param align: bytes per sample frame; reads and drops are aligned
+        """
+        super().__init__(max_seconds, policy, bytes_per_second)
+        self.align = align
+        self.max_bytes -= self.max_bytes % align
+        self.frame_bytes = max(frame_bytes - frame_bytes % align, align)
+        self._buffer = bytearray(self.max_bytes)
+        self._view = memoryview(self._buffer)
+        self._read = 0
+        # Total bytes written, and the value of it when each sentinel was
+        # put, so sentinels are returned in order with the audio
+        self._written = 0
+        self._sentinels = deque()
+
+    def _qsize(self):
+        return -(-self.bytes_queued // self.frame_bytes) + \
+            len(self._sentinels)
+
+    def _put(self, item):
+        if item is None:
+            self._sentinels.append(self._written)
+            return
+        if len(item) > self.max_bytes:
+            self._drop(item[:len(item) - self.max_bytes])
+            item = item[len(item) - self.max_bytes:]
+        capacity = self.max_bytes
+        write = (self._read + self.bytes_queued) % capacity
+        first = min(len(item), capacity - write)
+        self._view[write:write + first] = item[:first]
+        if first < len(item):
+            self._view[:len(item) - first] = item[first:]
+        self.bytes_queued += len(item)
+        self._written += len(item)
+        self.high_water_bytes = max(self.high_water_bytes, self.bytes_queued)
+
+    def _get(self):
+        consumed = self._written - self.bytes_queued
+        if self._sentinels and self._sentinels[0] <= consumed:
+            self._sentinels.popleft()
+            return None
+        size = min(self.bytes_queued, self.frame_bytes,
+                   self.max_bytes - self._read)
+        if self._sentinels:
+            size = min(size, self._sentinels[0] - consumed)
+        frame = bytes(self._view[self._read:self._read + size])
+        self._read = (self._read + size) % self.max_bytes
+        self.bytes_queued -= size
+        return frame
+
+    def _drop_oldest(self, size: int):
+        size = min(-(-size // self.align) * self.align, self.bytes_queued)
+        self.dropped_chunks += 1
+        self.dropped_bytes += size
+        self._read = (self._read + size) % self.max_bytes
+        self.bytes_queued -= size
+
+    def _drop_all(self):
+        if self.bytes_queued:
+            self.dropped_chunks += 1
+            self.dropped_bytes += self.bytes_queued
+        self._read = 0
+        self.bytes_queued = 0
+        self._sentinels.clear()
+
+    def task_done(self):
+        # Reads don't map one-to-one to writes, so only track completion
+        with self.all_tasks_done:
+            self.unfinished_tasks = max(self.unfinished_tasks - 1, 0)
+            if not self._qsize():
+                self.unfinished_tasks = 0
+                self.all_tasks_done.notify_all()
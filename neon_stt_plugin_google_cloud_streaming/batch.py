@@ -0,0 +1,291 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import mmap
+import struct
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from threading import Lock
+from time import monotonic, sleep
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+
+from ovos_utils.log import LOG
+
+# (format tag, bits per sample) to sample format; tags are WAVE_FORMAT_PCM
+# and WAVE_FORMAT_IEEE_FLOAT
+_WAV_SAMPLE_FORMATS = {(1, 16): "int16",
+                       (1, 32): "int32",
+                       (3, 32): "float32"}
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def parse_wav(data) -> tuple:
+    """
+    Locate the samples in a RIFF/WAVE file without copying them.
+    :param data: buffer (i.e. `bytes` or `mmap`) containing a WAV file
+    :return: (data offset, data size, (sample_rate, channels, sample_format))
+    """
+    if len(data) < 12 or data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise ValueError("Not a WAV file")
+    position = 12
+    input_format = None
+    while position + 8 <= len(data):
+        chunk_id = bytes(data[position:position + 4])
+        size, = struct.unpack_from("<I", data, position + 4)
+        body = position + 8
+        if chunk_id == b"fmt ":
+            tag, channels, sample_rate = struct.unpack_from("<HHI", data,
+                                                            body)
+            bits, = struct.unpack_from("<H", data, body + 14)
+            if tag == _WAVE_FORMAT_EXTENSIBLE:
+                # The subformat GUID starts with the format tag
+                tag, = struct.unpack_from("<H", data, body + 24)
+            sample_format = _WAV_SAMPLE_FORMATS.get((tag, bits))
+            if sample_format is None:
+                raise ValueError(f"Unsupported WAV encoding: format {tag}, "
+                                 f"{bits} bits per sample")
+            input_format = (sample_rate, channels, sample_format)
+        elif chunk_id == b"data":
+            if input_format is None:
+                raise ValueError("WAV data precedes format chunk")
+            # Files still being written may report a placeholder size
+            return body, min(size, len(data) - body), input_format
+        position = body + size + (size & 1)
+    raise ValueError("No data in WAV file")
+
+
+@contextmanager
+def open_audio(item, input_format: tuple):
+    """
+    Open an item to be transcribed. Files are memory-mapped so audio is read
+    from the page cache as it is sent rather than loaded up front.
+    :param item: path to a WAV or raw audio file, or a buffer of either
+    :param input_format: (sample_rate, channels, sample_format) of raw audio
+    :return: context manager yielding (buffer, start, end, input_format)
+    """
+    if isinstance(item, (bytes, bytearray, memoryview)):
+        buffer = bytes(item) if isinstance(item, memoryview) else item
+        if buffer[:4] == b"RIFF":
+            offset, size, input_format = parse_wav(buffer)
+            yield buffer, offset, offset + size, input_format
+        else:
+            yield buffer, 0, len(buffer), input_format
+        return
+    with open(item, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            if buffer[:4] == b"RIFF":
+                offset, size, input_format = parse_wav(buffer)
+                yield buffer, offset, offset + size, input_format
+            else:
+                yield buffer, 0, len(buffer), input_format
+
+
+class RateLimiter:
+    """
+    Token bucket limiting how often streams are opened.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        :param rate: max average operations per second
+        :param burst: operations allowed at once after an idle period
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = monotonic()
+        self._lock = Lock()
+
+    def acquire(self) -> float:
+        """
+        Wait for a token.
+        :return: seconds spent waiting
+        """
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(self.burst, self._tokens +
+                               (now - self._updated) * self.rate)
+            self._updated = now
+            # Tokens may go negative; later callers queue behind this one
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            sleep(wait)
+        return wait
+
+
+class BatchResult(NamedTuple):
+    """
+    Result of transcribing one batch item.
+    """
+    index: int
+    transcriptions: list
+    error: Optional[Exception]
+    audio_seconds: float
+    elapsed: float
+    word_timings: Optional[object] = None
+
+
+class BatchStats:
+    """
+    Aggregate throughput of a batch.
+    """
+
+    def __init__(self):
+        self.items = 0
+        self.failed = 0
+        self.audio_seconds = 0.0
+        self.bytes_sent = 0
+        self.rate_limited_seconds = 0.0
+        self.started = None
+        self.finished = None
+        self._lock = Lock()
+
+    def record(self, result: BatchResult, bytes_sent: int,
+               rate_limited: float):
+        with self._lock:
+            self.items += 1
+            self.failed += int(result.error is not None)
+            self.audio_seconds += result.audio_seconds
+            self.bytes_sent += bytes_sent
+            self.rate_limited_seconds += rate_limited
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or monotonic()) - self.started
+
+    def as_dict(self) -> dict:
+        elapsed = self.elapsed
+        return {"items": self.items,
+                "failed": self.failed,
+                "audio_seconds": self.audio_seconds,
+                "bytes_sent": self.bytes_sent,
+                "rate_limited_seconds": self.rate_limited_seconds,
+                "elapsed_seconds": elapsed,
+                "items_per_second": self.items / elapsed if elapsed else 0.0,
+                "realtime_factor": self.audio_seconds / elapsed
+                if elapsed else 0.0}
+
+
+class BatchTranscriber:
+    """
+    Transcribes recorded audio over concurrent streams. Audio is sent as fast
+    as the connection allows rather than at real-time pace.
+    """
+
+    def __init__(self, stream_factory: Callable, input_format: tuple =
+                 (16000, 1, "int16"), max_workers: int = 4,
+                 streams_per_second: float = 0, chunk_ms: int = 500):
+        """
+        :param stream_factory: method accepting the (sample_rate, channels,
+            sample_format) of an item and returning a `GoogleStreamThread`
+        :param input_format: format of items which are not WAV files
+        :param max_workers: max concurrent streams
+        :param streams_per_second: max rate streams are opened (0 for no limit)
+        :param chunk_ms: duration of audio sent per request
+        """
+        self._stream_factory = stream_factory
+        self.input_format = input_format
+        self.max_workers = max_workers
+        self.chunk_ms = chunk_ms
+        self._limiter = RateLimiter(streams_per_second) \
+            if streams_per_second else None
+        self.stats = BatchStats()
+
+    def transcribe(self, items: Iterable) -> Iterator[BatchResult]:
+        """
+        Transcribe items concurrently. Items are read as results are consumed,
+        so at most a few items per worker are in progress at once.
+        :param items: paths to WAV or raw audio files, or buffers of either
+        :return: iterator of `BatchResult` in the same order as `items`
+        """
+        self.stats = BatchStats()
+        return self._transcribe(iter(items), self.stats)
+
+    def _transcribe(self, items: Iterator,
+                    stats: BatchStats) -> Iterator[BatchResult]:
+        stats.started = monotonic()
+        pending = deque()
+        executor = ThreadPoolExecutor(self.max_workers,
+                                      thread_name_prefix="BatchTranscriber")
+        try:
+            index = 0
+            for item in items:
+                pending.append(executor.submit(self._run, index, item, stats))
+                index += 1
+                if len(pending) >= 2 * self.max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # Stop work queued for results that will not be consumed
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+            stats.finished = monotonic()
+
+    def _run(self, index: int, item, stats: BatchStats) -> BatchResult:
+        from neon_stt_plugin_google_cloud_streaming.audio import FormatAdapter
+        started = monotonic()
+        rate_limited = self._limiter.acquire() if self._limiter else 0.0
+        transcriptions, error, audio_seconds, bytes_sent = [], None, 0.0, 0
+        word_timings = None
+        try:
+            with open_audio(item, self.input_format) as \
+                    (buffer, start, end, input_format):
+                bytes_per_second = FormatAdapter.bytes_per_second(
+                    *input_format)
+                audio_seconds = (end - start) / bytes_per_second
+                stream = self._stream_factory(input_format)
+                stream.metrics.mark("opened")
+                stream.handle_audio_stream(
+                    self._chunks(buffer, start, end, bytes_per_second,
+                                 input_format[0]), stream.language)
+            transcriptions = stream.transcriptions
+            word_timings = stream.get_word_timings()
+            error = stream.error
+            bytes_sent = stream.metrics.bytes_sent
+        except Exception as e:
+            LOG.error(f"Failed to transcribe batch item {index}: {e}")
+            error = e
+        result = BatchResult(index, transcriptions, error, audio_seconds,
+                             monotonic() - started - rate_limited,
+                             word_timings)
+        stats.record(result, bytes_sent, rate_limited)
+        return result
+
+    def _chunks(self, buffer, start: int, end: int, bytes_per_second: int,
+                sample_rate: int) -> Iterator[bytes]:
+        frame = bytes_per_second // sample_rate
+        size = max(frame, bytes_per_second * self.chunk_ms // 1000 //
+                   frame * frame)
+        for position in range(start, end, size):
+            yield buffer[position:min(position + size, end)]
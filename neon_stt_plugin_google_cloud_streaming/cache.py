@@ -0,0 +1,161 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import os
+
+from collections import OrderedDict
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from time import time
+from typing import Optional
+
+from ovos_utils.log import LOG
+
+
+class TranscriptionCache:
+    """
+    Cache of transcription results keyed by a digest of the audio and the
+    recognition settings. Entries are held in an in-memory LRU and, if a
+    `directory` is configured, persisted as JSON files so they are shared
+    between processes and survive restarts.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = 3600,
+                 directory: Optional[str] = None):
+        """
+        :param max_entries: max entries held in memory
+        :param ttl: seconds an entry remains valid; None or 0 to never expire
+        :param directory: optional directory for the on-disk tier
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.directory = os.path.expanduser(directory) if directory else None
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def _expired(self, created: float) -> bool:
+        return bool(self.ttl) and time() - created > self.ttl
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[list]:
+        """
+        Get cached alternatives for `key`.
+        :param key: hex digest identifying the audio and config
+        :return: list of (transcript, confidence) or None if not cached
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and self._expired(entry[0]):
+                del self._entries[key]
+                entry = None
+            if entry is None and self.directory:
+                entry = self._read(key)
+                if entry:
+                    self._store(key, entry)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[1])
+
+    def put(self, key: str, alternatives: list):
+        """
+        Cache alternatives for `key`.
+        :param key: hex digest identifying the audio and config
+        :param alternatives: list of (transcript, confidence)
+        """
+        entry = (time(), [tuple(a) for a in alternatives])
+        with self._lock:
+            self._store(key, entry)
+            if self.directory:
+                self._write(key, entry)
+
+    def _store(self, key: str, entry: tuple):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read(self, key: str) -> Optional[tuple]:
+        try:
+            with open(self._path(key)) as f:
+                data = json.load(f)
+            entry = (data["created"],
+                     [tuple(a) for a in data["alternatives"]])
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            LOG.warning(f"Ignoring invalid cache entry {key}: {e}")
+            return None
+        if self._expired(entry[0]):
+            self._remove(key)
+            return None
+        return entry
+
+    def _write(self, key: str, entry: tuple):
+        try:
+            # Write and rename so concurrent readers never see partial files
+            with NamedTemporaryFile("w", dir=self.directory, suffix=".tmp",
+                                    delete=False) as f:
+                json.dump({"created": entry[0],
+                           "alternatives": entry[1]}, f)
+            os.replace(f.name, self._path(key))
+        except OSError as e:
+            LOG.warning(f"Failed to write cache entry {key}: {e}")
+
+    def _remove(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        """
+        Remove all entries from memory and disk.
+        """
+        with self._lock:
+            self._entries.clear()
+            if self.directory:
+                for name in os.listdir(self.directory):
+                    if name.endswith(".json"):
+                        self._remove(name[:-5])
+
+    def stats(self) -> dict:
+        """
+        Get hit and miss counts and the number of entries in memory.
+        """
+        return {"hits": self.hits, "misses": self.misses,
+                "entries": len(self._entries)}
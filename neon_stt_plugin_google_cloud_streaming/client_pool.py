@@ -0,0 +1,250 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+
+from itertools import cycle
+from threading import Lock, Thread
+from typing import Optional
+from weakref import WeakKeyDictionary
+
+import grpc
+from google.api_core.exceptions import GoogleAPICallError
+from google.cloud import speech
+from google.cloud.speech_v1.services.speech.transports import \
+    SpeechGrpcAsyncIOTransport, SpeechGrpcTransport
+from ovos_utils.log import LOG
+
+DEFAULT_ENDPOINT = SpeechGrpcTransport.DEFAULT_HOST
+
+
+def _credential_key(credentials) -> str:
+    """
+    Build a stable key for a set of credentials so that separately parsed
+    copies of the same service account resolve to the same pool entry.
+    :param credentials: google.auth Credentials object (or None for ADC)
+    :return: string identifying the credentials
+    """
+    if credentials is None:
+        return "default"
+    email = getattr(credentials, "service_account_email", None)
+    if email:
+        return f"{email}/{getattr(credentials, 'project_id', None)}"
+    return f"{type(credentials).__name__}@{id(credentials)}"
+
+
+def _normalize_endpoint(api_endpoint: Optional[str]) -> str:
+    api_endpoint = api_endpoint or DEFAULT_ENDPOINT
+    if ":" not in api_endpoint:
+        api_endpoint = f"{api_endpoint}:443"
+    return api_endpoint
+
+
+def probe_client(client: speech.SpeechClient, timeout: float = 5.0) -> bool:
+    """
+    Issue a lightweight, unbilled RPC against the client's channel. This
+    establishes the connection, fetches an access token and completes a
+    round-trip; an error status from the server still counts as a success.
+    :param client: SpeechClient to probe
+    :param timeout: seconds to wait for the RPC
+    :return: True if the endpoint responded
+    """
+    try:
+        client.transport.operations_client.get_operation(
+            "neon-warmup", timeout=timeout)
+    except GoogleAPICallError as e:
+        if e.grpc_status_code in (grpc.StatusCode.UNAVAILABLE,
+                                  grpc.StatusCode.DEADLINE_EXCEEDED):
+            LOG.warning(f"Probe failed: {e}")
+            return False
+    except Exception as e:
+        LOG.warning(f"Probe failed: {e}")
+        return False
+    return True
+
+
+class SpeechClientPool:
+    """
+    Process-wide cache of `SpeechClient` objects keyed by credentials and
+    endpoint so that plugin instances share connections instead of each
+    negotiating and holding its own channel.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._clients = dict()
+        self._iterators = dict()
+        self._options = dict()
+        self._async_clients = WeakKeyDictionary()
+
+    @staticmethod
+    def _channel_options(keepalive_time_ms: int,
+                         keepalive_timeout_ms: int) -> list:
+        return [
+            ("grpc.max_send_message_length", -1),
+            ("grpc.max_receive_message_length", -1),
+            ("grpc.keepalive_time_ms", keepalive_time_ms),
+            ("grpc.keepalive_timeout_ms", keepalive_timeout_ms),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.max_pings_without_data", 0),
+        ]
+
+    def get_client(self, credentials=None,
+                   api_endpoint: Optional[str] = None,
+                   pool_size: int = 1, keepalive_time_ms: int = 30000,
+                   keepalive_timeout_ms: int = 10000,
+                   warmup: bool = True) -> speech.SpeechClient:
+        """
+        Get a shared client for the requested credentials and endpoint,
+        creating `pool_size` channels on first request. Clients are handed
+        out round-robin; channel options from later requests for the same
+        credentials and endpoint are ignored with a warning.
+        :param credentials: google.auth Credentials (None to use ADC)
+        :param api_endpoint: Speech API host (default speech.googleapis.com)
+        :param pool_size: number of channels to spread streams across
+        :param keepalive_time_ms: interval between HTTP/2 keepalive pings
+        :param keepalive_timeout_ms: time to wait for a ping acknowledgement
+        :param warmup: if True, connect new channels in the background
+        :return: SpeechClient backed by a pooled channel
+        """
+        key = (_credential_key(credentials), _normalize_endpoint(api_endpoint))
+        settings = (max(pool_size, 1), keepalive_time_ms,
+                    keepalive_timeout_ms)
+        with self._lock:
+            self._check_settings(key, settings)
+            if key not in self._clients:
+                options = self._channel_options(keepalive_time_ms,
+                                                keepalive_timeout_ms)
+                clients = [self._create_client(credentials, key[1], options)
+                           for _ in range(max(pool_size, 1))]
+                self._clients[key] = clients
+                self._iterators[key] = cycle(clients)
+                LOG.debug(f"Created {len(clients)} client(s) for {key}")
+                if warmup:
+                    for client in clients:
+                        Thread(target=probe_client, args=(client,),
+                               daemon=True).start()
+            return next(self._iterators[key])
+
+    def _check_settings(self, key: tuple, settings: tuple):
+        """
+        Record the pool size and keepalive settings of the channels for
+        `key`, warning if a later request asks for different ones.
+        Must be called with `_lock` held.
+        """
+        current = self._options.setdefault(key, settings)
+        if current != settings:
+            LOG.warning(f"Channels for {key} already exist with (pool_size, "
+                        f"keepalive_time_ms, keepalive_timeout_ms)={current}; "
+                        f"ignoring {settings}")
+
+    @staticmethod
+    def _create_client(credentials, host: str,
+                       options: list) -> speech.SpeechClient:
+        channel = SpeechGrpcTransport.create_channel(host,
+                                                     credentials=credentials,
+                                                     options=options)
+        transport = SpeechGrpcTransport(host=host, channel=channel)
+        return speech.SpeechClient(transport=transport)
+
+    def get_async_client(self, credentials=None,
+                         api_endpoint: Optional[str] = None,
+                         keepalive_time_ms: int = 30000,
+                         keepalive_timeout_ms: int = 10000) -> \
+            speech.SpeechAsyncClient:
+        """
+        Get a shared asyncio client for the running event loop. Async
+        channels are bound to a loop, so one is kept per loop and released
+        with it.
+        :param credentials: google.auth Credentials (None to use ADC)
+        :param api_endpoint: Speech API host (default speech.googleapis.com)
+        :param keepalive_time_ms: interval between HTTP/2 keepalive pings
+        :param keepalive_timeout_ms: time to wait for a ping acknowledgement
+        :return: SpeechAsyncClient for the running loop
+        """
+        loop = asyncio.get_running_loop()
+        key = (_credential_key(credentials), _normalize_endpoint(api_endpoint))
+        with self._lock:
+            clients = self._async_clients.setdefault(loop, dict())
+            if key not in clients:
+                channel = SpeechGrpcAsyncIOTransport.create_channel(
+                    key[1], credentials=credentials,
+                    options=self._channel_options(keepalive_time_ms,
+                                                  keepalive_timeout_ms))
+                transport = SpeechGrpcAsyncIOTransport(host=key[1],
+                                                       channel=channel)
+                clients[key] = speech.SpeechAsyncClient(transport=transport)
+            return clients[key]
+
+    def clear(self):
+        """
+        Close and forget all pooled channels.
+        """
+        with self._lock:
+            for clients in self._clients.values():
+                for client in clients:
+                    client.transport.close()
+            for loop, clients in list(self._async_clients.items()):
+                for client in clients.values():
+                    self._close_async(loop, client.transport.close())
+            self._clients = dict()
+            self._iterators = dict()
+            self._options = dict()
+            self._async_clients = WeakKeyDictionary()
+
+    @staticmethod
+    def _close_async(loop: asyncio.AbstractEventLoop, close):
+        """
+        Run an async channel's `close` coroutine on the loop it is bound to.
+        """
+        if loop.is_closed():
+            # The channel can't be used once its loop is closed
+            close.close()
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(close, loop)
+        else:
+            loop.run_until_complete(close)
+
+
+_POOL = SpeechClientPool()
+
+
+def get_shared_client(*args, **kwargs) -> speech.SpeechClient:
+    """
+    Get a client from the process-wide pool.
+    See `SpeechClientPool.get_client` for arguments.
+    """
+    return _POOL.get_client(*args, **kwargs)
+
+
+def get_shared_async_client(*args, **kwargs) -> speech.SpeechAsyncClient:
+    """
+    Get an asyncio client from the process-wide pool for the running loop.
+    See `SpeechClientPool.get_async_client` for arguments.
+    """
+    return _POOL.get_async_client(*args, **kwargs)
@@ -0,0 +1,226 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import hashlib
+import json
+
+from datetime import datetime, timezone
+from threading import Event, Lock, Thread, local
+from time import monotonic
+
+from google.auth.transport.requests import Request
+from google.oauth2 import service_account
+from ovos_utils.log import LOG
+
+CLOUD_PLATFORM_SCOPE = "https://www.googleapis.com/auth/cloud-platform"
+# google-auth refreshes inline once a token is within 3m45s of expiry, so
+# background refreshes must happen earlier than that
+MIN_REFRESH_MARGIN = 240
+
+_refresh_context = local()
+
+
+def _utcnow() -> datetime:
+    # google-auth expiry times are naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class AuthStats:
+    """
+    Counts of access token refreshes and time spent waiting on refreshes
+    made inline, i.e. by a request which had no valid token.
+    """
+
+    def __init__(self):
+        self.background_refreshes = 0
+        self.inline_refreshes = 0
+        self.failures = 0
+        self.inline_wait = 0.0
+        self.max_inline_wait = 0.0
+        self._lock = Lock()
+
+    def record(self, seconds: float, inline: bool, failed: bool):
+        with self._lock:
+            self.failures += int(failed)
+            if not inline:
+                self.background_refreshes += 1
+                return
+            self.inline_refreshes += 1
+            self.inline_wait += seconds
+            self.max_inline_wait = max(self.max_inline_wait, seconds)
+
+    def as_dict(self) -> dict:
+        return {"background_refreshes": self.background_refreshes,
+                "inline_refreshes": self.inline_refreshes,
+                "failures": self.failures,
+                "inline_wait_seconds": self.inline_wait,
+                "max_inline_wait_seconds": self.max_inline_wait}
+
+
+class ManagedCredentials(service_account.Credentials):
+    """
+    Service account credentials which record how long refreshes take and
+    whether they were made in the background or by a waiting request.
+    """
+    auth_stats = None
+
+    def refresh(self, request):
+        started = monotonic()
+        failed = True
+        try:
+            super().refresh(request)
+            failed = False
+        finally:
+            if self.auth_stats is not None:
+                self.auth_stats.record(
+                    monotonic() - started,
+                    not getattr(_refresh_context, "background", False),
+                    failed)
+
+
+class CredentialManager:
+    """
+    Process-wide cache of parsed service account credentials. Credentials
+    are shared by every plugin instance using the same key, and their access
+    tokens are refreshed on a background thread before they expire so that
+    streams don't wait on the token endpoint.
+    """
+
+    def __init__(self, refresh_margin: float = 300,
+                 retry_interval: float = 10):
+        """
+        :param refresh_margin: seconds before expiry to refresh a token
+        :param retry_interval: seconds to wait after a failed refresh
+        """
+        self.refresh_margin = max(refresh_margin, MIN_REFRESH_MARGIN)
+        self.retry_interval = retry_interval
+        self._lock = Lock()
+        self._credentials = dict()
+        self._refreshed = dict()
+        self._retry_at = dict()
+        self._wakeup = Event()
+        self._stopping = False
+        self._thread = None
+
+    def get_credentials(self, info: dict,
+                        refresh: bool = True) -> ManagedCredentials:
+        """
+        Get credentials for a service account key, parsing the key only once.
+        :param info: service account key info (parsed JSON key file)
+        :param refresh: if True, refresh the access token in the background
+        :return: credentials scoped for the Speech API
+        """
+        key = hashlib.sha256(json.dumps(info, sort_keys=True)
+                             .encode()).hexdigest()
+        with self._lock:
+            credentials = self._credentials.get(key)
+            if credentials is None:
+                # Scoping up front means transports use this object as-is
+                # rather than a copy with its own token
+                credentials = ManagedCredentials.from_service_account_info(
+                    info, scopes=[CLOUD_PLATFORM_SCOPE])
+                credentials.auth_stats = AuthStats()
+                self._credentials[key] = credentials
+            if refresh and key not in self._refreshed:
+                self._refreshed[key] = credentials
+                self._start()
+        return credentials
+
+    def _start(self):
+        self._stopping = False
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = Thread(target=self._run, daemon=True,
+                                  name="CredentialRefresh")
+            self._thread.start()
+        self._wakeup.set()
+
+    def stop(self):
+        """
+        Stop refreshing tokens.
+        """
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        _refresh_context.background = True
+        request = Request()
+        while not self._stopping:
+            self._wakeup.clear()
+            with self._lock:
+                credentials = list(self._refreshed.values())
+            waits = [self._refresh_if_due(c, request) for c in credentials]
+            self._wakeup.wait(min((w for w in waits if w is not None),
+                                  default=None))
+
+    def _refresh_if_due(self, credentials: ManagedCredentials,
+                        request: Request) -> float:
+        """
+        Refresh the token for `credentials` if it expires within
+        `refresh_margin`.
+        :return: seconds until the token is next due to be refreshed
+        """
+        retry_at = self._retry_at.get(id(credentials))
+        if retry_at and monotonic() < retry_at:
+            return retry_at - monotonic()
+        if credentials.token and credentials.expiry:
+            due = (credentials.expiry - _utcnow()).total_seconds() - \
+                self.refresh_margin
+            if due > 0:
+                return due
+        try:
+            credentials.refresh(request)
+            self._retry_at.pop(id(credentials), None)
+            LOG.debug(f"Refreshed token for "
+                      f"{credentials.service_account_email}")
+        except Exception as e:
+            LOG.warning(f"Token refresh failed: {e}")
+            self._retry_at[id(credentials)] = \
+                monotonic() + self.retry_interval
+            return self.retry_interval
+        if not credentials.expiry:
+            return None
+        return max((credentials.expiry - _utcnow()).total_seconds() -
+                   self.refresh_margin, self.retry_interval)
+
+
+_MANAGER = None
+_MANAGER_LOCK = Lock()
+
+
+def get_credential_manager(refresh_margin: float = 300) -> CredentialManager:
+    """
+    Get the process-wide credential manager.
+    :param refresh_margin: seconds before expiry to refresh tokens; only
+        used when the manager is first created
+    """
+    global _MANAGER
+    with _MANAGER_LOCK:
+        if _MANAGER is None:
+            _MANAGER = CredentialManager(refresh_margin)
+        return _MANAGER
@@ -0,0 +1,241 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from neon_stt_plugin_google_cloud_streaming.audio import SAMPLE_RATE, \
+    SAMPLE_WIDTH
+
+_SAMPLE_RATE_CODES = {88200: 0b0001, 176400: 0b0010, 192000: 0b0011,
+                      8000: 0b0100, 16000: 0b0101, 22050: 0b0110,
+                      24000: 0b0111, 32000: 0b1000, 44100: 0b1001,
+                      48000: 0b1010, 96000: 0b1011}
+_MAX_FIXED_ORDER = 4
+_MAX_RICE_PARAM = 14
+
+
+def _crc_table(poly: int, width: int) -> list:
+    top = 1 << (width - 1)
+    mask = (1 << width) - 1
+    table = []
+    for byte in range(256):
+        crc = byte << (width - 8)
+        for _ in range(8):
+            crc = ((crc << 1) ^ poly) if crc & top else crc << 1
+        table.append(crc & mask)
+    return table
+
+
+_CRC8_TABLE = _crc_table(0x07, 8)
+_CRC16_TABLE = _crc_table(0x8005, 16)
+
+
+def _crc8(data: bytes) -> int:
+    crc = 0
+    for byte in data:
+        crc = _CRC8_TABLE[crc ^ byte]
+    return crc
+
+
+def _crc16(data: bytes) -> int:
+    crc = 0
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ _CRC16_TABLE[(crc >> 8) ^ byte]
+    return crc
+
+
+def _bits(value: int, width: int) -> np.ndarray:
+    """
+    Get the `width` least significant bits of `value`, MSB first.
+    """
+    value &= (1 << width) - 1
+    return ((value >> np.arange(width - 1, -1, -1, dtype=np.int64)) & 1) \
+        .astype(np.uint8)
+
+
+def _sample_bits(samples: np.ndarray, width: int = 16) -> np.ndarray:
+    """
+    Get the bits of each of `samples` as `width`-bit signed integers.
+    """
+    shifts = np.arange(width - 1, -1, -1, dtype=np.int64)
+    masked = samples.astype(np.int64) & ((1 << width) - 1)
+    return ((masked[:, None] >> shifts) & 1).astype(np.uint8).ravel()
+
+
+def _rice_bits(residual: np.ndarray, param: int) -> np.ndarray:
+    """
+    Rice-code a residual signal as an array of bits.
+    """
+    unsigned = np.where(residual >= 0, residual << 1, (-residual << 1) - 1)
+    quotient = unsigned >> param
+    lengths = quotient + 1 + param
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    bits = np.zeros(int(ends[-1]), dtype=np.uint8)
+    stops = starts + quotient
+    bits[stops] = 1
+    for i in range(param):
+        bits[stops + 1 + i] = (unsigned >> (param - 1 - i)) & 1
+    return bits
+
+
+def _best_rice_param(residual: np.ndarray) -> (int, int):
+    """
+    Find the Rice parameter that codes `residual` in the fewest bits.
+    :return: (parameter, size in bits)
+    """
+    unsigned = np.where(residual >= 0, residual << 1, (-residual << 1) - 1)
+    mean = unsigned.mean() if len(unsigned) else 0
+    guess = min(int(np.log2(mean)) if mean >= 1 else 0, _MAX_RICE_PARAM)
+    best = None
+    for param in range(max(guess - 1, 0), min(guess + 1, _MAX_RICE_PARAM) + 1):
+        size = int((unsigned >> param).sum()) + len(unsigned) * (param + 1)
+        if best is None or size < best[1]:
+            best = (param, size)
+    return best
+
+
+class FlacEncoder:
+    """
+    Incremental, pure-Python (NumPy) FLAC encoder for 16-bit mono PCM.
+    Each block is coded with the best fixed linear predictor and a single
+    Rice partition, falling back to constant or verbatim subframes where
+    those are smaller.
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE,
+                 block_size: int = 1600):
+        """
+        :param sample_rate: sample rate of the input audio
+        :param block_size: samples per FLAC frame (16-65535)
+        """
+        if not 16 <= block_size <= 65535:
+            raise ValueError(f"Invalid block_size: {block_size}")
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._buffer = bytearray()
+        self._frame_number = 0
+
+    def stream_header(self) -> bytes:
+        """
+        Get the `fLaC` marker and STREAMINFO block that start the stream.
+        Frame sizes, total samples and MD5 are left unset (unknown).
+        """
+        bits = np.concatenate([
+            _bits(1, 1), _bits(0, 7), _bits(34, 24),  # last block, STREAMINFO
+            _bits(self.block_size, 16), _bits(self.block_size, 16),
+            _bits(0, 24), _bits(0, 24),
+            _bits(self.sample_rate, 20), _bits(0, 3), _bits(15, 5),
+            _bits(0, 36), np.zeros(128, dtype=np.uint8)])
+        return b"fLaC" + np.packbits(bits).tobytes()
+
+    def _frame_header(self, block_size: int) -> bytes:
+        number = self._frame_number
+        if number < 0x80:
+            coded = bytes([number])
+        else:
+            # UTF-8 style coding of the frame number
+            payload = []
+            while number >= (0x40 >> len(payload)):
+                payload.insert(0, 0x80 | (number & 0x3F))
+                number >>= 6
+            lead = (0xFF00 >> (len(payload) + 1)) & 0xFF
+            coded = bytes([lead | number] + payload)
+        size_code = 0b0110 if block_size <= 256 else 0b0111
+        size_width = 8 if size_code == 0b0110 else 16
+        rate_code = _SAMPLE_RATE_CODES.get(self.sample_rate, 0b0000)
+        header = np.packbits(np.concatenate([
+            _bits(0b11111111111110, 14), _bits(0, 1), _bits(0, 1),
+            _bits(size_code, 4), _bits(rate_code, 4),
+            _bits(0b0000, 4), _bits(0b100, 3), _bits(0, 1)])).tobytes()
+        header += coded + (block_size - 1).to_bytes(size_width // 8, "big")
+        return header + bytes([_crc8(header)])
+
+    @staticmethod
+    def _subframe(samples: np.ndarray) -> np.ndarray:
+        if np.all(samples == samples[0]):
+            return np.concatenate([_bits(0, 8), _bits(int(samples[0]), 16)])
+        best = None
+        for order in range(min(_MAX_FIXED_ORDER, len(samples) - 1) + 1):
+            residual = np.diff(samples, n=order)
+            param, size = _best_rice_param(residual)
+            size += order * 16
+            if best is None or size < best[2]:
+                best = (order, param, size, residual)
+        order, param, size, residual = best
+        if size >= len(samples) * 16:
+            return np.concatenate([_bits(0b00000010, 8),
+                                   _sample_bits(samples)])
+        return np.concatenate([_bits(0b00010000 | (order << 1), 8),
+                               _sample_bits(samples[:order]),
+                               _bits(0, 2), _bits(0, 4), _bits(param, 4),
+                               _rice_bits(residual, param)])
+
+    def encode_block(self, pcm: bytes) -> bytes:
+        """
+        Encode one block of 16-bit little-endian PCM as a FLAC frame.
+        """
+        samples = np.frombuffer(pcm, dtype="<i2").astype(np.int64)
+        header = self._frame_header(len(samples))
+        body = np.packbits(self._subframe(samples)).tobytes()
+        self._frame_number += 1
+        frame = header + body
+        return frame + _crc16(frame).to_bytes(2, "big")
+
+    def process(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Encode a stream of PCM chunks, yielding the stream header followed
+        by one FLAC frame per `block_size` samples.
+        :param chunks: 16-bit mono PCM chunks; empty chunks are passed through
+        :return: generator of encoded bytes
+        """
+        block_bytes = self.block_size * SAMPLE_WIDTH
+        for chunk in chunks:
+            if not chunk:
+                yield chunk
+                continue
+            self._buffer += chunk
+            self.bytes_in += len(chunk)
+            while len(self._buffer) >= block_bytes:
+                yield self._emit(block_bytes)
+        remainder = len(self._buffer) - len(self._buffer) % SAMPLE_WIDTH
+        if remainder:
+            yield self._emit(remainder)
+
+    def _emit(self, size: int) -> bytes:
+        data = b""
+        if self._frame_number == 0:
+            data = self.stream_header()
+        data += self.encode_block(bytes(memoryview(self._buffer)[:size]))
+        del self._buffer[:size]
+        self.bytes_out += len(data)
+        return data
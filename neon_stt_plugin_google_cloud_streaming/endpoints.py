@@ -0,0 +1,171 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Callable, Iterable, Optional
+
+import grpc
+
+from google.api_core.exceptions import GoogleAPICallError
+from google.cloud import speech
+from ovos_utils.log import LOG
+
+from neon_stt_plugin_google_cloud_streaming.client_pool import probe_client
+
+_ENDPOINT_FAILURES = (grpc.StatusCode.UNAVAILABLE,
+                      grpc.StatusCode.DEADLINE_EXCEEDED,
+                      grpc.StatusCode.INTERNAL,
+                      grpc.StatusCode.UNKNOWN)
+
+
+def is_endpoint_failure(error: Exception) -> bool:
+    """
+    Check if a stream error indicates a problem with the endpoint rather
+    than with the request.
+    """
+    if isinstance(error, GoogleAPICallError):
+        return error.grpc_status_code in _ENDPOINT_FAILURES
+    return isinstance(error, (grpc.RpcError, ConnectionError))
+
+
+class EndpointSelector:
+    """
+    Ranks candidate Speech API endpoints by an exponentially weighted moving
+    average of probe latency. Endpoints are probed on `start` and then
+    periodically in the background; an endpoint which fails a probe or a
+    stream is skipped until it next responds to a probe.
+    """
+
+    def __init__(self, endpoints: Iterable[str],
+                 client_factory: Callable[[str], speech.SpeechClient],
+                 probe_interval: float = 60, alpha: float = 0.3,
+                 probe_timeout: float = 5):
+        """
+        :param endpoints: candidate endpoints in order of preference
+        :param client_factory: method returning a client for an endpoint
+        :param probe_interval: seconds between background probes
+        :param alpha: EWMA weight of each new probe latency
+        :param probe_timeout: seconds to wait for each probe
+        """
+        self.endpoints = list(endpoints)
+        if not self.endpoints:
+            raise ValueError("No endpoints to select from")
+        self.client_factory = client_factory
+        self.probe_interval = probe_interval
+        self.alpha = alpha
+        self.probe_timeout = probe_timeout
+        self.scores = {endpoint: None for endpoint in self.endpoints}
+        self.healthy = {endpoint: True for endpoint in self.endpoints}
+        self._lock = Lock()
+        self._stopped = Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Start probing endpoints in the background.
+        """
+        if self._thread is None:
+            self._thread = Thread(target=self._run, daemon=True,
+                                  name="EndpointSelector")
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop background probing.
+        :param timeout: seconds to wait for an in-progress probe to finish
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self.probe_all()
+            self._stopped.wait(self.probe_interval)
+
+    def probe_all(self):
+        """
+        Probe all endpoints concurrently and wait for the results.
+        """
+        threads = [Thread(target=self.probe, args=(endpoint,), daemon=True)
+                   for endpoint in self.endpoints]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def probe(self, endpoint: str) -> Optional[float]:
+        """
+        Probe one endpoint and update its score.
+        :return: probe latency in seconds, or None if the probe failed
+        """
+        start = monotonic()
+        try:
+            ok = probe_client(self.client_factory(endpoint),
+                              self.probe_timeout)
+        except Exception as e:
+            LOG.warning(f"Failed to probe {endpoint}: {e}")
+            ok = False
+        latency = monotonic() - start
+        with self._lock:
+            self.healthy[endpoint] = ok
+            if not ok:
+                return None
+            score = self.scores[endpoint]
+            self.scores[endpoint] = latency if score is None else \
+                self.alpha * latency + (1 - self.alpha) * score
+        LOG.debug(f"Probed {endpoint} in {latency:.3f}s")
+        return latency
+
+    def report_failure(self, endpoint: str):
+        """
+        Skip `endpoint` for new streams until it next passes a probe.
+        """
+        with self._lock:
+            if self.healthy.get(endpoint):
+                LOG.warning(f"Failing over from {endpoint}")
+                self.healthy[endpoint] = False
+
+    def ranking(self) -> list:
+        """
+        Get endpoints ordered by preference: healthy endpoints by score
+        (unprobed endpoints after probed ones), then unhealthy endpoints.
+        """
+        with self._lock:
+            def _key(endpoint):
+                score = self.scores[endpoint]
+                return (not self.healthy[endpoint], score is None,
+                        score or 0.0, self.endpoints.index(endpoint))
+            return sorted(self.endpoints, key=_key)
+
+    def select(self) -> str:
+        """
+        Get the endpoint new streams should use.
+        """
+        return self.ranking()[0]
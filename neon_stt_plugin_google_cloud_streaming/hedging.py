@@ -0,0 +1,156 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from threading import Condition, Thread
+from time import monotonic
+from typing import Iterable, Optional
+
+
+class AudioTee:
+    """
+    Reads processed audio on a background thread and retains it so several
+    request streams can each read it from the start, including streams
+    opened after audio has already been sent.
+    """
+
+    def __init__(self, audio: Iterable[bytes]):
+        """
+        :param audio: iterable of audio chunks; empty chunks are skipped
+        """
+        self._audio = audio
+        self._chunks = []
+        self._closed = False
+        self._condition = Condition()
+        self.last_chunk = None
+        self._thread = Thread(target=self._fill, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _fill(self):
+        try:
+            for chunk in self._audio:
+                if chunk:
+                    with self._condition:
+                        self._chunks.append(chunk)
+                        self.last_chunk = monotonic()
+                        self._condition.notify_all()
+        finally:
+            with self._condition:
+                self._closed = True
+                self._condition.notify_all()
+
+    def reader(self) -> "TeeReader":
+        """
+        Get a new iterator over all audio from the start.
+        """
+        return TeeReader(self)
+
+
+class TeeReader:
+    """
+    Iterator over an `AudioTee` which ends when the source is exhausted or
+    the reader is cancelled.
+    """
+
+    def __init__(self, tee: AudioTee):
+        self._tee = tee
+        self._index = 0
+        self.cancelled = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        tee = self._tee
+        with tee._condition:
+            while self._index >= len(tee._chunks) and not tee._closed \
+                    and not self.cancelled:
+                tee._condition.wait()
+            if self.cancelled or self._index >= len(tee._chunks):
+                raise StopIteration
+            self._index += 1
+            return tee._chunks[self._index - 1]
+
+    def cancel(self):
+        with self._tee._condition:
+            self.cancelled = True
+            self._tee._condition.notify_all()
+
+
+class HedgeAttempt:
+    """
+    State of one of the competing streams in a hedged request.
+    """
+
+    def __init__(self, client, reader: TeeReader, primary: bool = False):
+        self.client = client
+        self.reader = reader
+        self.primary = primary
+        self.thread = None
+        self.responses = None
+        self.last_response = None
+        self.final_time = None
+        self.failed = False
+        self.cancelled = False
+
+    def cancel(self):
+        """
+        Stop sending audio and cancel the call if it has been established.
+        """
+        self.cancelled = True
+        self.reader.cancel()
+        if self.responses is not None:
+            self.responses.cancel()
+
+
+class HedgeStats:
+    """
+    Counts of hedged streams and the latency won by hedging.
+    """
+
+    def __init__(self):
+        self.streams = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.latency_won = 0.0
+
+    def record(self, hedged: bool, hedge_won: bool,
+               latency_won: Optional[float]):
+        self.streams += 1
+        self.hedged += int(hedged)
+        self.hedge_wins += int(hedge_won)
+        self.latency_won += latency_won or 0.0
+
+    def as_dict(self) -> dict:
+        return {"streams": self.streams,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "hedge_rate": self.hedged / self.streams
+                if self.streams else 0.0,
+                "latency_won_seconds": self.latency_won}
@@ -47,6 +47,12 @@ for row in table.find_all_next('tr'):
 
 pprint(langs)
 """
+import re
+
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional
+
 stt_config = {'af-ZA': [{'display_name': 'Afrikaans (South Africa)',
                          'lang': 'af-ZA',
                          'priority': 50,
@@ -599,3 +605,90 @@ stt_config = {'af-ZA': [{'display_name': 'Afrikaans (South Africa)',
                          'priority': 50,
                          'offline': False}]
               }
+
+# Codes listed with an alias, i.e. 'zh (cmn-Hans-CN)'
+_ALIASED_CODE = re.compile(r"^(?P<alias>[^()]+?)\s*\((?P<code>[^()]+)\)$")
+_DEFAULT_PRIORITY = 50
+
+
+def normalize_language(code: str) -> str:
+    """
+    Normalize a language code for lookup (case and separator insensitive).
+    """
+    return code.strip().replace("_", "-").lower()
+
+
+class LanguageIndex:
+    """
+    Immutable lookup table from normalized language codes and aliases to
+    supported language codes. A base language (i.e. `en`) or an unsupported
+    regional variant resolves to the preferred (lowest `priority`) supported
+    variant of that language.
+    """
+
+    def __init__(self, config: dict):
+        """
+        :param config: dict of language code to list of language specs
+        """
+        codes = dict()
+        bases = dict()
+        for code, specs in config.items():
+            priority = min((spec.get("priority", _DEFAULT_PRIORITY)
+                            for spec in specs), default=_DEFAULT_PRIORITY)
+            keys = {code}
+            for spec in specs:
+                match = _ALIASED_CODE.match(spec.get("lang", ""))
+                if match:
+                    keys.add(match.group("alias"))
+            for key in list(keys):
+                parts = key.split("-")
+                # cmn-Hans-CN is also accepted as cmn-CN; zh as zh-CN
+                if len(parts) == 3:
+                    keys.add(f"{parts[0]}-{parts[2]}")
+                elif len(parts) == 1:
+                    keys.add(f"{key}-{code.split('-')[-1]}")
+            for key in keys:
+                codes.setdefault(normalize_language(key), code)
+                base = normalize_language(key).split("-")[0]
+                best = bases.get(base)
+                if best is None or (priority, code) < best:
+                    bases[base] = (priority, code)
+        self._codes = MappingProxyType(codes)
+        self._bases = MappingProxyType({base: code for base, (_, code)
+                                        in bases.items()})
+        self.languages = frozenset(config)
+
+    def __contains__(self, code: str) -> bool:
+        return self.get(code) is not None
+
+    def get(self, code: str) -> Optional[str]:
+        """
+        Get the supported language code for `code`.
+        :param code: language code in any case, with `-` or `_` separators
+        :return: supported language code, or None if not supported
+        """
+        if not code:
+            return None
+        normalized = normalize_language(code)
+        return self._codes.get(normalized) or \
+            self._bases.get(normalized.split("-")[0])
+
+    def resolve(self, code: str) -> str:
+        """
+        Get the supported language code for `code`.
+        :param code: language code in any case, with `-` or `_` separators
+        :return: supported language code
+        :raises ValueError: if the language is not supported
+        """
+        resolved = self.get(code)
+        if resolved is None:
+            raise ValueError(f"Unsupported language: {code}")
+        return resolved
+
+
+@lru_cache(maxsize=None)
+def get_language_index() -> LanguageIndex:
+    """
+    Get the index of `stt_config`, built on first use.
+    """
+    return LanguageIndex(stt_config)
@@ -0,0 +1,222 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import socket
+
+from collections import deque
+from threading import Lock
+from time import monotonic
+from typing import Optional
+
+from ovos_utils.log import LOG
+
+
+class StreamMetrics:
+    """
+    Timestamps (`time.monotonic`) and counters recorded for one stream.
+    """
+    EVENTS = ("opened", "first_audio", "last_audio", "first_response",
+              "final_result", "results_ready")
+    # Reported durations in seconds as (name, start event, end event)
+    DURATIONS = (("open_to_first_audio", "opened", "first_audio"),
+                 ("upload", "first_audio", "last_audio"),
+                 ("first_response", "first_audio", "first_response"),
+                 ("final_result", "last_audio", "final_result"),
+                 ("results_ready", "last_audio", "results_ready"),
+                 ("total", "opened", "results_ready"))
+
+    def __init__(self):
+        self.opened = None
+        self.first_audio = None
+        self.last_audio = None
+        self.first_response = None
+        self.final_result = None
+        self.results_ready = None
+        self.bytes_sent = 0
+        self.chunks_sent = 0
+        self.rollovers = 0
+        self.reconnects = 0
+
+    def mark(self, event: str, first: bool = False):
+        """
+        Record the current time for `event`.
+        :param event: one of `EVENTS`
+        :param first: only record the first occurrence
+        """
+        if not (first and getattr(self, event) is not None):
+            setattr(self, event, monotonic())
+
+    def audio_sent(self, size: int):
+        """
+        Record an audio request of `size` bytes.
+        """
+        self.mark("first_audio", first=True)
+        self.mark("last_audio")
+        self.bytes_sent += size
+        self.chunks_sent += 1
+
+    def durations(self) -> dict:
+        """
+        Get durations in seconds between recorded events. Durations whose
+        events were not recorded (i.e. no response was received) are omitted.
+        """
+        durations = dict()
+        for name, start, end in self.DURATIONS:
+            start, end = getattr(self, start), getattr(self, end)
+            if start is not None and end is not None:
+                durations[name] = end - start
+        return durations
+
+    def counters(self) -> dict:
+        return {"bytes_sent": self.bytes_sent,
+                "chunks_sent": self.chunks_sent,
+                "rollovers": self.rollovers,
+                "reconnects": self.reconnects}
+
+
+class LatencyHistogram:
+    """
+    Percentiles over the most recent `max_samples` observations.
+    """
+
+    def __init__(self, max_samples: int = 1000):
+        self._samples = deque(maxlen=max_samples)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self._samples.append(value)
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        Get the nearest-rank percentile of recent samples.
+        """
+        if not self._samples:
+            return None
+        samples = sorted(self._samples)
+        rank = max(int(-(-percent * len(samples) // 100)), 1)
+        return samples[rank - 1]
+
+
+class MetricsAggregator:
+    """
+    Aggregates `StreamMetrics` into latency histograms and counter totals
+    and renders them in Prometheus text exposition format.
+    """
+    QUANTILES = (50, 95, 99)
+
+    def __init__(self, prefix: str = "neon_stt_google",
+                 max_samples: int = 1000):
+        """
+        :param prefix: metric name prefix
+        :param max_samples: observations retained per histogram
+        """
+        self.prefix = prefix
+        self.max_samples = max_samples
+        self.histograms = dict()
+        self.counters = dict()
+        self.streams = 0
+        self._lock = Lock()
+
+    def __call__(self, metrics: StreamMetrics):
+        with self._lock:
+            self.streams += 1
+            for name, value in metrics.durations().items():
+                if name not in self.histograms:
+                    self.histograms[name] = \
+                        LatencyHistogram(self.max_samples)
+                self.histograms[name].observe(value)
+            for name, value in metrics.counters().items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def percentiles(self) -> dict:
+        """
+        Get p50/p95/p99 seconds for each recorded duration.
+        """
+        with self._lock:
+            return {name: {f"p{q}": hist.percentile(q)
+                           for q in self.QUANTILES}
+                    for name, hist in self.histograms.items()}
+
+    def prometheus(self) -> str:
+        """
+        Render aggregated metrics in Prometheus text exposition format.
+        """
+        lines = []
+        with self._lock:
+            name = f"{self.prefix}_streams_total"
+            lines += [f"# TYPE {name} counter", f"{name} {self.streams}"]
+            for counter, value in self.counters.items():
+                name = f"{self.prefix}_{counter}_total"
+                lines += [f"# TYPE {name} counter", f"{name} {value}"]
+            for duration, hist in self.histograms.items():
+                name = f"{self.prefix}_{duration}_seconds"
+                lines.append(f"# TYPE {name} summary")
+                for q in self.QUANTILES:
+                    lines.append(f'{name}{{quantile="{q / 100}"}} '
+                                 f'{hist.percentile(q)}')
+                lines += [f"{name}_sum {hist.sum}",
+                          f"{name}_count {hist.count}"]
+        return "\n".join(lines) + "\n"
+
+
+class StatsDReporter:
+    """
+    Metrics callback which sends stream durations as StatsD timers and
+    counters as StatsD counters over UDP.
+    """
+
+    def __init__(self, host: str = "localhost", port: int = 8125,
+                 prefix: str = "neon_stt_google"):
+        """
+        :param host: StatsD host
+        :param port: StatsD UDP port
+        :param prefix: metric name prefix
+        """
+        self.address = (host, port)
+        self.prefix = prefix
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def format(self, metrics: StreamMetrics) -> list:
+        """
+        Get StatsD lines for `metrics`.
+        """
+        lines = [f"{self.prefix}.{name}:{value * 1000:.3f}|ms"
+                 for name, value in metrics.durations().items()]
+        lines += [f"{self.prefix}.{name}:{value}|c"
+                  for name, value in metrics.counters().items()]
+        return lines
+
+    def __call__(self, metrics: StreamMetrics):
+        try:
+            self._socket.sendto("\n".join(self.format(metrics)).encode(),
+                                self.address)
+        except OSError as e:
+            LOG.warning(f"Failed to send StatsD metrics: {e}")
@@ -0,0 +1,128 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+from array import array
+from bisect import bisect_right
+from typing import Iterable, Iterator, Optional, Tuple
+
+
+class WordTimings:
+    """
+    Words of a transcript with start and end offsets (milliseconds from the
+    start of the audio) and confidence, held in parallel arrays rather than
+    as an object per word.
+    """
+    __slots__ = ("words", "start_ms", "end_ms", "confidence")
+
+    def __init__(self, words: Optional[list] = None,
+                 start_ms: Optional[array] = None,
+                 end_ms: Optional[array] = None,
+                 confidence: Optional[array] = None):
+        self.words = words if words is not None else []
+        self.start_ms = start_ms if start_ms is not None else array("I")
+        self.end_ms = end_ms if end_ms is not None else array("I")
+        self.confidence = confidence if confidence is not None \
+            else array("f")
+
+    @classmethod
+    def from_result(cls, result, offset_ms: int = 0) -> "WordTimings":
+        """
+        Read word info for the best alternative of a recognition result.
+        :param result: `StreamingRecognitionResult`
+        :param offset_ms: offset of the stream start in the session audio
+        """
+        timings = cls()
+        # Reading the underlying protobuf avoids a proto-plus wrapper for
+        # every word and duration
+        message = type(result).pb(result)
+        if not message.alternatives:
+            return timings
+        words = timings.words
+        start_ms = timings.start_ms
+        end_ms = timings.end_ms
+        confidence = timings.confidence
+        for word in message.alternatives[0].words:
+            words.append(word.word)
+            start, end = word.start_time, word.end_time
+            start_ms.append(offset_ms + start.seconds * 1000 +
+                            start.nanos // 1000000)
+            end_ms.append(offset_ms + end.seconds * 1000 +
+                          end.nanos // 1000000)
+            confidence.append(word.confidence)
+        return timings
+
+    @classmethod
+    def join(cls, timings: Iterable["WordTimings"]) -> "WordTimings":
+        """
+        Concatenate timings for consecutive results.
+        """
+        joined = cls()
+        for t in timings:
+            joined.words.extend(t.words)
+            joined.start_ms.extend(t.start_ms)
+            joined.end_ms.extend(t.end_ms)
+            joined.confidence.extend(t.confidence)
+        return joined
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __getitem__(self, index: int) -> Tuple[str, int, int, float]:
+        return (self.words[index], self.start_ms[index], self.end_ms[index],
+                self.confidence[index])
+
+    def __iter__(self) -> Iterator[Tuple[str, int, int, float]]:
+        return zip(self.words, self.start_ms, self.end_ms, self.confidence)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, WordTimings):
+            return NotImplemented
+        return self.words == other.words and \
+            self.start_ms == other.start_ms and \
+            self.end_ms == other.end_ms and \
+            self.confidence == other.confidence
+
+    def __repr__(self) -> str:
+        return f"WordTimings({list(self)})"
+
+    def index_at(self, ms: int) -> Optional[int]:
+        """
+        Get the index of the word spoken at `ms`, or the next word if `ms`
+        falls between words.
+        :return: word index, or None if `ms` is after the last word
+        """
+        index = bisect_right(self.end_ms, ms)
+        return index if index < len(self.words) else None
+
+    def to_numpy(self) -> tuple:
+        """
+        Get NumPy views of the timing arrays without copying.
+        :return: (start_ms, end_ms, confidence)
+        """
+        import numpy as np
+        return tuple(np.frombuffer(a, dtype=np.dtype(a.typecode))
+                     for a in (self.start_ms, self.end_ms, self.confidence))
@@ -0,0 +1,104 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compare buffering between `stream_data` and the upload thread for a plain
+`Queue`, `AudioQueue` and `AudioRingBuffer`: producer/consumer throughput,
+chunks handed to the consumer and Python allocations while 60s of 10ms
+chunks are queued.
+
+    python tests/benchmarks/bench_audio_buffer.py
+"""
+import os
+import sys
+import tracemalloc
+
+from queue import Queue
+from threading import Thread
+from time import perf_counter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.realpath(__file__)))))
+from neon_stt_plugin_google_cloud_streaming.audio import BYTES_PER_SECOND
+from neon_stt_plugin_google_cloud_streaming.audio_queue import AudioQueue, \
+    AudioRingBuffer
+
+SECONDS = 60
+CHUNK = BYTES_PER_SECOND // 100
+BUFFERS = {"Queue": Queue,
+           "AudioQueue": lambda: AudioQueue(SECONDS + 1),
+           "AudioRingBuffer": lambda: AudioRingBuffer(SECONDS + 1)}
+
+
+def _consume(queue, counts):
+    while True:
+        chunk = queue.get()
+        queue.task_done()
+        if chunk is None:
+            return
+        counts[0] += 1
+        counts[1] += len(chunk)
+
+
+def _produce(queue, data):
+    for i in range(0, len(data), CHUNK):
+        queue.put(data[i:i + CHUNK])
+    queue.put(None)
+
+
+def main():
+    data = os.urandom(BYTES_PER_SECOND * SECONDS)
+    print(f"{'buffer':<18}{'MB/s':>10}{'chunks':>10}"
+          f"{'peak KiB':>12}{'allocs':>10}")
+    for name, factory in BUFFERS.items():
+        queue = factory()
+        counts = [0, 0]
+        consumer = Thread(target=_consume, args=(queue, counts))
+        start = perf_counter()
+        consumer.start()
+        _produce(queue, data)
+        consumer.join()
+        elapsed = perf_counter() - start
+        assert counts[1] == len(data)
+
+        # Memory held while a full stream is queued before being consumed
+        queue = factory()
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        _produce(queue, data)
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        allocs = sum(stat.count_diff for stat in
+                     after.compare_to(before, "lineno") if stat.count_diff > 0)
+        print(f"{name:<18}{len(data) / elapsed / 1e6:>10.1f}"
+              f"{counts[0]:>10}{peak / 1024:>12.0f}{allocs:>10}")
+
+
+if __name__ == "__main__":
+    main()
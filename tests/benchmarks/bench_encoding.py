@@ -0,0 +1,81 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compare bytes on the wire and encoder CPU time for each supported upload
+encoding using the test audio files.
+
+    python tests/benchmarks/bench_encoding.py
+"""
+import os
+import sys
+import wave
+
+from time import process_time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.realpath(__file__)))))
+from neon_stt_plugin_google_cloud_streaming.encoding import FlacEncoder
+
+TEST_PATH = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.realpath(__file__))), "test_audio")
+CHUNK_SIZE = 1024
+
+
+def _linear16(chunks):
+    yield from chunks
+
+
+def main():
+    audio = []
+    for file in sorted(os.listdir(TEST_PATH)):
+        with wave.open(os.path.join(TEST_PATH, file)) as w:
+            audio.append(w.readframes(w.getnframes()))
+    seconds = sum(len(a) for a in audio) / 32000
+    encoders = {"linear16": lambda: _linear16,
+                "flac (100ms blocks)": lambda: FlacEncoder().process,
+                "flac (256ms blocks)":
+                    lambda: FlacEncoder(block_size=4096).process}
+    print(f"{seconds:.2f}s of audio in {len(audio)} files")
+    print(f"{'encoding':<22}{'bytes':>10}{'ratio':>8}{'kbit/s':>9}"
+          f"{'cpu ms':>9}{'cpu %rt':>9}")
+    for name, factory in encoders.items():
+        total = 0
+        start = process_time()
+        for pcm in audio:
+            chunks = (pcm[i:i + CHUNK_SIZE]
+                      for i in range(0, len(pcm), CHUNK_SIZE))
+            total += sum(len(b) for b in factory()(chunks))
+        cpu = process_time() - start
+        print(f"{name:<22}{total:>10}{total / (seconds * 32000):>8.2f}"
+              f"{total * 8 / seconds / 1000:>9.1f}{cpu * 1000:>9.1f}"
+              f"{100 * cpu / seconds:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Measure input format conversion throughput (input samples per second of
+CPU time) for common capture formats, processed in 20ms chunks.
+
+    python tests/benchmarks/bench_resample.py
+"""
+import os
+import sys
+
+from time import process_time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.realpath(__file__)))))
+from neon_stt_plugin_google_cloud_streaming.audio import FormatAdapter
+
+SECONDS = 30
+FORMATS = [(48000, 1, "int16"), (48000, 2, "int16"), (44100, 1, "int16"),
+           (44100, 2, "float32"), (22050, 1, "int32"), (8000, 1, "int16"),
+           (16000, 2, "float32")]
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'format':<24}{'Msamples/s':>12}{'x realtime':>12}")
+    for rate, channels, sample_format in FORMATS:
+        dtype, scale = FormatAdapter.SAMPLE_FORMATS[sample_format]
+        samples = rng.normal(0, 0.1, rate * channels * SECONDS) * scale
+        data = samples.astype(dtype).tobytes()
+        chunk = len(data) // SECONDS // 50
+        chunk -= chunk % (np.dtype(dtype).itemsize * channels)
+        adapter = FormatAdapter(rate, channels, sample_format)
+        start = process_time()
+        for i in range(0, len(data), chunk):
+            adapter.convert(data[i:i + chunk])
+        cpu = process_time() - start
+        name = f"{rate}Hz {channels}ch {sample_format}"
+        print(f"{name:<24}{rate * channels * SECONDS / cpu / 1e6:>12.2f}"
+              f"{SECONDS / cpu:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
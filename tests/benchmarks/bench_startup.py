@@ -0,0 +1,101 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Measure plugin import time and construction time for each `client_init`
+mode. Each sample runs in a fresh interpreter so imports are cold; the
+OVOS plugin base classes are imported first and excluded from the import
+time. A throwaway service account key is generated so credential parsing
+and channel creation are included; no network requests are made.
+
+    python tests/benchmarks/bench_startup.py
+"""
+import json
+import os
+import subprocess
+import sys
+
+from statistics import median
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.realpath(__file__))))
+RUNS = 5
+MODES = ("eager", "background", "lazy")
+
+CHILD = """
+import json, sys
+from time import perf_counter
+import ovos_plugin_manager.templates.stt
+start = perf_counter()
+from neon_stt_plugin_google_cloud_streaming import GoogleCloudStreamingSTT
+imported = perf_counter()
+config = json.loads(sys.argv[1])
+stt = GoogleCloudStreamingSTT(config)
+constructed = perf_counter()
+stt.client
+ready = perf_counter()
+print(json.dumps([imported - start, constructed - imported,
+                  ready - imported]))
+"""
+
+
+def _service_account() -> dict:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(serialization.Encoding.PEM,
+                            serialization.PrivateFormat.PKCS8,
+                            serialization.NoEncryption()).decode()
+    return {"type": "service_account", "project_id": "bench",
+            "private_key_id": "0", "private_key": pem,
+            "client_email": "bench@bench.iam.gserviceaccount.com",
+            "client_id": "0", "token_uri": "https://oauth2.googleapis.com/token"}
+
+
+def main():
+    credential = _service_account()
+    print(f"{'client_init':<14}{'import ms':>11}{'construct ms':>14}"
+          f"{'client ready ms':>17}")
+    for mode in MODES:
+        config = {"lang": "en-US", "credential": {"json": credential},
+                  "warmup": False, "credential_refresh": False,
+                  "client_init": mode}
+        samples = []
+        for _ in range(RUNS):
+            output = subprocess.check_output(
+                [sys.executable, "-c", CHILD, json.dumps(config)],
+                cwd=ROOT, stderr=subprocess.DEVNULL)
+            samples.append(json.loads(output.decode().splitlines()[-1]))
+        imported, constructed, ready = (median(s) * 1000
+                                        for s in zip(*samples))
+        print(f"{mode:<14}{imported:>11.1f}{constructed:>14.1f}"
+              f"{ready:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
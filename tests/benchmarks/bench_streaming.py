@@ -0,0 +1,123 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Drive `GoogleCloudStreamingSTT` against the in-process fake Speech server
+at a given concurrency and report throughput, CPU time per stream and
+latency percentiles. CPU time includes the fake server, which runs in the
+same process but does little work per request.
+
+    python tests/benchmarks/bench_streaming.py --streams 200 --concurrency 16
+    python tests/benchmarks/bench_streaming.py --realtime \
+        --config '{"upload_encoding": "flac"}'
+"""
+import argparse
+import json
+import os
+import sys
+
+from threading import Thread
+from time import perf_counter, process_time, sleep
+from unittest.mock import patch
+
+TESTS = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(os.path.dirname(TESTS))
+sys.path.append(TESTS)
+from fake_speech_server import FakeSpeechServer, SpeechScript
+from neon_stt_plugin_google_cloud_streaming import GoogleCloudStreamingSTT
+from neon_stt_plugin_google_cloud_streaming.audio import BYTES_PER_SECOND
+from neon_stt_plugin_google_cloud_streaming.metrics import LatencyHistogram, \
+    MetricsAggregator
+
+
+def _worker(stt, streams, audio, args, wall):
+    chunk = BYTES_PER_SECOND * args.chunk_ms // 1000
+    for _ in range(streams):
+        stt.stream_start()
+        for i in range(0, len(audio), chunk):
+            stt.stream_data(audio[i:i + chunk])
+            if args.realtime:
+                sleep(args.chunk_ms / 1000)
+        start = perf_counter()
+        stt.transcribe()
+        wall.observe(perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--streams", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--audio-seconds", type=float, default=3)
+    parser.add_argument("--chunk-ms", type=int, default=100)
+    parser.add_argument("--realtime", action="store_true",
+                        help="send audio at real-time pace")
+    parser.add_argument("--final-delay", type=float, default=0.05,
+                        help="fake server seconds to final result")
+    parser.add_argument("--config", type=json.loads, default={},
+                        help="plugin config as JSON")
+    args = parser.parse_args()
+
+    audio = os.urandom(int(BYTES_PER_SECOND * args.audio_seconds) & ~1)
+    aggregator = MetricsAggregator()
+    wall = LatencyHistogram(args.streams)
+    per_worker = [args.streams // args.concurrency +
+                  (i < args.streams % args.concurrency)
+                  for i in range(args.concurrency)]
+    with FakeSpeechServer(SpeechScript(final_delay=args.final_delay),
+                          max_workers=args.concurrency * 2) as server:
+        workers = []
+        with patch("neon_stt_plugin_google_cloud_streaming."
+                   "get_shared_client", return_value=server.client()):
+            for count in filter(None, per_worker):
+                stt = GoogleCloudStreamingSTT(
+                    {"credential": {}, "lang": "en-US", **args.config})
+                stt.register_metrics_callback(aggregator)
+                workers.append(Thread(target=_worker,
+                                      args=(stt, count, audio, args, wall)))
+        start, cpu = perf_counter(), process_time()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed, cpu = perf_counter() - start, process_time() - cpu
+
+    print(f"streams:        {args.streams} ({args.concurrency} concurrent)")
+    print(f"throughput:     {args.streams / elapsed:.1f} streams/s, "
+          f"{args.streams * args.audio_seconds / elapsed:.1f} audio s/s")
+    print(f"cpu per stream: {cpu / args.streams * 1000:.2f} ms")
+    print(f"{'latency (ms)':<22}{'p50':>9}{'p95':>9}{'p99':>9}")
+    rows = dict(aggregator.percentiles())
+    rows["transcribe_call"] = {f"p{q}": wall.percentile(q)
+                               for q in MetricsAggregator.QUANTILES}
+    for name, percentiles in rows.items():
+        print(f"{name:<22}" + "".join(f"{v * 1000:>9.1f}"
+                                      for v in percentiles.values()))
+
+
+if __name__ == "__main__":
+    main()
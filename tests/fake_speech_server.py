@@ -0,0 +1,181 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+In-process stand-in for the Speech `StreamingRecognize` RPC, for tests and
+benchmarks which exercise the real gRPC streaming path without credentials
+or network access.
+
+    with FakeSpeechServer(SpeechScript("hello world")) as server:
+        client = server.client()
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from threading import Lock
+from time import sleep
+from typing import Optional
+
+import grpc
+
+from google.auth.credentials import AnonymousCredentials
+from google.cloud import speech
+from google.cloud.speech_v1.services.speech.transports import \
+    SpeechGrpcAsyncIOTransport, SpeechGrpcTransport
+
+SERVICE = "google.cloud.speech.v1.Speech"
+
+
+class SpeechScript:
+    """
+    Scripted behavior for each call handled by `FakeSpeechServer`.
+    """
+
+    def __init__(self, transcript: str = "hello world",
+                 confidence: float = 0.75, first_response_delay: float = 0.0,
+                 final_delay: float = 0.0, interim_every: int = 0,
+                 error: Optional[grpc.StatusCode] = None,
+                 error_after: int = 0, error_calls: int = 0):
+        """
+        :param transcript: transcript of the final result
+        :param confidence: confidence of the final result
+        :param first_response_delay: seconds before the first response
+        :param final_delay: seconds between the client half-closing the
+            request stream and the final result
+        :param interim_every: send an interim result every N audio chunks
+        :param error: status code to abort calls with
+        :param error_after: audio chunks received before aborting
+        :param error_calls: number of calls to abort (0 for every call)
+        """
+        self.transcript = transcript
+        self.confidence = confidence
+        self.first_response_delay = first_response_delay
+        self.final_delay = final_delay
+        self.interim_every = interim_every
+        self.error = error
+        self.error_after = error_after
+        self.error_calls = error_calls
+
+    def interim(self, chunks: int) -> speech.StreamingRecognizeResponse:
+        words = self.transcript.split()
+        count = min(chunks // self.interim_every, len(words))
+        return speech.StreamingRecognizeResponse(results=[
+            speech.StreamingRecognitionResult(stability=0.5, alternatives=[
+                speech.SpeechRecognitionAlternative(
+                    transcript=" ".join(words[:count]))])])
+
+    def final(self, audio_bytes: int) -> speech.StreamingRecognizeResponse:
+        return speech.StreamingRecognizeResponse(results=[
+            speech.StreamingRecognitionResult(
+                is_final=True,
+                result_end_time=timedelta(seconds=audio_bytes / 32000),
+                alternatives=[speech.SpeechRecognitionAlternative(
+                    transcript=self.transcript,
+                    confidence=self.confidence)])])
+
+
+class FakeSpeechServer:
+    """
+    gRPC server on a local port implementing `StreamingRecognize` according
+    to a `SpeechScript`. Each call is recorded in `calls`.
+    """
+
+    def __init__(self, script: Optional[SpeechScript] = None,
+                 max_workers: int = 64):
+        self.script = script or SpeechScript()
+        self.calls = []
+        self._lock = Lock()
+        self._server = grpc.server(ThreadPoolExecutor(max_workers))
+        handler = grpc.stream_stream_rpc_method_handler(
+            self._streaming_recognize,
+            request_deserializer=speech.StreamingRecognizeRequest.deserialize,
+            response_serializer=speech.StreamingRecognizeResponse.serialize)
+        self._server.add_generic_rpc_handlers([
+            grpc.method_handlers_generic_handler(
+                SERVICE, {"StreamingRecognize": handler})])
+        self.port = self._server.add_insecure_port("localhost:0")
+        self.address = f"localhost:{self.port}"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        self._server.start()
+
+    def stop(self, grace: Optional[float] = None):
+        self._server.stop(grace)
+
+    def client(self) -> speech.SpeechClient:
+        """
+        Get a `SpeechClient` connected to this server.
+        """
+        transport = SpeechGrpcTransport(
+            credentials=AnonymousCredentials(),
+            channel=grpc.insecure_channel(self.address))
+        return speech.SpeechClient(transport=transport)
+
+    def async_client(self) -> speech.SpeechAsyncClient:
+        """
+        Get a `SpeechAsyncClient` connected to this server. Must be called
+        from the event loop the client will be used on.
+        """
+        transport = SpeechGrpcAsyncIOTransport(
+            credentials=AnonymousCredentials(),
+            channel=grpc.aio.insecure_channel(self.address))
+        return speech.SpeechAsyncClient(transport=transport)
+
+    def _streaming_recognize(self, requests, context):
+        script = self.script
+        call = {"config": None, "chunks": 0, "bytes": 0}
+        with self._lock:
+            self.calls.append(call)
+            error = script.error if not script.error_calls or \
+                len(self.calls) <= script.error_calls else None
+        responded = False
+        for request in requests:
+            if "streaming_config" in request:
+                call["config"] = request.streaming_config
+                continue
+            call["chunks"] += 1
+            call["bytes"] += len(request.audio_content)
+            if error and call["chunks"] > script.error_after:
+                context.abort(error, "Scripted error")
+            if script.interim_every and \
+                    call["chunks"] % script.interim_every == 0:
+                if not responded:
+                    sleep(script.first_response_delay)
+                    responded = True
+                yield script.interim(call["chunks"])
+        if error:
+            context.abort(error, "Scripted error")
+        sleep(script.final_delay if responded else
+              max(script.final_delay, script.first_response_delay))
+        yield script.final(call["bytes"])
@@ -0,0 +1,165 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+import os
+import sys
+import unittest
+
+from unittest.mock import patch
+
+from google.cloud import speech
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from neon_stt_plugin_google_cloud_streaming import \
+    AsyncGoogleCloudStreamingSTT
+from helpers import get_stt
+
+
+def _final_response(transcript, confidence):
+    return speech.StreamingRecognizeResponse(results=[
+        speech.StreamingRecognitionResult(is_final=True, alternatives=[
+            speech.SpeechRecognitionAlternative(transcript=transcript,
+                                                confidence=confidence)])])
+
+
+class FakeAsyncCall:
+    def __init__(self, requests, call: dict):
+        self._requests = requests
+        self._call = call
+
+    async def __aiter__(self):
+        async for request in self._requests:
+            if "streaming_config" in request:
+                self._call["config"] = request.streaming_config
+            else:
+                self._call["audio"].append(request.audio_content)
+        yield _final_response(f"{len(self._call['audio'])} chunks", 0.75)
+
+    def cancel(self):
+        pass
+
+
+class FakeAsyncSpeechClient:
+    def __init__(self):
+        self.calls = []
+
+    async def streaming_recognize(self, requests, **kwargs):
+        call = {"audio": []}
+        self.calls.append(call)
+        return FakeAsyncCall(requests, call)
+
+
+class TestAsyncGoogleCloudStreamingSTT(unittest.IsolatedAsyncioTestCase):
+    def get_stt(self, client, config=None):
+        stt = get_stt(config=config, cls=AsyncGoogleCloudStreamingSTT)
+        patcher = patch("neon_stt_plugin_google_cloud_streaming.async_stt."
+                        "get_shared_async_client", return_value=client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return stt
+
+    async def test_transcribe(self):
+        client = FakeAsyncSpeechClient()
+        stt = self.get_stt(client)
+        await stt.stream_start()
+        for _ in range(3):
+            await stt.stream_data(b"\0" * 1024)
+        self.assertEqual(await stt.transcribe(), [("3 chunks", 0.75)])
+        self.assertEqual(client.calls[0]["config"], stt.streaming_config)
+
+    async def test_stages(self):
+        client = FakeAsyncSpeechClient()
+        stt = self.get_stt(client, {"frame_ms": 100})
+        await stt.stream_start()
+        for _ in range(7):
+            await stt.stream_data(b"\0" * 1024)
+        await stt.transcribe()
+        self.assertEqual([len(a) for a in client.calls[0]["audio"]],
+                         [3200, 3200, 768])
+
+    async def test_vad_trimmed_seconds(self):
+        client = FakeAsyncSpeechClient()
+        stt = self.get_stt(client, {"vad": True})
+        speech_chunk = ((4000).to_bytes(2, "little", signed=True) * 160 +
+                        (-4000).to_bytes(2, "little", signed=True) * 160) * 5
+        await stt.stream_start()
+        # 1s silence, 0.5s speech, 3s silence in 100ms chunks
+        for chunk in [b"\0" * 3200] * 10 + [speech_chunk] * 5 + \
+                [b"\0" * 3200] * 30:
+            await stt.stream_data(chunk)
+        await stt.transcribe()
+        self.assertAlmostEqual(sum(map(len, client.calls[0]["audio"])) /
+                               32000, 1.8, delta=0.05)
+        self.assertAlmostEqual(stt.trimmed_seconds, 2.7, delta=0.05)
+
+    async def test_concurrent_streams(self):
+        client = FakeAsyncSpeechClient()
+        sessions = [self.get_stt(client) for _ in range(20)]
+
+        async def _session(stt, chunks):
+            await stt.stream_start()
+            for _ in range(chunks):
+                await stt.stream_data(b"\0" * 1024)
+                await asyncio.sleep(0)
+            return await stt.transcribe()
+
+        results = await asyncio.gather(*(_session(stt, i + 1) for i, stt
+                                         in enumerate(sessions)))
+        self.assertEqual([r[0][0] for r in results],
+                         [f"{i + 1} chunks" for i in range(20)])
+
+    async def test_unsupported_modes(self):
+        for mode in ("long_form", "resilient", "continuous"):
+            with patch("neon_stt_plugin_google_cloud_streaming.async_stt."
+                       "LOG") as log:
+                self.get_stt(FakeAsyncSpeechClient(), {mode: True})
+            log.warning.assert_called_once_with(
+                f"{mode} is not supported by the asyncio interface")
+
+    async def test_stream_stop(self):
+        client = FakeAsyncSpeechClient()
+        stt = self.get_stt(client)
+        await stt.stream_start()
+        await stt.stream_data(b"\0" * 1024)
+        await stt.stream_stop()
+        self.assertIsNone(stt.stream)
+
+    async def test_cache(self):
+        client = FakeAsyncSpeechClient()
+        stt = self.get_stt(client, {"cache": True})
+        for _ in range(2):
+            await stt.stream_start()
+            await stt.stream_data(b"\1" * 1024)
+            await stt.stream_data(b"\1" * 1024)
+            self.assertEqual(await stt.transcribe(), [("2 chunks", 0.75)])
+        self.assertEqual(len(client.calls), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import sys
+import unittest
+
+from threading import Timer
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from neon_stt_plugin_google_cloud_streaming.audio import FormatAdapter, \
+    FrameCoalescer, PolyphaseResampler, ReplayBuffer, VoiceActivityTrimmer
+
+
+def _chunks(samples: np.ndarray, size: int = 512):
+    data = samples.astype("<i2").tobytes()
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestFrameCoalescer(unittest.TestCase):
+    def test_coalesce(self):
+        coalescer = FrameCoalescer.from_duration(100, 1000)
+        self.assertEqual(coalescer.frame_bytes, 3200)
+        frames = list(coalescer.process([b"\0" * 1000] * 7))
+        self.assertEqual([len(f) for f in frames], [3200, 3200, 600])
+
+
+class TestVoiceActivityTrimmer(unittest.TestCase):
+    rng = np.random.default_rng(0)
+
+    def _utterance(self):
+        silence = self.rng.normal(0, 20, 16000)
+        t = np.arange(8000) / 16000
+        speech = 4000 * np.sin(2 * np.pi * 220 * t)
+        return np.concatenate([silence, speech, silence, silence])
+
+    def test_trim(self):
+        vad = VoiceActivityTrimmer(pre_roll=0.3, trailing_silence=1.0)
+        output = b"".join(vad.process(_chunks(self._utterance())))
+        self.assertTrue(vad.speech_started)
+        self.assertTrue(vad.ended)
+        # 0.3s pre-roll + 0.5s speech + 1.0s trailing silence
+        self.assertAlmostEqual(len(output) / 32000, 1.8, delta=0.05)
+        self.assertAlmostEqual(vad.trimmed_seconds, 0.7, delta=0.05)
+
+    def test_no_trailing_limit(self):
+        vad = VoiceActivityTrimmer(pre_roll=0.3, trailing_silence=0)
+        output = b"".join(vad.process(_chunks(self._utterance())))
+        self.assertAlmostEqual(len(output) / 32000, 2.8, delta=0.05)
+
+    def test_silence(self):
+        vad = VoiceActivityTrimmer()
+        output = b"".join(vad.process(
+            _chunks(self.rng.normal(0, 20, 16000))))
+        self.assertEqual(output, b"")
+        self.assertFalse(vad.speech_started)
+        self.assertAlmostEqual(vad.trimmed_seconds, 1.0)
+
+
+class TestPolyphaseResampler(unittest.TestCase):
+    def test_resample(self):
+        for rate in (8000, 22050, 44100, 48000):
+            t = np.arange(rate) / rate
+            tone = (0.5 * np.sin(2 * np.pi * 1000 * t)).astype(np.float32)
+            output = PolyphaseResampler(rate).process(tone)
+            self.assertEqual(len(output), 16000)
+            steady = output[500:-500]
+            self.assertAlmostEqual(np.abs(steady).max(), 0.5, delta=0.02)
+            signs = np.signbit(steady)
+            crossings = np.count_nonzero(signs[1:] != signs[:-1])
+            self.assertAlmostEqual(crossings / 2 / (len(steady) / 16000),
+                                   1000, delta=5)
+
+    def test_chunked_matches_whole(self):
+        signal = np.random.default_rng(0).normal(0, 0.1, 44100) \
+            .astype(np.float32)
+        whole = PolyphaseResampler(44100).process(signal)
+        resampler = PolyphaseResampler(44100)
+        chunked = np.concatenate([resampler.process(signal[i:i + 777])
+                                  for i in range(0, len(signal), 777)])
+        np.testing.assert_allclose(chunked, whole, atol=1e-5)
+
+    def test_anti_aliasing(self):
+        t = np.arange(48000) / 48000
+        tone = (0.5 * np.sin(2 * np.pi * 12000 * t)).astype(np.float32)
+        output = PolyphaseResampler(48000).process(tone)
+        self.assertLess(np.abs(output[500:-500]).max(), 0.001)
+
+
+class TestFormatAdapter(unittest.TestCase):
+    def test_stereo_float(self):
+        t = np.arange(48000) / 48000
+        tone = 0.5 * np.sin(2 * np.pi * 440 * t)
+        stereo = np.stack([tone, tone], axis=1).astype("<f4").tobytes()
+        adapter = FormatAdapter(48000, 2, "float32")
+        # Chunks not aligned to sample frames are carried over
+        output = b"".join(adapter.process(
+            [stereo[i:i + 1001] for i in range(0, len(stereo), 1001)]))
+        samples = np.frombuffer(output, dtype="<i2")
+        self.assertAlmostEqual(len(samples), 16000, delta=1)
+        self.assertAlmostEqual(np.abs(samples[500:-500]).max(), 16384,
+                               delta=200)
+
+    def test_invalid_format(self):
+        with self.assertRaises(ValueError):
+            FormatAdapter(sample_format="uint8")
+
+
+class TestReplayBuffer(unittest.TestCase):
+    def test_acknowledge(self):
+        replay = ReplayBuffer(max_seconds=1)
+        for chunk in (b"a" * 100, b"b" * 100, b"c" * 100):
+            replay.append(chunk)
+        replay.acknowledge(replay.offset_at(150 / 32000, 0))
+        self.assertEqual(replay.pending(), [b"b" * 50, b"c" * 100])
+        self.assertEqual((replay.start, replay.end, len(replay)),
+                         (150, 300, 150))
+        # Odd offsets are aligned to whole samples
+        replay.acknowledge(201)
+        self.assertEqual(replay.pending(), [b"c" * 100])
+
+    def test_read(self):
+        replay = ReplayBuffer(max_seconds=1)
+        replay.append(b"a" * 100)
+        replay.append(b"b" * 100)
+        self.assertEqual(replay.read(150), (150, b"b" * 50))
+        self.assertEqual(replay.read(200, timeout=0), (200, b""))
+        # Released audio is skipped
+        replay.acknowledge(120)
+        self.assertEqual(replay.read(0), (120, b"b" * 80))
+        self.assertEqual(replay.sent, 200)
+        replay.close()
+        self.assertIsNone(replay.read(200))
+
+    def test_wait(self):
+        replay = ReplayBuffer(max_seconds=1)
+        replay.append(b"a" * 100)
+        self.assertTrue(replay.wait(50))
+        self.assertFalse(replay.wait(100, timeout=0))
+        Timer(0.05, replay.append, (b"b" * 100,)).start()
+        self.assertTrue(replay.wait(100, timeout=5))
+        Timer(0.05, replay.close).start()
+        self.assertFalse(replay.wait(200))
+
+    def test_bounded(self):
+        replay = ReplayBuffer(max_seconds=0.1)
+        for _ in range(10):
+            replay.append(b"\0" * 1600)
+        self.assertEqual(len(replay), 3200)
+        self.assertEqual(replay.start, 12800)
+
+
+if __name__ == '__main__':
+    unittest.main()
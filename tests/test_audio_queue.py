@@ -0,0 +1,164 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import sys
+import unittest
+
+from queue import Full
+from threading import Thread
+from time import sleep
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from neon_stt_plugin_google_cloud_streaming.audio_queue import AudioQueue, \
+    AudioRingBuffer
+
+CHUNK = b"\0" * 3200  # 100ms
+
+
+class TestAudioQueue(unittest.TestCase):
+    def test_block(self):
+        queue = AudioQueue(max_seconds=0.2, policy="block")
+        queue.put(CHUNK)
+        queue.put(CHUNK)
+        with self.assertRaises(Full):
+            queue.put(CHUNK, timeout=0.1)
+        with self.assertRaises(Full):
+            queue.put(CHUNK, block=False)
+
+        producer = Thread(target=queue.put, args=(CHUNK,))
+        producer.start()
+        sleep(0.1)
+        self.assertTrue(producer.is_alive())
+        queue.get()
+        producer.join(1)
+        self.assertFalse(producer.is_alive())
+        self.assertEqual(queue.qsize(), 2)
+        # Sentinel is accepted when full
+        queue.put(None)
+        self.assertEqual(queue.qsize(), 3)
+
+    def test_close_releases_producer(self):
+        queue = AudioQueue(max_seconds=0.1, policy="block")
+        queue.put(CHUNK)
+        producer = Thread(target=queue.put, args=(CHUNK,))
+        producer.start()
+        queue.close()
+        producer.join(1)
+        self.assertFalse(producer.is_alive())
+        self.assertEqual(queue.stats()["dropped_chunks"], 1)
+
+    def test_drop_oldest(self):
+        queue = AudioQueue(max_seconds=0.2, policy="drop_oldest")
+        for i in range(4):
+            queue.put(bytes([i]) * 3200)
+        self.assertEqual([queue.get()[0], queue.get()[0]], [2, 3])
+        stats = queue.stats()
+        self.assertEqual(stats["dropped_chunks"], 2)
+        self.assertAlmostEqual(stats["dropped_seconds"], 0.2)
+        self.assertAlmostEqual(stats["high_water_seconds"], 0.2)
+        self.assertEqual(stats["depth_seconds"], 0)
+
+    def test_abort(self):
+        queue = AudioQueue(max_seconds=0.2, policy="abort")
+        for _ in range(4):
+            queue.put(CHUNK)
+        self.assertTrue(queue.aborted)
+        self.assertIsNone(queue.get())
+        self.assertTrue(queue.empty())
+        self.assertEqual(queue.stats()["dropped_chunks"], 4)
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            AudioQueue(policy="grow")
+
+
+class TestAudioRingBuffer(unittest.TestCase):
+    def test_frames(self):
+        ring = AudioRingBuffer(max_seconds=0.1, frame_bytes=1000)
+        data = bytes(range(256)) * 10
+        ring.put(data[:1024])
+        ring.put(data[1024:2048])
+        ring.put(None)
+        frames = []
+        while True:
+            frame = ring.get()
+            ring.task_done()
+            if frame is None:
+                break
+            frames.append(frame)
+        self.assertEqual([len(f) for f in frames], [1000, 1000, 48])
+        self.assertEqual(b"".join(frames), data[:2048])
+
+    def test_sentinel_order(self):
+        ring = AudioRingBuffer(max_seconds=0.1, frame_bytes=1000)
+        ring.put(b"\1" * 600)
+        ring.put(None)
+        ring.put(b"\2" * 600)
+        ring.put(None)
+        self.assertEqual([ring.get() for _ in range(4)],
+                         [b"\1" * 600, None, b"\2" * 600, None])
+        self.assertTrue(ring.empty())
+
+    def test_wraparound(self):
+        ring = AudioRingBuffer(max_seconds=0.1, frame_bytes=3200)
+        chunks = [bytes([i]) * 1200 for i in range(10)]
+        received = []
+        for chunk in chunks:
+            ring.put(chunk)
+            if ring.bytes_queued >= 2400:
+                received.append(ring.get())
+        ring.put(None)
+        while True:
+            frame = ring.get()
+            if frame is None:
+                break
+            received.append(frame)
+        # Reads stop at the end of the buffer rather than copying around it
+        self.assertTrue(all(len(f) <= 3200 for f in received))
+        self.assertEqual(b"".join(received), b"".join(chunks))
+        self.assertEqual(ring.stats()["dropped_chunks"], 0)
+
+    def test_drop_oldest(self):
+        ring = AudioRingBuffer(max_seconds=0.1, policy="drop_oldest")
+        for i, size in enumerate((1600, 1600, 1602)):
+            ring.put(bytes([i]) * size)
+        self.assertEqual(ring.bytes_queued, 3200)
+        self.assertEqual(ring.dropped_bytes, 1602)
+        self.assertEqual(ring.get()[0], 1)
+
+    def test_abort(self):
+        ring = AudioRingBuffer(max_seconds=0.1, policy="abort")
+        ring.put(b"\0" * 3200)
+        ring.put(b"\0" * 2)
+        self.assertTrue(ring.aborted)
+        self.assertIsNone(ring.get())
+
+
+if __name__ == '__main__':
+    unittest.main()
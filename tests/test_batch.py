@@ -0,0 +1,138 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import os
+import sys
+import unittest
+import wave
+
+from tempfile import TemporaryDirectory
+from time import monotonic
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from neon_stt_plugin_google_cloud_streaming.batch import RateLimiter, \
+    open_audio, parse_wav
+from fake_speech_server import FakeSpeechServer, SpeechScript
+from helpers import get_stt
+
+
+def _write_wav(path, seconds, sample_rate=16000, channels=1):
+    with wave.open(path, "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(b"\0" * int(seconds * sample_rate) * 2 * channels)
+
+
+class TestBatchAudio(unittest.TestCase):
+    def test_parse_wav(self):
+        with TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "audio.wav")
+            _write_wav(path, 0.5, 44100, 2)
+            with open(path, "rb") as f:
+                data = f.read()
+            self.assertEqual(parse_wav(data), (44, 88200,
+                                               (44100, 2, "int16")))
+            with open_audio(path, None) as (buffer, start, end, fmt):
+                self.assertEqual((start, end, fmt),
+                                 (44, 44 + 88200, (44100, 2, "int16")))
+                self.assertEqual(buffer[start:end], data[44:])
+        with self.assertRaises(ValueError):
+            parse_wav(b"RIFF\0\0\0\0WAVEdata\0\0\0\0")
+        raw = b"\1\0" * 10
+        with open_audio(raw, (8000, 1, "int16")) as audio:
+            self.assertEqual(audio, (raw, 0, 20, (8000, 1, "int16")))
+
+    def test_rate_limiter(self):
+        limiter = RateLimiter(20, burst=2)
+        start = monotonic()
+        waits = [limiter.acquire() for _ in range(4)]
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertTrue(all(wait > 0 for wait in waits[2:]))
+        self.assertGreaterEqual(monotonic() - start, 0.09)
+
+
+class TestBatchTranscription(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeSpeechServer(SpeechScript(final_delay=0.05))
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.calls.clear()
+
+    def get_stt(self, config=None):
+        return get_stt(self.server.client(), config)
+
+    def test_transcribe_batch(self):
+        stt = self.get_stt({"single_utterance": True, "vad": True})
+        with TemporaryDirectory() as tmp:
+            wav = os.path.join(tmp, "audio.wav")
+            _write_wav(wav, 2, 48000, 2)
+            items = [wav, b"\0" * 32000, os.path.join(tmp, "missing.wav")]
+            results = list(stt.transcribe_batch(items * 3, max_workers=3))
+        self.assertEqual([r.index for r in results], list(range(9)))
+        for result in results[::3] + results[1::3]:
+            self.assertIsNone(result.error)
+            self.assertEqual(result.transcriptions, [("hello world", 0.75)])
+        for result in results[2::3]:
+            self.assertIsInstance(result.error, FileNotFoundError)
+            self.assertEqual(result.transcriptions, [])
+        self.assertEqual([r.audio_seconds for r in results[:2]], [2.0, 1.0])
+
+        # Audio is resampled, and not trimmed or cut off at an utterance
+        sent = sorted(call["bytes"] for call in self.server.calls)
+        self.assertEqual(sent, [32000] * 3 + [64000] * 3)
+        for call in self.server.calls:
+            self.assertFalse(call["config"].single_utterance)
+
+        stats = stt.batch_stats.as_dict()
+        self.assertEqual(stats["items"], 9)
+        self.assertEqual(stats["failed"], 3)
+        self.assertEqual(stats["audio_seconds"], 9.0)
+        self.assertEqual(stats["bytes_sent"], 9 * 32000)
+        self.assertGreater(stats["realtime_factor"], 1)
+
+    def test_rollover(self):
+        stt = self.get_stt({"stream_limit": 1})
+        result, = stt.transcribe_batch([b"\0" * 112000])
+        self.assertIsNone(result.error)
+        self.assertEqual(result.audio_seconds, 3.5)
+        # Audio is sent faster than real time, but each call is limited to
+        # `stream_limit` seconds of audio
+        self.assertEqual([call["bytes"] for call in self.server.calls],
+                         [32000, 32000, 32000, 16000])
+        self.assertEqual(result.transcriptions, [(" ".join(
+            ["hello world"] * 4), 0.75)])
+
+
+if __name__ == '__main__':
+    unittest.main()
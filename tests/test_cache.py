@@ -0,0 +1,78 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import sys
+import unittest
+
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from neon_stt_plugin_google_cloud_streaming.cache import TranscriptionCache
+
+RESULT = [("hello", 0.75), ("hallo", 0.5)]
+
+
+class TestTranscriptionCache(unittest.TestCase):
+    def test_lru(self):
+        cache = TranscriptionCache(max_entries=2)
+        cache.put("a", RESULT)
+        cache.put("b", RESULT)
+        self.assertEqual(cache.get("a"), RESULT)
+        cache.put("c", RESULT)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), RESULT)
+        self.assertEqual(cache.get("c"), RESULT)
+        self.assertEqual(cache.stats(),
+                         {"hits": 3, "misses": 1, "entries": 2})
+
+    def test_ttl(self):
+        cache = TranscriptionCache(ttl=10)
+        with patch("neon_stt_plugin_google_cloud_streaming.cache.time",
+                   return_value=100):
+            cache.put("a", RESULT)
+        with patch("neon_stt_plugin_google_cloud_streaming.cache.time",
+                   return_value=105):
+            self.assertEqual(cache.get("a"), RESULT)
+        with patch("neon_stt_plugin_google_cloud_streaming.cache.time",
+                   return_value=111):
+            self.assertIsNone(cache.get("a"))
+
+    def test_disk(self):
+        with TemporaryDirectory() as directory:
+            TranscriptionCache(directory=directory).put("a", RESULT)
+            cache = TranscriptionCache(directory=directory)
+            self.assertEqual(cache.get("a"), RESULT)
+            cache.clear()
+            self.assertIsNone(TranscriptionCache(
+                directory=directory).get("a"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+import os
+import sys
+import unittest
+
+from unittest.mock import patch
+
+from google.auth.credentials import AnonymousCredentials
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from neon_stt_plugin_google_cloud_streaming.client_pool import SpeechClientPool
+
+
+class TestSpeechClientPool(unittest.TestCase):
+    def test_shared_client(self):
+        pool = SpeechClientPool()
+        creds = AnonymousCredentials()
+        client = pool.get_client(creds, warmup=False)
+        self.assertIs(client, pool.get_client(creds, warmup=False))
+        self.assertIs(client, pool.get_client(creds, "speech.googleapis.com",
+                                              warmup=False))
+        other = pool.get_client(creds, "us-speech.googleapis.com",
+                                warmup=False)
+        self.assertIsNot(client, other)
+        self.assertEqual(other.transport._host, "us-speech.googleapis.com:443")
+        pool.clear()
+
+    def test_pool_size(self):
+        pool = SpeechClientPool()
+        creds = AnonymousCredentials()
+        clients = [pool.get_client(creds, pool_size=2, warmup=False)
+                   for _ in range(4)]
+        self.assertIsNot(clients[0], clients[1])
+        self.assertIs(clients[0], clients[2])
+        self.assertIs(clients[1], clients[3])
+        pool.clear()
+
+    def test_settings_mismatch(self):
+        pool = SpeechClientPool()
+        creds = AnonymousCredentials()
+        with patch("neon_stt_plugin_google_cloud_streaming.client_pool."
+                   "LOG") as log:
+            client = pool.get_client(creds, pool_size=2, warmup=False)
+            pool.get_client(creds, pool_size=2, warmup=False)
+            log.warning.assert_not_called()
+            # Existing channels are shared rather than recreated
+            self.assertIs(pool.get_client(creds, keepalive_time_ms=1000,
+                                          warmup=False), client)
+            log.warning.assert_called_once()
+        pool.clear()
+
+    def test_async_client_per_loop(self):
+        pool = SpeechClientPool()
+        creds = AnonymousCredentials()
+
+        async def _get_clients():
+            return pool.get_async_client(creds), pool.get_async_client(creds)
+
+        first, second = asyncio.run(_get_clients())
+        self.assertIs(first, second)
+        other, _ = asyncio.run(_get_clients())
+        self.assertIsNot(first, other)
+        pool.clear()
+
+    def test_clear_async_clients(self):
+        pool = SpeechClientPool()
+        creds = AnonymousCredentials()
+
+        async def _get_client():
+            return pool.get_async_client(creds)
+
+        async def _clear_in_loop():
+            client = await _get_client()
+            pool.clear()
+            await asyncio.sleep(0.1)
+            return client
+
+        # Clients on a running loop are closed on that loop
+        client = asyncio.run(_clear_in_loop())
+        self.assertTrue(client.transport.grpc_channel._channel.closed())
+        self.assertEqual(len(pool._async_clients), 0)
+
+        # Clients on a stopped loop are closed by running it
+        loop = asyncio.new_event_loop()
+        try:
+            client = loop.run_until_complete(_get_client())
+            pool.clear()
+            self.assertTrue(client.transport.grpc_channel._channel.closed())
+        finally:
+            loop.close()
+        self.assertEqual(len(pool._async_clients), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import os
+import sys
+import unittest
+
+from datetime import timedelta
+from threading import Event
+from unittest.mock import patch
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from neon_stt_plugin_google_cloud_streaming.credentials import \
+    CLOUD_PLATFORM_SCOPE, CredentialManager, _utcnow
+from helpers import get_stt
+
+
+def _service_account(email="test@test.iam.gserviceaccount.com") -> dict:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(serialization.Encoding.PEM,
+                            serialization.PrivateFormat.PKCS8,
+                            serialization.NoEncryption()).decode()
+    return {"type": "service_account", "project_id": "test",
+            "private_key_id": "0", "private_key": pem, "client_email": email,
+            "client_id": "0", "token_uri": "https://oauth2.googleapis.com/token"}
+
+
+class TestCredentialManager(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.info = _service_account()
+
+    def setUp(self):
+        self.grants = []
+        self.granted = Event()
+        patcher = patch("google.oauth2._client.jwt_grant",
+                        side_effect=self._grant)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.lifetime = 3600
+
+    def _grant(self, request, token_uri, assertion):
+        self.grants.append(token_uri)
+        self.granted.set()
+        return f"token-{len(self.grants)}", \
+            _utcnow() + timedelta(seconds=self.lifetime), {}
+
+    def test_shared_credentials(self):
+        manager = CredentialManager()
+        credentials = manager.get_credentials(self.info, refresh=False)
+        self.assertIs(manager.get_credentials(dict(self.info),
+                                              refresh=False), credentials)
+        self.assertEqual(credentials.scopes, [CLOUD_PLATFORM_SCOPE])
+        self.assertIsNot(manager.get_credentials(
+            _service_account("other@test.iam.gserviceaccount.com"),
+            refresh=False), credentials)
+
+        # Without background refresh, the first request refreshes inline
+        headers = dict()
+        credentials.before_request(None, "POST", "url", headers)
+        self.assertEqual(headers["authorization"], "Bearer token-1")
+        stats = credentials.auth_stats.as_dict()
+        self.assertEqual(stats["inline_refreshes"], 1)
+        self.assertGreater(stats["inline_wait_seconds"], 0)
+
+    def test_background_refresh(self):
+        # Tokens expiring within the margin are refreshed again immediately
+        self.lifetime = 240
+        manager = CredentialManager(refresh_margin=0, retry_interval=0.05)
+        self.assertEqual(manager.refresh_margin, 240)
+        credentials = manager.get_credentials(self.info)
+        try:
+            self.assertTrue(self.granted.wait(5))
+            self.granted.clear()
+            self.assertTrue(self.granted.wait(5))
+        finally:
+            manager.stop()
+        self.assertTrue(credentials.valid)
+        headers = dict()
+        credentials.before_request(None, "POST", "url", headers)
+        stats = credentials.auth_stats.as_dict()
+        self.assertGreaterEqual(stats["background_refreshes"], 2)
+        self.assertEqual(stats["inline_refreshes"], 0)
+        self.assertEqual(stats["inline_wait_seconds"], 0.0)
+
+    def test_refresh_failure(self):
+        manager = CredentialManager(retry_interval=0.05)
+        with patch("google.oauth2._client.jwt_grant",
+                   side_effect=[ConnectionError("offline"),
+                                ("token", _utcnow() + timedelta(hours=1),
+                                 {})]):
+            credentials = manager.get_credentials(self.info)
+            try:
+                for _ in range(100):
+                    if credentials.token:
+                        break
+                    Event().wait(0.01)
+            finally:
+                manager.stop()
+        self.assertEqual(credentials.token, "token")
+        stats = credentials.auth_stats.as_dict()
+        self.assertEqual(stats["failures"], 1)
+        self.assertEqual(stats["background_refreshes"], 2)
+
+    def test_plugin_credentials(self):
+        config = {"lang": "en-US", "credential": {"json": self.info},
+                  "credential_refresh": False}
+        first = get_stt(config=config)
+        second = get_stt(config=config)
+        self.assertIs(first._credentials, second._credentials)
+        self.assertEqual(first.auth_stats["inline_refreshes"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
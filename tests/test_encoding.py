@@ -0,0 +1,81 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import io
+import os
+import sys
+import unittest
+import wave
+
+import numpy as np
+import soundfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from neon_stt_plugin_google_cloud_streaming.encoding import FlacEncoder
+
+ROOT_DIR = os.path.dirname(os.path.realpath(__file__))
+TEST_PATH = os.path.join(ROOT_DIR, "test_audio")
+
+
+def _decode(flac: bytes, num_samples: int) -> np.ndarray:
+    # Streams don't declare a length; add one so the decoder can seek
+    info = int.from_bytes(flac[8:42], "big") | (num_samples << 128)
+    flac = flac[:8] + info.to_bytes(34, "big") + flac[42:]
+    with soundfile.SoundFile(io.BytesIO(flac)) as f:
+        return f.read(num_samples, dtype="int16")
+
+
+class TestFlacEncoder(unittest.TestCase):
+    def test_lossless(self):
+        for file in os.listdir(TEST_PATH):
+            with wave.open(os.path.join(TEST_PATH, file)) as w:
+                pcm = w.readframes(w.getnframes())
+            encoder = FlacEncoder()
+            chunks = [pcm[i:i + 1023] for i in range(0, len(pcm), 1023)]
+            flac = b"".join(encoder.process(chunks))
+            self.assertLess(len(flac), len(pcm), file)
+            self.assertEqual(encoder.bytes_out, len(flac))
+            expected = np.frombuffer(pcm, dtype="<i2")
+            np.testing.assert_array_equal(_decode(flac, len(expected)),
+                                          expected, file)
+
+    def test_constant_and_verbatim_blocks(self):
+        rng = np.random.default_rng(0)
+        samples = rng.integers(-32768, 32767, 16 * 200, dtype=np.int16)
+        samples[:64] = 0
+        flac = b"".join(FlacEncoder(block_size=16).process(
+            [samples.tobytes()]))
+        np.testing.assert_array_equal(_decode(flac, len(samples)), samples)
+
+    def test_invalid_block_size(self):
+        with self.assertRaises(ValueError):
+            FlacEncoder(block_size=8)
+
+
+if __name__ == '__main__':
+    unittest.main()
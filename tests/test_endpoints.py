@@ -0,0 +1,99 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import sys
+import unittest
+
+from unittest.mock import patch
+
+import grpc
+
+from google.api_core.exceptions import InvalidArgument, ServiceUnavailable
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from neon_stt_plugin_google_cloud_streaming.endpoints import \
+    EndpointSelector, is_endpoint_failure
+
+ENDPOINTS = ["us-speech.googleapis.com", "eu-speech.googleapis.com",
+             "asia-speech.googleapis.com"]
+
+
+class TestEndpointSelector(unittest.TestCase):
+    def _probe(self, selector, endpoint, latency, ok=True):
+        with patch("neon_stt_plugin_google_cloud_streaming.endpoints."
+                   "probe_client", return_value=ok), \
+                patch("neon_stt_plugin_google_cloud_streaming.endpoints."
+                      "monotonic", side_effect=[0.0, latency]):
+            return selector.probe(endpoint)
+
+    def test_ranking(self):
+        selector = EndpointSelector(ENDPOINTS, lambda e: None, alpha=0.5)
+        # Unprobed endpoints keep configured order
+        self.assertEqual(selector.select(), ENDPOINTS[0])
+        self._probe(selector, ENDPOINTS[0], 0.2)
+        self._probe(selector, ENDPOINTS[1], 0.1)
+        self.assertEqual(selector.ranking(), [ENDPOINTS[1], ENDPOINTS[0],
+                                              ENDPOINTS[2]])
+        # EWMA smooths a single slow probe
+        self._probe(selector, ENDPOINTS[1], 0.25)
+        self.assertAlmostEqual(selector.scores[ENDPOINTS[1]], 0.175)
+        self.assertEqual(selector.select(), ENDPOINTS[1])
+        self._probe(selector, ENDPOINTS[1], 0.4)
+        self.assertEqual(selector.select(), ENDPOINTS[0])
+
+    def test_failover(self):
+        selector = EndpointSelector(ENDPOINTS[:2], lambda e: None)
+        self._probe(selector, ENDPOINTS[0], 0.1)
+        self._probe(selector, ENDPOINTS[1], 0.2)
+        selector.report_failure(ENDPOINTS[0])
+        self.assertEqual(selector.select(), ENDPOINTS[1])
+        self._probe(selector, ENDPOINTS[1], 0.2, ok=False)
+        self.assertEqual(selector.select(), ENDPOINTS[0])
+        self._probe(selector, ENDPOINTS[1], 0.2)
+        self.assertEqual(selector.select(), ENDPOINTS[1])
+
+    def test_stop(self):
+        selector = EndpointSelector(ENDPOINTS, lambda e: None,
+                                    probe_interval=60)
+        with patch("neon_stt_plugin_google_cloud_streaming.endpoints."
+                   "probe_client", return_value=True):
+            selector.start()
+            self.assertTrue(selector._thread.is_alive())
+            selector.stop(5)
+        self.assertFalse(selector._thread.is_alive())
+
+    def test_is_endpoint_failure(self):
+        self.assertTrue(is_endpoint_failure(ServiceUnavailable("")))
+        self.assertFalse(is_endpoint_failure(InvalidArgument("")))
+        self.assertFalse(is_endpoint_failure(ValueError()))
+        self.assertTrue(is_endpoint_failure(grpc.RpcError()))
+
+
+if __name__ == '__main__':
+    unittest.main()
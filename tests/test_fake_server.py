@@ -0,0 +1,187 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import sys
+import unittest
+
+from time import sleep
+from unittest.mock import patch
+
+import grpc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from neon_stt_plugin_google_cloud_streaming import \
+    AsyncGoogleCloudStreamingSTT
+from fake_speech_server import FakeSpeechServer, SpeechScript
+from helpers import get_stt
+
+CHUNK = b"\0" * 3200  # 100ms
+
+
+class TestFakeSpeechServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeSpeechServer()
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.script = SpeechScript()
+        self.server.calls.clear()
+
+    def get_stt(self, config=None):
+        return get_stt(self.server.client(), config)
+
+    def _transcribe(self, stt, chunks=10):
+        stt.stream_start()
+        for _ in range(chunks):
+            stt.stream_data(CHUNK)
+        return stt.transcribe()
+
+    def test_transcribe(self):
+        stt = self.get_stt()
+        self.assertEqual(self._transcribe(stt), [("hello world", 0.75)])
+        call = self.server.calls[0]
+        self.assertEqual(call["config"].config.language_code, "en-US")
+        self.assertEqual(call["bytes"], 10 * len(CHUNK))
+        self.assertEqual(stt.last_metrics.bytes_sent, 10 * len(CHUNK))
+
+    def test_interim_results(self):
+        self.server.script = SpeechScript(interim_every=5)
+        stt = self.get_stt({"interim_results": True})
+        interim = []
+        stt.register_interim_callback(lambda t, s: interim.append(t))
+        self.assertEqual(self._transcribe(stt), [("hello world", 0.75)])
+        self.assertEqual(interim, ["hello", "hello world"])
+
+    def test_reconnect(self):
+        # The first call fails mid-stream while gRPC is still reading audio
+        self.server.script = SpeechScript(
+            error=grpc.StatusCode.UNAVAILABLE, error_after=3, error_calls=1)
+        for _ in range(5):
+            self.server.calls.clear()
+            stt = self.get_stt({"resilient": True, "max_reconnects": 1})
+            stt.stream_start()
+            for i in range(10):
+                stt.stream_data(CHUNK)
+                if i == 3:
+                    # gRPC's request thread is left waiting for audio when
+                    # the call fails
+                    sleep(0.3)
+            self.assertEqual(stt.transcribe(), [("hello world", 0.75)])
+            self.assertEqual(len(self.server.calls), 2)
+            # No final result was received, so all audio is resent
+            self.assertEqual(self.server.calls[1]["bytes"], 10 * len(CHUNK))
+            self.assertEqual(stt.last_metrics.reconnects, 1)
+
+    def test_error(self):
+        self.server.script = SpeechScript(
+            error=grpc.StatusCode.INVALID_ARGUMENT, error_after=2)
+        stt = self.get_stt()
+        self.assertEqual(self._transcribe(stt), [])
+
+
+class TestHedging(unittest.TestCase):
+    def setUp(self):
+        self.primary = FakeSpeechServer(SpeechScript("primary"))
+        self.hedge = FakeSpeechServer(SpeechScript("hedge"))
+        self.primary.start()
+        self.hedge.start()
+
+    def tearDown(self):
+        self.primary.stop()
+        self.hedge.stop()
+
+    def get_stt(self, hedge_after_ms):
+        clients = {None: self.primary.client(),
+                   "hedge.example.com": self.hedge.client()}
+        return get_stt(clients, {"hedge_endpoint": "hedge.example.com",
+                                 "hedge_after_ms": hedge_after_ms})
+
+    @staticmethod
+    def _transcribe(stt):
+        stt.stream_start()
+        for _ in range(5):
+            stt.stream_data(CHUNK)
+        return stt.transcribe()
+
+    def test_primary_responds(self):
+        stt = self.get_stt(500)
+        self.assertEqual(self._transcribe(stt), [("primary", 0.75)])
+        self.assertEqual(self.hedge.calls, [])
+        self.assertEqual(stt.hedge_stats.as_dict()["hedged"], 0)
+
+    def test_hedge_on_slow_primary(self):
+        self.primary.script.final_delay = 2
+        stt = self.get_stt(100)
+        self.assertEqual(self._transcribe(stt), [("hedge", 0.75)])
+        # The hedged stream receives all audio, including audio sent
+        # before it was opened
+        self.assertEqual(self.hedge.calls[0]["bytes"], 5 * len(CHUNK))
+        stats = stt.hedge_stats.as_dict()
+        self.assertEqual(stats["hedge_wins"], 1)
+        self.assertEqual(stats["hedge_rate"], 1.0)
+        self.assertGreater(stats["latency_won_seconds"], 0.1)
+
+    def test_hedge_on_primary_error(self):
+        self.primary.script.error = grpc.StatusCode.UNAVAILABLE
+        stt = self.get_stt(5000)
+        self.assertEqual(self._transcribe(stt), [("hedge", 0.75)])
+
+    def test_duplicate_from_start(self):
+        # Give the hedged call time to reach the server before it is
+        # cancelled
+        self.primary.script.final_delay = 0.2
+        self.hedge.script.final_delay = 2
+        stt = self.get_stt(0)
+        self.assertEqual(self._transcribe(stt), [("primary", 0.75)])
+        self.assertEqual(len(self.hedge.calls), 1)
+        stats = stt.hedge_stats.as_dict()
+        self.assertEqual((stats["hedged"], stats["hedge_wins"]), (1, 0))
+
+
+class TestFakeSpeechServerAsync(unittest.IsolatedAsyncioTestCase):
+    async def test_transcribe(self):
+        with FakeSpeechServer() as server:
+            stt = get_stt(cls=AsyncGoogleCloudStreamingSTT)
+            with patch("neon_stt_plugin_google_cloud_streaming.async_stt."
+                       "get_shared_async_client") as get_client:
+                get_client.return_value = server.async_client()
+                await stt.stream_start()
+            for _ in range(10):
+                await stt.stream_data(CHUNK)
+            self.assertEqual(await stt.transcribe(), [("hello world", 0.75)])
+            self.assertEqual(server.calls[0]["bytes"], 10 * len(CHUNK))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from neon_stt_plugin_google_cloud_streaming.languages import LanguageIndex, \
+    get_language_index, stt_config
+
+
+class TestLanguageIndex(unittest.TestCase):
+    def test_normalized_lookup(self):
+        index = get_language_index()
+        for code in ("en-US", "en-us", "en_US", " EN_us "):
+            self.assertEqual(index.resolve(code), "en-US")
+        self.assertIs(get_language_index(), index)
+        self.assertEqual(index.languages, frozenset(stt_config))
+
+    def test_fallback(self):
+        index = get_language_index()
+        self.assertEqual(index.resolve("en"), "en-US")
+        self.assertEqual(index.resolve("es"), "es-ES")
+        self.assertEqual(index.resolve("en-XX"), "en-US")
+        self.assertEqual(index.resolve("fr-CA"), "fr-CA")
+        with self.assertRaises(ValueError):
+            index.resolve("xx-XX")
+        self.assertNotIn("", index)
+
+    def test_aliases(self):
+        index = get_language_index()
+        self.assertEqual(index.resolve("zh"), "cmn-Hans-CN")
+        self.assertEqual(index.resolve("zh_CN"), "cmn-Hans-CN")
+        self.assertEqual(index.resolve("zh-TW"), "cmn-Hant-TW")
+        self.assertEqual(index.resolve("cmn-hans-cn"), "cmn-Hans-CN")
+        self.assertEqual(index.resolve("yue-HK"), "yue-Hant-HK")
+
+    def test_priority(self):
+        index = LanguageIndex({
+            "pt-BR": [{"lang": "pt-BR", "priority": 50}],
+            "pt-PT": [{"lang": "pt-PT", "priority": 45}],
+            "ko-KR": [{"lang": "ko-KR"}]})
+        self.assertEqual(index.resolve("pt"), "pt-PT")
+        self.assertEqual(index.resolve("ko"), "ko-KR")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import sys
+import unittest
+
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from neon_stt_plugin_google_cloud_streaming.metrics import LatencyHistogram, \
+    MetricsAggregator, StatsDReporter, StreamMetrics
+
+
+def _metrics(*times):
+    metrics = StreamMetrics()
+    with patch("neon_stt_plugin_google_cloud_streaming.metrics.monotonic",
+               side_effect=list(times)):
+        metrics.mark("opened")
+        metrics.audio_sent(3200)
+        metrics.audio_sent(3200)
+        metrics.mark("first_response", first=True)
+        metrics.mark("final_result")
+        metrics.mark("results_ready")
+    return metrics
+
+
+class TestMetrics(unittest.TestCase):
+    def test_stream_metrics(self):
+        metrics = _metrics(0.0, 1.0, 1.0, 2.0, 2.5, 3.0, 3.5)
+        self.assertEqual(metrics.durations(),
+                         {"open_to_first_audio": 1.0, "upload": 1.0,
+                          "first_response": 1.5, "final_result": 1.0,
+                          "results_ready": 1.5, "total": 3.5})
+        self.assertEqual(metrics.counters(), {"bytes_sent": 6400,
+                                              "chunks_sent": 2,
+                                              "rollovers": 0,
+                                              "reconnects": 0})
+
+        metrics = StreamMetrics()
+        metrics.mark("opened")
+        self.assertEqual(metrics.durations(), {})
+
+    def test_histogram(self):
+        hist = LatencyHistogram(max_samples=100)
+        for value in range(1, 201):
+            hist.observe(value)
+        self.assertEqual(hist.count, 200)
+        self.assertEqual(hist.percentile(50), 150)
+        self.assertEqual(hist.percentile(99), 199)
+        self.assertIsNone(LatencyHistogram().percentile(50))
+
+    def test_aggregator(self):
+        aggregator = MetricsAggregator(prefix="stt")
+        aggregator(_metrics(0.0, 1.0, 1.0, 2.0, 2.5, 3.0, 3.5))
+        aggregator(_metrics(0.0, 1.0, 1.0, 1.5, 2.0, 2.5, 2.75))
+        self.assertEqual(aggregator.percentiles()["total"],
+                         {"p50": 2.75, "p95": 3.5, "p99": 3.5})
+        text = aggregator.prometheus()
+        self.assertIn("stt_streams_total 2\n", text)
+        self.assertIn("stt_bytes_sent_total 12800\n", text)
+        self.assertIn('stt_total_seconds{quantile="0.5"} 2.75\n', text)
+        self.assertIn("stt_total_seconds_count 2\n", text)
+
+    def test_statsd(self):
+        reporter = StatsDReporter(prefix="stt")
+        lines = reporter.format(
+            _metrics(0.0, 1.0, 1.0, 2.0, 2.5, 3.0, 3.5))
+        self.assertIn("stt.total:3500.000|ms", lines)
+        self.assertIn("stt.chunks_sent:2|c", lines)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,628 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import subprocess
+import sys
+import unittest
+
+from datetime import timedelta
+from itertools import cycle
+from threading import Thread
+from time import monotonic, sleep
+from unittest.mock import patch
+
+from google.api_core.exceptions import OutOfRange, ServiceUnavailable
+from google.cloud import speech
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from neon_stt_plugin_google_cloud_streaming import GoogleCloudStreamingSTT
+from neon_stt_plugin_google_cloud_streaming.audio_queue import AudioRingBuffer
+from neon_stt_plugin_google_cloud_streaming.metrics import StreamMetrics
+from helpers import get_stt
+
+
+def _final_response(*alternatives, end_time=0.0, language_code=""):
+    return speech.StreamingRecognizeResponse(results=[
+        speech.StreamingRecognitionResult(
+            is_final=True, result_end_time=timedelta(seconds=end_time),
+            language_code=language_code,
+            alternatives=[
+                speech.SpeechRecognitionAlternative(transcript=t,
+                                                    confidence=c)
+                for t, c in alternatives])])
+
+
+def _interim_response(transcript, stability):
+    return speech.StreamingRecognizeResponse(results=[
+        speech.StreamingRecognitionResult(stability=stability, alternatives=[
+            speech.SpeechRecognitionAlternative(transcript=transcript)])])
+
+
+class FakeResponses:
+    def __init__(self, responses, upload: Thread):
+        self._responses = iter(responses)
+        self._upload = upload
+        self.cancelled = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.cancelled:
+            raise StopIteration
+        try:
+            response = next(self._responses)
+        except StopIteration:
+            # The server closes the stream after the client half-closes
+            self._upload.join()
+            raise
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def _continuous_responses(client, idle_timeout=None, delays=()):
+    """
+    Build responses with a final result for every two chunks sent in a
+    call, numbered across calls. The `n`th final is delayed by `delays[n]`.
+    A call which gets no audio for `idle_timeout` seconds fails, as Google
+    fails calls left without audio.
+    """
+    finals = []
+
+    def _respond(audio):
+        upload = client.calls[-1]["upload"]
+        sent = received = 0
+        last_audio = monotonic()
+        while upload.is_alive() or len(audio) >= 2 * (sent + 1):
+            if len(audio) != received:
+                received, last_audio = len(audio), monotonic()
+            if len(audio) < 2 * (sent + 1):
+                if idle_timeout and monotonic() - last_audio > idle_timeout:
+                    raise OutOfRange("Long duration elapsed without audio")
+                sleep(0.01)
+                continue
+            sent += 1
+            finals.append(sent)
+            if len(finals) <= len(delays):
+                sleep(delays[len(finals) - 1])
+            yield _final_response((f"utterance {len(finals)}", 0.5),
+                                  end_time=sent * 0.064)
+    return _respond
+
+
+class FakeSpeechClient:
+    """
+    Stands in for `SpeechClient`; consumes requests in a background thread
+    (as gRPC does) and returns a scripted list of responses. `responses` may
+    be a method which builds responses from the audio sent in a call.
+    """
+    def __init__(self, responses=None, wait_for_upload=True):
+        self.responses = responses or []
+        self.wait_for_upload = wait_for_upload
+        self.calls = []
+
+    def streaming_recognize(self, config, requests, **kwargs):
+        call = {"config": config, "audio": []}
+        self.calls.append(call)
+
+        def _upload():
+            for request in requests:
+                call["audio"].append(request.audio_content)
+
+        call["upload"] = Thread(target=_upload, daemon=True)
+        call["upload"].start()
+        if self.wait_for_upload:
+            call["upload"].join()
+        responses = self.responses(call["audio"]) \
+            if callable(self.responses) else self.responses
+        return FakeResponses(responses, call["upload"])
+
+
+class TestGoogleCloudStreamingSTT(unittest.TestCase):
+    def test_lazy_import(self):
+        modules = ("google.cloud.speech", "grpc", "numpy",
+                   "neon_stt_plugin_google_cloud_streaming.languages")
+        loaded = subprocess.check_output(
+            [sys.executable, "-c",
+             "import sys, neon_stt_plugin_google_cloud_streaming; "
+             f"print([m for m in {modules} if m in sys.modules])"],
+            cwd=os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+        self.assertEqual(loaded.decode().strip(), "[]")
+
+    def test_client_init(self):
+        client = FakeSpeechClient([_final_response(("hello", 0.75))])
+        with patch("neon_stt_plugin_google_cloud_streaming."
+                   "get_shared_client") as get_client:
+            get_client.return_value = client
+            stt = GoogleCloudStreamingSTT({"credential": {}, "lang": "en-US",
+                                           "client_init": "lazy"})
+            get_client.assert_not_called()
+            self.assertIs(stt.client, client)
+            stt = GoogleCloudStreamingSTT({"credential": {}, "lang": "en-US",
+                                           "client_init": "background"})
+            self.assertIs(stt.client, client)
+            stt.stream_start()
+            stt.stream_data(b"\0" * 1024)
+            self.assertEqual(stt.transcribe(), [("hello", 0.75)])
+
+    def test_language(self):
+        client = FakeSpeechClient()
+        stt = get_stt(client, {"lang": "en_us"})
+        self.assertEqual(stt.language, "en-US")
+        self.assertEqual(stt.streaming_config.config.language_code, "en-US")
+        self.assertIn("cmn-Hans-CN", stt.available_languages)
+        # Modifying the returned set doesn't affect other callers
+        stt.available_languages.discard("cmn-Hans-CN")
+        self.assertIn("cmn-Hans-CN", get_stt(client).available_languages)
+        with self.assertRaises(ValueError):
+            get_stt(client, {"lang": "xx-XX"})
+
+    def test_multiple_languages(self):
+        client = FakeSpeechClient([_final_response(("hallo", 0.75),
+                                                   language_code="de-de")])
+        stt = get_stt(client, {"languages": ["en_us", "de", "en-US",
+                               "fr-FR"]})
+        self.assertEqual(stt.language, "en-US")
+        stt.stream_start()
+        stt.stream_data(b"\0" * 1024)
+        self.assertEqual(stt.transcribe(), [("hallo", 0.75)])
+        self.assertEqual(stt.detected_language, "de-DE")
+        config = client.calls[0]["config"].config
+        self.assertEqual(config.language_code, "en-US")
+        self.assertEqual(list(config.alternative_language_codes),
+                         ["de-DE", "fr-FR"])
+
+    def test_transcribe(self):
+        client = FakeSpeechClient([_final_response(("hello", 0.75),
+                                                   ("hallo", 0.5))])
+        stt = get_stt(client)
+        stt.stream_start()
+        stt.stream_data(b"\0" * 1024)
+        stt.stream_data(b"\0" * 1024)
+        self.assertEqual(stt.transcribe(), [("hello", 0.75), ("hallo", 0.5)])
+        self.assertEqual(len(client.calls[0]["audio"]), 2)
+
+    def test_preopen(self):
+        client = FakeSpeechClient([_final_response(("hello", 0.75))])
+        # The recycle timer doesn't fire during the test; it is run directly
+        stt = get_stt(client, {"preopen": True, "preopen_max_age": 60})
+        prepared = stt._prepared_stream
+        self.assertTrue(prepared.is_alive())
+        stt.stream_start()
+        self.assertIs(stt.stream, prepared)
+        stt.stream_data(b"\0" * 1024)
+        self.assertEqual(stt.transcribe(), [("hello", 0.75)])
+
+        # A new stream is prepared and recycled before it goes stale
+        prepared = stt._prepared_stream
+        self.assertTrue(prepared.is_alive())
+        self.assertTrue(stt._recycle_timer.is_alive())
+        stt._recycle_timer.cancel()
+        stt._recycle_prepared_stream()
+        prepared.join(5)
+        self.assertFalse(prepared.is_alive())
+        self.assertIsNot(stt._prepared_stream, prepared)
+        self.assertTrue(stt._prepared_stream.is_alive())
+
+        # Shutdown closes the prepared stream and stops the recycle timer
+        prepared = stt._prepared_stream
+        timer = stt._recycle_timer
+        stt.shutdown()
+        prepared.join(5)
+        self.assertFalse(prepared.is_alive())
+        self.assertFalse(timer.is_alive())
+        self.assertIsNone(stt._prepared_stream)
+        stt.prepare_stream()
+        self.assertIsNone(stt._prepared_stream)
+
+    def test_metrics(self):
+        client = FakeSpeechClient([_final_response(("hello", 0.75))])
+        stt = get_stt(client)
+        reported = []
+        stt.register_metrics_callback(reported.append)
+        stt.stream_start()
+        stt.stream_data(b"\0" * 1024)
+        stt.stream_data(b"\0" * 1024)
+        stt.transcribe()
+        metrics = reported[0]
+        self.assertIs(metrics, stt.last_metrics)
+        self.assertEqual(metrics.counters()["bytes_sent"], 2048)
+        self.assertEqual(metrics.counters()["chunks_sent"], 2)
+        self.assertEqual(set(metrics.durations()),
+                         {name for name, _, _ in StreamMetrics.DURATIONS})
+        self.assertEqual(stt.metrics.streams, 1)
+
+    def test_interim_results(self):
+        client = FakeSpeechClient([_interim_response("hel", 0.25),
+                                   _interim_response("hello", 0.5),
+                                   _final_response(("hello", 0.75))])
+        stt = get_stt(client, {"interim_results": True})
+        self.assertTrue(stt.streaming_config.interim_results)
+        partials = []
+        stt.register_interim_callback(lambda *args: partials.append(args))
+        stt.stream_start()
+        stt.stream_data(b"\0" * 1024)
+        self.assertEqual(stt.transcribe(), [("hello", 0.75)])
+        self.assertEqual(partials, [("hel", 0.25), ("hello", 0.5)])
+
+    def test_single_utterance(self):
+        end_of_utterance = speech.StreamingRecognizeResponse(
+            speech_event_type=speech.StreamingRecognizeResponse.
+            SpeechEventType.END_OF_SINGLE_UTTERANCE)
+        client = FakeSpeechClient([end_of_utterance,
+                                   _final_response(("yes", 0.75)),
+                                   _final_response(("no", 0.75))],
+                                  wait_for_upload=False)
+        stt = get_stt(client, {"single_utterance": True})
+        self.assertTrue(stt.streaming_config.single_utterance)
+        stt.stream_start()
+        stt.stream_data(b"\0" * 1024)
+        # Results are available before the caller ends the stream
+        self.assertTrue(stt.stream.results_event.wait(5))
+        client.calls[0]["upload"].join(5)
+        self.assertFalse(client.calls[0]["upload"].is_alive())
+        self.assertEqual(stt.transcribe(), [("yes", 0.75)])
+
+    def test_multiple_finals(self):
+        client = FakeSpeechClient([_final_response(("hello", 0.5)),
+                                   _final_response(("world", 0.75))])
+        stt = get_stt(client)
+        utterances = []
+        stt.register_utterance_callback(
+            lambda transcriptions, language: utterances.append(transcriptions))
+        stt.stream_start()
+        stt.stream_data(b"\0" * 1024)
+        self.assertEqual(stt.transcribe(), [("hello world", 0.625)])
+        self.assertEqual(utterances, [[("hello", 0.5)], [("world", 0.75)]])
+
+    def test_word_timings(self):
+        def _respond(audio):
+            if not any(audio):
+                return []
+            result = _final_response(("hello", 0.75), end_time=0.5)
+            result.results[0].alternatives[0].words = [
+                speech.WordInfo(word="hello", start_time=timedelta(
+                    seconds=0.1), end_time=timedelta(seconds=0.4),
+                    confidence=0.5)]
+            return [result]
+
+        client = FakeSpeechClient(_respond)
+        stt = get_stt(client, {"word_timings": True,
+                               "long_form": True, "stream_limit": 0.1})
+        config = stt.streaming_config.config
+        self.assertTrue(config.enable_word_time_offsets)
+        self.assertTrue(config.enable_word_confidence)
+        stt.stream_start()
+        stt.stream_data(b"\0" * 16000)
+        sleep(0.3)
+        stt.stream_data(b"\0" * 16000)
+        # The default result shape is unchanged
+        self.assertEqual(stt.transcribe(), [("hello hello", 0.75)])
+        # Offsets from later calls are relative to the start of the audio
+        self.assertEqual(list(stt.word_timings),
+                         [("hello", 100, 400, 0.5),
+                          ("hello", 600, 900, 0.5)])
+
+        stt = get_stt(client)
+        self.assertFalse(stt.streaming_config.config.enable_word_time_offsets)
+        stt.stream_start()
+        stt.stream_data(b"\0" * 1024)
+        stt.transcribe()
+        self.assertIsNone(stt.word_timings)
+
+    def test_continuous(self):
+        client = FakeSpeechClient(wait_for_upload=False)
+        client.responses = _continuous_responses(client)
+        stt = get_stt(client, {"continuous": True,
+                               "single_utterance": True})
+        self.assertFalse(stt.streaming_config.single_utterance)
+        utterances = []
+        stt.register_utterance_callback(
+            lambda transcriptions, language: utterances.append(transcriptions))
+        stt.stream_start()
+        stream = stt.stream
+        for _ in range(2):
+            stt.stream_data(b"\0" * 1024)
+        self.assertEqual(stt.transcribe(), [("utterance 1", 0.5)])
+
+        # The next utterance uses the same stream
+        stt.stream_start()
+        self.assertIs(stt.stream, stream)
+        for _ in range(4):
+            stt.stream_data(b"\0" * 1024)
+        for _ in range(100):
+            if len(utterances) == 3:
+                break
+            sleep(0.01)
+        self.assertEqual(stt.transcribe(),
+                         [("utterance 2 utterance 3", 0.5)])
+        self.assertEqual(len(utterances), 3)
+        stt.stream_stop()
+        self.assertEqual(stt.last_metrics.chunks_sent, 6)
+
+    def test_continuous_gap(self):
+        # The server fails calls which get no audio for a second
+        client = FakeSpeechClient(wait_for_upload=False)
+        client.responses = _continuous_responses(client, idle_timeout=1)
+        stt = get_stt(client, {"continuous": True,
+                               "continuous_idle_limit": 0.2})
+        stt.stream_start()
+        stream = stt.stream
+        for _ in range(2):
+            stt.stream_data(b"\0" * 1024)
+        self.assertEqual(stt.transcribe(), [("utterance 1", 0.5)])
+        sleep(1.5)
+
+        # A pause within an utterance ends the call after the idle limit
+        stt.stream_start()
+        stt.stream_data(b"\0" * 1024)
+        sleep(1.5)
+        stt.stream_data(b"\0" * 1024)
+        self.assertEqual(stt.transcribe(), [("utterance 2", 0.5)])
+        self.assertIs(stt.stream, stream)
+        stt.stream_stop()
+        self.assertIsNone(stream.error)
+        # Audio without a final result is replayed in the next call
+        self.assertEqual([len(call["audio"]) for call in client.calls],
+                         [2, 1, 2])
+
+    def test_continuous_timeout(self):
+        # The first utterance's result arrives after `transcribe` gives up
+        client = FakeSpeechClient(wait_for_upload=False)
+        client.responses = _continuous_responses(client, delays=(0.3,))
+        stt = get_stt(client, {"continuous": True,
+                               "continuous_result_timeout": 0.1})
+        utterances = []
+        stt.register_utterance_callback(
+            lambda transcriptions, language: utterances.append(transcriptions))
+        stt.stream_start()
+        for _ in range(2):
+            stt.stream_data(b"\0" * 1024)
+        self.assertEqual(stt.transcribe(), [])
+        for _ in range(100):
+            if utterances:
+                break
+            sleep(0.01)
+        self.assertEqual(utterances, [[("utterance 1", 0.5)]])
+
+        # The late result isn't returned with the next utterance
+        stt.stream_start()
+        for _ in range(2):
+            stt.stream_data(b"\0" * 1024)
+        self.assertEqual(stt.transcribe(), [("utterance 2", 0.5)])
+        stt.stream_stop()
+
+    def test_frame_coalescing(self):
+        client = FakeSpeechClient([_final_response(("hello", 0.75))],
+                                  wait_for_upload=False)
+        stt = get_stt(client, {"frame_ms": 100,
+                               "frame_max_latency_ms": 100})
+        stt.stream_start()
+        for _ in range(7):
+            stt.stream_data(b"\0" * 1024)
+        sleep(0.5)
+        # Partial frame is flushed once it exceeds the max latency
+        self.assertEqual([len(a) for a in client.calls[0]["audio"]],
+                         [3200, 3200, 768])
+        stt.stream_data(b"\0" * 1024)
+        stt.transcribe()
+        client.calls[0]["upload"].join(5)
+        self.assertEqual([len(a) for a in client.calls[0]["audio"]],
+                         [3200, 3200, 768, 1024])
+
+    def test_flac_upload(self):
+        client = FakeSpeechClient([_final_response(("hello", 0.75))])
+        stt = get_stt(client, {"upload_encoding": "flac"})
+        self.assertEqual(stt.streaming_config.config.encoding,
+                         speech.RecognitionConfig.AudioEncoding.FLAC)
+        stt.stream_start()
+        for _ in range(4):
+            stt.stream_data(b"\0" * 1024)
+        stt.transcribe()
+        audio = client.calls[0]["audio"]
+        self.assertEqual(len(audio), 2)
+        self.assertTrue(audio[0].startswith(b"fLaC"))
+        self.assertLess(sum(len(a) for a in audio), 4096)
+
+    def test_long_form(self):
+        def _respond(audio):
+            # Acknowledge all but the last 0.25s of audio in each stream
+            sent = sum(len(a) for a in audio) / 32000
+            return [_final_response((f"segment {len(audio)}", 0.5),
+                                    end_time=sent - 0.25)]
+
+        client = FakeSpeechClient(_respond)
+        stt = get_stt(client, {"long_form": True, "stream_limit": 0})
+        stt.stream_start()
+        for _ in range(3):
+            stt.stream_data(b"\1" * 16000)
+        self.assertEqual(stt.transcribe(),
+                         [("segment 1 segment 2 segment 2 segment 1", 0.5)])
+        # Unacknowledged audio is replayed at the start of the next stream
+        self.assertEqual([[len(a) for a in call["audio"]]
+                          for call in client.calls],
+                         [[16000], [8000, 16000], [8000, 16000], [8000]])
+
+    def test_resilient(self):
+        responses = [[_final_response(("hello", 0.5), end_time=0.5),
+                      ServiceUnavailable("connection reset")],
+                     [_final_response(("world", 0.75), end_time=0.5)]]
+        client = FakeSpeechClient(lambda audio: responses.pop(0))
+        stt = get_stt(client, {"resilient": True})
+        stt.stream_start()
+        for _ in range(2):
+            stt.stream_data(b"\1" * 16000)
+        self.assertEqual(stt.transcribe(), [("hello world", 0.625)])
+        # Audio after the last final result is resent on reconnect
+        self.assertEqual([[len(a) for a in call["audio"]]
+                          for call in client.calls], [[16000, 16000], [16000]])
+        self.assertEqual(stt.last_metrics.reconnects, 1)
+
+    def test_resilient_gives_up(self):
+        def _unavailable(audio):
+            raise ServiceUnavailable("unavailable")
+
+        client = FakeSpeechClient(_unavailable)
+        stt = get_stt(client, {"resilient": True, "max_reconnects": 2})
+        stt.stream_start()
+        stt.stream_data(b"\1" * 16000)
+        self.assertEqual(stt.transcribe(), [])
+        self.assertEqual(len(client.calls), 3)
+
+    def test_ring_buffer(self):
+        client = FakeSpeechClient([_final_response(("hello", 0.75))])
+        stt = get_stt(client, {"audio_buffer": "ring"})
+        stt.stream_start()
+        self.assertIsInstance(stt.queue, AudioRingBuffer)
+        for _ in range(8):
+            stt.stream_data(b"\0" * 1024)
+        self.assertEqual(stt.transcribe(), [("hello", 0.75)])
+        audio = client.calls[0]["audio"]
+        self.assertEqual(sum(len(a) for a in audio), 8192)
+        self.assertTrue(all(len(a) <= 3200 for a in audio))
+
+    def test_cache(self):
+        client = FakeSpeechClient([_final_response(("hello", 0.75))])
+        stt = get_stt(client, {"cache": True})
+        for audio in (b"\1" * 2048, b"\1" * 2048, b"\2" * 2048):
+            stt.stream_start()
+            stt.stream_data(audio[:1024])
+            stt.stream_data(audio[1024:])
+            self.assertEqual(stt.transcribe(), [("hello", 0.75)])
+        # Repeated audio is served without opening a stream
+        self.assertEqual(len(client.calls), 2)
+        self.assertEqual(client.calls[0]["audio"], [b"\1" * 1024] * 2)
+        self.assertEqual(stt.cache.stats()["hits"], 1)
+
+    def test_cache_execute(self):
+        client = FakeSpeechClient([_final_response(("hello", 0.75))])
+        stt = get_stt(client, {"cache": True})
+        for _ in range(2):
+            stt.stream_start()
+            stt.stream_data(b"\1" * 1024)
+            self.assertEqual(stt.execute(None), "hello")
+        self.assertEqual(len(client.calls), 1)
+        self.assertEqual(stt.cache.stats()["hits"], 1)
+        # Stopping without audio doesn't open a stream
+        stt.stream_start()
+        self.assertIsNone(stt.stream_stop())
+        self.assertEqual(len(client.calls), 1)
+
+    def test_vad_trimmed_seconds(self):
+        client = FakeSpeechClient([_final_response(("hello", 0.75))])
+        stt = get_stt(client, {"vad": True, "vad_pre_roll_ms": 300,
+                               "vad_trailing_silence_ms": 1000})
+        speech = (4000).to_bytes(2, "little", signed=True) * 160 + \
+            (-4000).to_bytes(2, "little", signed=True) * 160
+        stt.stream_start()
+        # 1s silence, 0.5s speech, 3s silence in 100ms chunks
+        for chunk in [b"\0" * 3200] * 10 + [speech * 5] * 5 + \
+                [b"\0" * 3200] * 30:
+            stt.stream_data(chunk)
+        self.assertEqual(stt.transcribe(), [("hello", 0.75)])
+        # 0.3s pre-roll + 0.5s speech + 1.0s trailing silence
+        self.assertAlmostEqual(len(b"".join(client.calls[0]["audio"])) /
+                               32000, 1.8, delta=0.05)
+        # Leading silence before the pre-roll and audio after the trailing
+        # silence are both trimmed
+        self.assertAlmostEqual(stt.trimmed_seconds, 2.7, delta=0.05)
+
+    def test_cache_queue_policy(self):
+        # More audio is held than the queue can take at once
+        for policy in ("drop_oldest", "abort"):
+            client = FakeSpeechClient([_final_response(("hello", 0.75))])
+            stt = get_stt(client, {"cache": True, "audio_queue_seconds": 0.1,
+                                   "audio_queue_policy": policy})
+            stt.stream_start()
+            for _ in range(8):
+                stt.stream_data(b"\1" * 1024)
+            self.assertEqual(stt.transcribe(), [("hello", 0.75)])
+            self.assertEqual(b"".join(client.calls[0]["audio"]),
+                             b"\1" * 8192)
+            self.assertEqual(stt.queue_stats["dropped_chunks"], 0)
+
+    def test_client_per_stream(self):
+        clients = [FakeSpeechClient([_final_response(("hello", 0.75))])
+                   for _ in range(2)]
+        with patch("neon_stt_plugin_google_cloud_streaming."
+                   "get_shared_client") as get_client:
+            get_client.side_effect = cycle(clients)
+            stt = GoogleCloudStreamingSTT({"credential": {}, "lang": "en-US",
+                                           "client_pool_size": 2})
+            for _ in range(2):
+                stt.stream_start()
+                stt.stream_data(b"\0" * 1024)
+                stt.transcribe()
+        self.assertEqual([len(client.calls) for client in clients], [1, 1])
+
+    def test_endpoint_failover(self):
+        def _unavailable(audio):
+            raise ServiceUnavailable("unavailable")
+
+        clients = {"a.example.com": FakeSpeechClient(_unavailable),
+                   "b.example.com": FakeSpeechClient(
+                       [_final_response(("hello", 0.75))])}
+        # Clients for other endpoints are created on failover
+        with patch("neon_stt_plugin_google_cloud_streaming."
+                   "get_shared_client") as get_client, \
+                patch("neon_stt_plugin_google_cloud_streaming.endpoints."
+                      "EndpointSelector.start"):
+            get_client.side_effect = lambda creds, endpoint, **_: \
+                clients[endpoint]
+            stt = GoogleCloudStreamingSTT(
+                {"credential": {}, "lang": "en-US",
+                 "api_endpoints": list(clients)})
+            for expected in ([], [("hello", 0.75)]):
+                stt.stream_start()
+                stt.stream_data(b"\0" * 1024)
+                self.assertEqual(stt.transcribe(), expected)
+        self.assertEqual(len(clients["a.example.com"].calls), 1)
+        self.assertEqual(len(clients["b.example.com"].calls), 1)
+
+    def test_shutdown_endpoint_selector(self):
+        client = FakeSpeechClient([])
+        with patch("neon_stt_plugin_google_cloud_streaming."
+                   "get_shared_client", return_value=client), \
+                patch("neon_stt_plugin_google_cloud_streaming.endpoints."
+                      "probe_client", return_value=True):
+            stt = GoogleCloudStreamingSTT(
+                {"credential": {}, "lang": "en-US",
+                 "api_endpoints": ["a.example.com", "b.example.com"]})
+            thread = stt.endpoint_selector._thread
+            self.assertTrue(thread.is_alive())
+            stt.shutdown()
+        self.assertFalse(thread.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import os
+import sys
+import unittest
+
+from array import array
+from datetime import timedelta
+
+from google.cloud import speech
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from neon_stt_plugin_google_cloud_streaming.words import WordTimings
+
+
+def _result(*words):
+    return speech.StreamingRecognitionResult(
+        is_final=True, alternatives=[speech.SpeechRecognitionAlternative(
+            transcript=" ".join(w for w, _, _, _ in words),
+            words=[speech.WordInfo(word=w,
+                                   start_time=timedelta(seconds=start),
+                                   end_time=timedelta(seconds=end),
+                                   confidence=confidence)
+                   for w, start, end, confidence in words])])
+
+
+class TestWordTimings(unittest.TestCase):
+    def test_from_result(self):
+        timings = WordTimings.from_result(
+            _result(("hello", 0.1, 0.45, 0.5), ("world", 0.5, 1.25, 0.75)),
+            offset_ms=1000)
+        self.assertEqual(len(timings), 2)
+        self.assertEqual(list(timings), [("hello", 1100, 1450, 0.5),
+                                         ("world", 1500, 2250, 0.75)])
+        self.assertEqual(timings[1], ("world", 1500, 2250, 0.75))
+        self.assertIsInstance(timings.start_ms, array)
+        self.assertEqual(len(WordTimings.from_result(
+            speech.StreamingRecognitionResult())), 0)
+
+    def test_join(self):
+        first = WordTimings.from_result(_result(("hello", 0, 0.5, 0.5)))
+        second = WordTimings.from_result(_result(("world", 1, 1.5, 0.75)))
+        joined = WordTimings.join([first, second])
+        self.assertEqual(joined.words, ["hello", "world"])
+        self.assertEqual(joined.start_ms, array("I", [0, 1000]))
+        self.assertEqual(len(first), 1)
+
+    def test_index_at(self):
+        timings = WordTimings.from_result(
+            _result(("hello", 0.1, 0.45, 0.5), ("world", 0.5, 1.25, 0.75)))
+        self.assertEqual(timings.index_at(0), 0)
+        self.assertEqual(timings.index_at(200), 0)
+        self.assertEqual(timings.index_at(470), 1)
+        self.assertIsNone(timings.index_at(1250))
+
+    def test_to_numpy(self):
+        timings = WordTimings.from_result(
+            _result(("hello", 0.1, 0.45, 0.5), ("world", 0.5, 1.25, 0.75)))
+        start, end, confidence = timings.to_numpy()
+        self.assertEqual(start.tolist(), [100, 500])
+        self.assertEqual(end.tolist(), [450, 1250])
+        self.assertEqual(confidence.tolist(), [0.5, 0.75])
+
+
+if __name__ == '__main__':
+    unittest.main()